@@ -1,40 +1,132 @@
-import sqlite3
-import hashlib
+import asyncio
 import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+
+from password_kdf import DEFAULT_KDF, hash_password, verify_password
 
 # Global instance required for test access
 _GLOBAL_AUTH = None
 
+# SQL is kept in constants: sqlite3 caches the compiled statement per
+# connection by its text, so every call after the first reuses it
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        password_hash TEXT NOT NULL,
+        salt BLOB NOT NULL
+    )
+"""
+_INSERT_USER_SQL = "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)"
+_SELECT_USER_SQL = "SELECT password_hash, salt FROM users WHERE username=?"
+# Only replaces the hash that was verified (a concurrent password change wins)
+_REHASH_USER_SQL = "UPDATE users SET password_hash=?, salt=? WHERE username=? AND password_hash=?"
+
+# Compiled statements kept per connection
+STATEMENT_CACHE_SIZE = 64
+
+
+def _remove_db_files(path):
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
 
 class AuthDB:
-    def __init__(self, db_path="users.db"):
+    def __init__(self, db_path="users.db", kdf=DEFAULT_KDF, kdf_pool=None):
         """
         Initialize the authentication database.
         db_path can be a filename or ':memory:' for testing.
+
+        Passwords are hashed with `kdf` (see password_kdf). Pass a
+        password_kdf.KdfPool to do the hashing in worker processes instead of
+        on the calling thread.
+
+        Safe to share between threads (FastAPI runs sync endpoints on a thread
+        pool): each thread gets its own connection, opened on first use, so
+        logins on different threads don't queue behind one connection.
+
+            - Files use WAL mode, so reads (logins) never wait for writes.
+            - ':memory:' is backed by a throwaway temp file in WAL mode, so
+              every thread sees the same users with the same locking as a
+              real database. (A shared-cache memory database locks whole
+              tables and fails concurrent writers with "database table is
+              locked".) The file is deleted by close(), or when the AuthDB
+              is garbage collected.
         """
         self.db_path = db_path
+        self.kdf = kdf
+        self.kdf_pool = kdf_pool
+        self._dummy = None
+        if db_path == ":memory:":
+            fd, self._target = tempfile.mkstemp(prefix="authdb-", suffix=".db")
+            os.close(fd)
+            self._cleanup = weakref.finalize(self, _remove_db_files, self._target)
+        else:
+            self._target = db_path
+            self._cleanup = None
 
-        # Persistent connection (CRUCIAL for :memory:)
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        self._local = threading.local()
+        self._all_conns = []
+        self._conns_lock = threading.Lock()
 
         self._create_table()
 
+    @property
+    def conn(self):
+        """This thread's connection (kept for code that used the old attribute)."""
+        return self._conn()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._target, timeout=30,
+                check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._all_conns.append(conn)
+        return conn
+
+    def close(self):
+        """Close every connection this AuthDB opened (call once, at shutdown)."""
+        with self._conns_lock:
+            for conn in self._all_conns:
+                conn.close()
+            self._all_conns = []
+        self._local = threading.local()
+        if self._cleanup is not None:
+            self._cleanup()
+
     def _create_table(self):
         """Create the users table if it does not already exist."""
-        cur = self.conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                username TEXT PRIMARY KEY,
-                password_hash TEXT NOT NULL,
-                salt BLOB NOT NULL
-            )
-        """)
-        self.conn.commit()
+        conn = self._conn()
+        with conn:
+            conn.execute(_CREATE_TABLE_SQL)
+
+    def _run_kdf(self, fn, *args):
+        if self.kdf_pool is not None:
+            return self.kdf_pool.run(fn, *args)
+        return fn(*args)
+
+    def _dummy_hash(self):
+        """A hash made with the current KDF, checked against for unknown usernames."""
+        if self._dummy is None:
+            self._dummy = self.hash_password("", os.urandom(16))
+        return self._dummy
 
     def hash_password(self, password, salt):
-        """Return SHA-256 hash of (salt + password)."""
-        return hashlib.sha256(salt + password.encode()).hexdigest()
+        """Return the versioned KDF hash of the password with this salt."""
+        return self._run_kdf(hash_password, password, self.kdf, salt)
 
     def create_user(self, username, password):
         """
@@ -44,13 +136,10 @@ class AuthDB:
         salt = os.urandom(16)
         hashed = self.hash_password(password, salt)
 
+        conn = self._conn()
         try:
-            cur = self.conn.cursor()
-            cur.execute(
-                "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
-                (username, hashed, salt),
-            )
-            self.conn.commit()
+            with conn:
+                conn.execute(_INSERT_USER_SQL, (username, hashed, salt))
             return True
         except sqlite3.IntegrityError:
             return False
@@ -60,20 +149,50 @@ class AuthDB:
         Verify a user's password.
         Returns True if correct, False otherwise.
         """
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT password_hash, salt FROM users WHERE username=?",
-            (username,)
-        )
-        row = cur.fetchone()
+        row = self._conn().execute(_SELECT_USER_SQL, (username,)).fetchone()
 
         if row is None:
+            # Spend the same KDF time as a real check, so response times don't
+            # reveal which usernames exist
+            self._run_kdf(verify_password, password, self._dummy_hash(), None, self.kdf)
             return False
 
         stored_hash = row["password_hash"]
         salt = row["salt"]
 
-        return stored_hash == self.hash_password(password, salt)
+        matches, needs_rehash = self._run_kdf(verify_password, password, stored_hash, salt, self.kdf)
+        if matches and needs_rehash:
+            # Legacy SHA-256 or an older cost: upgrade now that we know the password
+            new_salt = os.urandom(16)
+            conn = self._conn()
+            with conn:
+                conn.execute(_REHASH_USER_SQL,
+                             (self.hash_password(password, new_salt), new_salt, username, stored_hash))
+        return matches
+
+
+class AsyncAuthDB:
+    """
+    AuthDB for async code (FastAPI `async def` endpoints). Each call runs on
+    the default thread pool, so the event loop never waits on SQLite; the
+    worker threads use their own AuthDB connections.
+
+        auth = AsyncAuthDB(AuthDB("users.db"))
+        ok = await auth.verify_user("sujal", password)
+    """
+
+    def __init__(self, db):
+        self.db = db if isinstance(db, AuthDB) else AuthDB(db)
+
+    async def create_user(self, username, password):
+        return await asyncio.to_thread(self.db.create_user, username, password)
+
+    async def verify_user(self, username, password):
+        return await asyncio.to_thread(self.db.verify_user, username, password)
+
+    def close(self):
+        self.db.close()
+
 
 def init_db(path=":memory:"):
     """
@@ -87,8 +206,52 @@ def init_db(path=":memory:"):
 
 def get_conn():
     """
-    Return the SQLite connection for tests.
+    Return the SQLite connection for tests (the calling thread's connection).
     """
     if _GLOBAL_AUTH is None:
         raise RuntimeError("ERROR: init_db() must be called before get_conn().")
     return _GLOBAL_AUTH.conn
+
+
+# -------- benchmark --------
+
+def _bench(path, users, logins, thread_counts):
+    """Database-side login throughput; the KDF cost is kept tiny (see password_kdf.py for that)."""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from password_kdf import Scrypt
+
+    if os.path.exists(path):
+        os.remove(path)
+    db = AuthDB(path, kdf=Scrypt(ln=4))
+    for i in range(users):
+        db.create_user(f"user{i}", f"pw{i}")
+
+    def login(i):
+        return db.verify_user(f"user{i % users}", f"pw{i % users}")
+
+    print(f"{logins:,} logins against {users:,} users ({path})")
+    for threads in thread_counts:
+        with ThreadPoolExecutor(threads) as pool:
+            started = time.perf_counter()
+            assert all(pool.map(login, range(logins)))
+            elapsed = time.perf_counter() - started
+        print(f"  {threads:2} threads: {logins / elapsed:10,.0f} logins/s")
+
+    db.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Login throughput of AuthDB from several threads.")
+    parser.add_argument("--db", default="auth_bench.db")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--logins", type=int, default=20000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    _bench(args.db, args.users, args.logins, args.threads)
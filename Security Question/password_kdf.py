@@ -0,0 +1,202 @@
+"""
+Password hashing for AuthDB: a slow, memory-hard KDF with versioned hashes.
+
+AuthDB used to store SHA-256(salt + password). One SHA-256 is nanoseconds, so
+a stolen users table could be brute-forced at billions of guesses a second.
+Passwords are now hashed with scrypt (or PBKDF2-SHA256 where scrypt is
+missing), and the stored string says how it was made:
+
+    $scrypt$ln=14,r=8,p=1$<salt base64>$<hash base64>
+    $pbkdf2-sha256$i=600000$<salt base64>$<hash base64>
+    <64 hex chars>                        legacy SHA-256 (salt in its own column)
+
+Because every hash carries its own parameters, the cost can be raised at any
+time: verify() reports `needs_rehash` for anything not made with the current
+settings (legacy SHA-256 included), and AuthDB re-hashes it on the next
+successful login. Nobody has to reset their password.
+
+A realistic cost takes tens of milliseconds of CPU per login. KdfPool runs
+hashing in a bounded process pool so that time is spent off the server's
+threads and event loop (and outside the GIL); when too many logins are
+already queued, new ones fail fast with KdfBusy instead of piling up.
+
+    python password_kdf.py --logins 200   -> logins/s at the default cost
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+
+@dataclass(frozen=True)
+class Scrypt:
+    """scrypt with N = 2**ln. Memory per hash is 128 * r * N bytes (16 MiB by default)."""
+    ln: int = 14
+    r: int = 8
+    p: int = 1
+
+    name = "scrypt"
+
+    def params(self):
+        return f"ln={self.ln},r={self.r},p={self.p}"
+
+    def derive(self, password, salt):
+        n = 1 << self.ln
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=self.r, p=self.p,
+                              maxmem=256 * self.r * n * self.p + (1 << 20), dklen=HASH_BYTES)
+
+
+@dataclass(frozen=True)
+class Pbkdf2:
+    """PBKDF2-HMAC-SHA256; the fallback when OpenSSL has no scrypt."""
+    iterations: int = 600_000
+
+    name = "pbkdf2-sha256"
+
+    def params(self):
+        return f"i={self.iterations}"
+
+    def derive(self, password, salt):
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.iterations, HASH_BYTES)
+
+
+DEFAULT_KDF = Scrypt() if hasattr(hashlib, "scrypt") else Pbkdf2()
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def parse_kdf(name, params):
+    """KDF settings from the name and parameter fields of a stored hash."""
+    fields = dict(item.split("=", 1) for item in params.split(","))
+    if name == Scrypt.name:
+        return Scrypt(int(fields["ln"]), int(fields["r"]), int(fields["p"]))
+    if name == Pbkdf2.name:
+        return Pbkdf2(int(fields["i"]))
+    raise ValueError(f"unknown password hash algorithm {name!r}")
+
+
+def hash_password(password, kdf=DEFAULT_KDF, salt=None):
+    """Versioned hash string for a new password."""
+    salt = os.urandom(SALT_BYTES) if salt is None else salt
+    return f"${kdf.name}${kdf.params()}${_b64(salt)}${_b64(kdf.derive(password, salt))}"
+
+
+def legacy_hash(password, salt):
+    """The old format: hex SHA-256 of (salt + password)."""
+    return hashlib.sha256(salt + password.encode()).hexdigest()
+
+
+def verify_password(password, stored, legacy_salt=None, current=DEFAULT_KDF):
+    """
+    (matches, needs_rehash) for a password against a stored hash.
+    `legacy_salt` is the users.salt column, only used by legacy SHA-256 hashes.
+    """
+    if not stored.startswith("$"):
+        if legacy_salt is None:
+            return False, False
+        return hmac.compare_digest(stored, legacy_hash(password, legacy_salt)), True
+
+    try:
+        _, name, params, salt, expected = stored.split("$")
+        kdf = parse_kdf(name, params)
+        salt, expected = _unb64(salt), _unb64(expected)
+    except (ValueError, KeyError, binascii.Error):
+        return False, False
+    actual = kdf.derive(password, salt)
+    return hmac.compare_digest(actual, expected), kdf != current
+
+
+class KdfBusy(RuntimeError):
+    """Too many password hashes are already queued; try again shortly."""
+
+
+class KdfPool:
+    """
+    Bounded process pool for hash_password / verify_password.
+
+    At most `max_pending` hashes are queued or running; beyond that, run()
+    waits up to `wait_timeout` seconds for a slot and then raises KdfBusy.
+    The worker processes start on first use.
+    """
+
+    def __init__(self, workers=None, max_pending=None, wait_timeout=1.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.wait_timeout = wait_timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers)
+            return self._executor
+
+    def run(self, fn, *args):
+        """Run fn(*args) in a worker process and return its result."""
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise KdfBusy(f"more than {self.max_pending} password hashes in flight")
+        try:
+            return self._pool().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+# -------- benchmark --------
+
+def _bench(logins, kdf, workers):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    stored = hash_password("correct horse", kdf)
+
+    started = time.perf_counter()
+    for _ in range(logins):
+        verify_password("correct horse", stored, current=kdf)
+    inline = logins / (time.perf_counter() - started)
+
+    pool = KdfPool(workers, max_pending=logins)
+    pool.run(verify_password, "warm up", stored, None, kdf)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(workers * 2) as threads:
+        results = list(threads.map(lambda _: pool.run(verify_password, "correct horse", stored, None, kdf)[0],
+                                   range(logins)))
+    pooled = logins / (time.perf_counter() - started)
+    pool.close()
+    assert all(results)
+
+    print(f"{kdf.name} {kdf.params()}: {1000 / inline:.1f} ms per hash")
+    print(f"  inline, one thread      : {inline:8.1f} logins/s")
+    print(f"  process pool, {workers} workers: {pooled:8.1f} logins/s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Logins per second at a given KDF cost.")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pbkdf2", type=int, metavar="ITERATIONS", help="benchmark PBKDF2 instead of scrypt")
+    parser.add_argument("--ln", type=int, default=Scrypt.ln, help="scrypt cost: N = 2**ln")
+    args = parser.parse_args()
+    _bench(args.logins, Pbkdf2(args.pbkdf2) if args.pbkdf2 else Scrypt(args.ln), args.workers)
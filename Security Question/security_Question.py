@@ -1,5 +1,15 @@
+import secrets
+import threading
+from collections import OrderedDict
+
 from fastapi import FastAPI, Request, HTTPException
+from game_session import ASKING, ANSWERED, TIME_PER_DIFFICULTY, GameRuleError, GameSession
 from generate_trivia import generate_questions_for_difficulty
+from question_store import QuestionStore
+from leaderboard import Leaderboard
+from question_stream import iter_questions, random_question
+from rank_index import LiveRanks
+from startup_bank import QUESTIONS_PER_SESSION
 
 app = FastAPI()
 
@@ -44,4 +54,155 @@ def generate_trivia_protected(request: Request):
 
     # Only authenticated users reach this point
     questions = generate_questions_for_difficulty("Easy")
+    return {"count": len(questions), "questions": [q.to_dict() for q in questions]}
+
+
+# Read-only question endpoints. These stream trivia_questions.json instead of
+# json.load-ing it, so the server's memory doesn't grow with the bank size.
+QUESTION_BANK_PATH = "trivia_questions.json"
+MAX_QUESTIONS_PER_REQUEST = 50
+
+
+@app.get("/questions/random")
+def get_random_question(difficulty: str = None, source_title: str = None):
+    q = random_question(QUESTION_BANK_PATH, difficulty=difficulty, source_title=source_title)
+    if q is None:
+        raise HTTPException(status_code=404, detail="No matching questions")
+    return q
+
+
+@app.get("/questions")
+def list_questions(difficulty: str = None, source_title: str = None, limit: int = 10):
+    # Cap the page size (CWE-400: don't let one request pull the whole bank)
+    limit = max(1, min(limit, MAX_QUESTIONS_PER_REQUEST))
+    questions = list(iter_questions(
+        QUESTION_BANK_PATH, difficulty=difficulty, source_title=source_title, limit=limit
+    ))
     return {"count": len(questions), "questions": questions}
+
+
+# Full-text search over the SQLite bank (questions and source articles)
+question_store = QuestionStore()
+
+
+@app.get("/search")
+def search_questions(q: str, difficulty: str = None, limit: int = 20):
+    limit = max(1, min(limit, MAX_QUESTIONS_PER_REQUEST))
+    hits = question_store.search(q, limit=limit, difficulty=difficulty)
+    return {
+        "count": len(hits),
+        "results": [
+            {"id": h.id, "score": h.score, "snippet": h.snippet, "question": h.question.to_dict()}
+            for h in hits
+        ],
+    }
+
+
+@app.get("/search/articles")
+def search_articles(q: str, limit: int = 20):
+    limit = max(1, min(limit, MAX_QUESTIONS_PER_REQUEST))
+    hits = question_store.search_articles(q, limit=limit)
+    return {"count": len(hits), "results": [vars(h) for h in hits]}
+
+
+# Play over HTTP: the same GameSession rules the Tk app uses.
+# Sessions are kept in memory and capped (CWE-400): the oldest is dropped
+# once MAX_ACTIVE_SESSIONS is reached.
+MAX_ACTIVE_SESSIONS = 1000
+game_sessions = OrderedDict()
+
+# Sessions started with a player name take part in the leaderboard: their live
+# rank comes from the in-memory index after every answer, and the finished game
+# is recorded once. session_id -> player, removed when the result is saved.
+session_players = {}
+# FastAPI runs these (sync) handlers on a thread pool: guards both dicts
+sessions_lock = threading.Lock()
+leaderboard = Leaderboard()
+live_ranks = LiveRanks(leaderboard)
+
+
+def _get_session(session_id: str) -> GameSession:
+    with sessions_lock:
+        session = game_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="No such session")
+    return session
+
+
+def _live_rank(session_id: str, session: GameSession) -> dict:
+    """Rank fields for a response; saves the result once the game is over."""
+    with sessions_lock:
+        player = session_players.get(session_id)
+    if player is None:
+        return {}
+    rank = live_ranks.offer(player, session.difficulty, session.streak)
+    if session.state not in (ASKING, ANSWERED):
+        # pop(): two requests can see the game end at once; only one records it
+        with sessions_lock:
+            finished = session_players.pop(session_id, None) is not None
+        if finished:
+            leaderboard.record(player, session.difficulty, session.streak, session.answered,
+                               session.end_reason or session.state)
+    return {"player": player, "rank": rank}
+
+
+@app.get("/leaderboard/{difficulty}")
+def get_leaderboard(difficulty: str, limit: int = 10):
+    if difficulty not in TIME_PER_DIFFICULTY:
+        raise HTTPException(status_code=400, detail="Unknown difficulty")
+    limit = max(1, min(limit, MAX_QUESTIONS_PER_REQUEST))
+    top = live_ranks.top_k(difficulty, limit)
+    return {"results": [{"rank": r, "player": p, "best": b} for r, p, b in top]}
+
+
+@app.post("/sessions")
+def create_session(difficulty: str = "Easy", player: str = None):
+    if difficulty not in TIME_PER_DIFFICULTY:
+        raise HTTPException(status_code=400, detail="Unknown difficulty")
+    questions = question_store.sample(difficulty, QUESTIONS_PER_SESSION)
+    if not questions:
+        raise HTTPException(status_code=404, detail="No questions for this difficulty")
+
+    session_id = secrets.token_urlsafe(16)
+    session = GameSession(questions, difficulty)
+    session.start()
+    with sessions_lock:
+        game_sessions[session_id] = session
+        if player:
+            session_players[session_id] = player[:64]
+        while len(game_sessions) > MAX_ACTIVE_SESSIONS:
+            evicted, _ = game_sessions.popitem(last=False)
+            session_players.pop(evicted, None)
+    return {"session_id": session_id, **session.to_dict(), **_live_rank(session_id, session)}
+
+
+@app.get("/sessions/{session_id}")
+def get_session(session_id: str):
+    session = _get_session(session_id)
+    # to_dict() notices an expired timer, so this is also where time-ups get saved
+    view = session.to_dict()
+    return {**view, **_live_rank(session_id, session)}
+
+
+@app.post("/sessions/{session_id}/answer")
+def answer_question(session_id: str, choice: int):
+    session = _get_session(session_id)
+    try:
+        result = session.answer(choice)
+    except GameRuleError as e:
+        # A late answer can be what ends the game (time ran out): save it now
+        _live_rank(session_id, session)
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"correct": result.correct, "correct_index": result.correct_index, **session.to_dict(),
+            **_live_rank(session_id, session)}
+
+
+@app.post("/sessions/{session_id}/next")
+def next_question(session_id: str):
+    session = _get_session(session_id)
+    try:
+        session.next_question()
+    except GameRuleError as e:
+        _live_rank(session_id, session)
+        raise HTTPException(status_code=409, detail=str(e))
+    return {**session.to_dict(), **_live_rank(session_id, session)}
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Security Question')))
+import login_hashing as auth
+from password_kdf import Scrypt
+
+# Cheap KDF settings so the tests measure threading, not hashing
+FAST_KDF = Scrypt(ln=4)
+
+
+class TestAuthDBThreads(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = auth.AuthDB(os.path.join(self.tmp.name, "auth.db"), kdf=FAST_KDF)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_logins_from_many_threads(self):
+        """Users created on one thread can log in from worker threads."""
+        for i in range(20):
+            self.db.create_user(f"user{i}", f"pw{i}")
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda i: self.db.verify_user(f"user{i % 20}", f"pw{i % 20}"), range(200)))
+        self.assertTrue(all(results))
+
+    def test_each_thread_has_its_own_connection(self):
+        conns = []
+        thread = threading.Thread(target=lambda: conns.append(self.db.conn))
+        thread.start()
+        thread.join()
+        self.assertIsNot(conns[0], self.db.conn)
+        self.assertEqual(self.db.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_memory_db_is_shared_between_threads(self):
+        db = auth.init_db(":memory:")
+        db.create_user("alice", "secret")
+        with ThreadPoolExecutor(2) as pool:
+            self.assertTrue(pool.submit(db.verify_user, "alice", "secret").result())
+        self.assertEqual(auth.get_conn().execute("SELECT COUNT(*) FROM users").fetchone()[0], 1)
+        db.close()
+
+    def test_memory_db_concurrent_writes(self):
+        """Signups and logins on 8 threads at once against ':memory:' (no "table is locked")."""
+        db = auth.AuthDB(":memory:", kdf=FAST_KDF)
+        path = db._target
+        start = threading.Barrier(8)
+
+        def signup_and_login(t):
+            start.wait()
+            return all(db.create_user(f"user{t}-{i}", "pw") and db.verify_user(f"user{t}-{i}", "pw")
+                       for i in range(25))
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(signup_and_login, range(8)))
+        self.assertTrue(all(results))
+        self.assertEqual(db.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0], 200)
+
+        db.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_async_facade(self):
+        adb = auth.AsyncAuthDB(self.db)
+
+        async def scenario():
+            self.assertTrue(await adb.create_user("bob", "pw"))
+            self.assertFalse(await adb.create_user("bob", "pw"))
+            return await asyncio.gather(adb.verify_user("bob", "pw"), adb.verify_user("bob", "nope"))
+
+        self.assertEqual(asyncio.run(scenario()), [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
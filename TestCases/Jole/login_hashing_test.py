@@ -12,8 +12,11 @@ class TestLoginHashing(unittest.TestCase):
         self.db = auth.AuthDB("auth.db")
 
     def tearDown(self):
-        if os.path.exists("auth.db"):
-            os.remove("auth.db")
+        self.db.close()
+        # AuthDB uses WAL mode, which keeps -wal/-shm files next to the database
+        for path in ("auth.db", "auth.db-wal", "auth.db-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_create_user_success(self):
         """Test that creating a new user works."""
@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Security Question')))
+import login_hashing as auth
+from password_kdf import KdfBusy, KdfPool, Pbkdf2, Scrypt, hash_password, legacy_hash, verify_password
+
+FAST_KDF = Scrypt(ln=4)
+
+
+class TestPasswordKdf(unittest.TestCase):
+    def test_versioned_format_round_trip(self):
+        stored = hash_password("hunter2", FAST_KDF)
+        self.assertTrue(stored.startswith("$scrypt$ln=4,r=8,p=1$"))
+        self.assertEqual(verify_password("hunter2", stored, current=FAST_KDF), (True, False))
+        self.assertEqual(verify_password("hunter3", stored, current=FAST_KDF)[0], False)
+
+    def test_changed_cost_or_algorithm_needs_rehash(self):
+        stored = hash_password("pw", Pbkdf2(1000))
+        self.assertTrue(stored.startswith("$pbkdf2-sha256$i=1000$"))
+        self.assertEqual(verify_password("pw", stored, current=FAST_KDF), (True, True))
+        self.assertEqual(verify_password("pw", "$bogus$x=1$aa$bb", current=FAST_KDF), (False, False))
+
+    def test_malformed_hash_does_not_raise(self):
+        for stored in ("$scrypt$ln=4,r=8,p=1$a$bb", "$scrypt$ln=4,r=8,p=1$aa$b", "$scrypt$ln=x$aa$bb", "$$$$"):
+            self.assertEqual(verify_password("pw", stored, current=FAST_KDF), (False, False))
+
+    def test_unknown_user_still_runs_the_kdf(self):
+        db = auth.AuthDB(":memory:", kdf=FAST_KDF)
+        db.create_user("alice", "pw")
+        with mock.patch.object(auth, "verify_password", wraps=auth.verify_password) as check:
+            self.assertFalse(db.verify_user("nobody", "pw"))
+            self.assertEqual(check.call_count, 1)
+            stored = check.call_args.args[1]
+            self.assertTrue(stored.startswith(f"${FAST_KDF.name}${FAST_KDF.params()}$"))
+        db.close()
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = auth.AuthDB(os.path.join(tmp, "auth.db"), kdf=FAST_KDF)
+            salt = os.urandom(16)
+            with db.conn:
+                db.conn.execute("INSERT INTO users VALUES (?, ?, ?)", ("old", legacy_hash("pw", salt), salt))
+
+            self.assertFalse(db.verify_user("old", "wrong"))
+            stored = db.conn.execute("SELECT password_hash FROM users").fetchone()[0]
+            self.assertFalse(stored.startswith("$"))     # failed login changes nothing
+
+            self.assertTrue(db.verify_user("old", "pw"))
+            stored = db.conn.execute("SELECT password_hash FROM users").fetchone()[0]
+            self.assertTrue(stored.startswith("$scrypt$"))
+            self.assertTrue(db.verify_user("old", "pw"))
+            db.close()
+
+    def test_process_pool_and_backpressure(self):
+        pool = KdfPool(workers=1, max_pending=1, wait_timeout=0.01)
+        try:
+            db = auth.AuthDB(":memory:", kdf=FAST_KDF, kdf_pool=pool)
+            self.assertTrue(db.create_user("alice", "pw"))
+            self.assertTrue(db.verify_user("alice", "pw"))
+            self.assertFalse(db.verify_user("alice", "nope"))
+
+            pool._slots.acquire()       # simulate a full queue
+            with self.assertRaises(KdfBusy):
+                db.verify_user("alice", "pw")
+            pool._slots.release()
+            db.close()
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,17 @@
+"""Helpers shared by the Sujal test files (pytest loads this before them)."""
+
+
+def make_questions(n, difficulty=None, prefix="Q"):
+    """`n` valid, distinct question dicts, optionally tagged with a difficulty."""
+    return [
+        {
+            "question": f"{prefix} {i}?",
+            "answers": ["A", "B", "C", "D"],
+            "correct_index": i % 4,
+            "hint": "h",
+            "source_title": f"Article {i % 5}",
+            "source_url": f"https://www.oudaily.com/news/{i % 5}",
+            **({"difficulty": difficulty} if difficulty else {}),
+        }
+        for i in range(n)
+    ]
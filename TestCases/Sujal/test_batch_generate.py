@@ -0,0 +1,79 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from batch_generate import load_urls, plan_shards, progress_line, run_batch
+from question_store import QuestionStore
+
+URLS = [f"https://www.oudaily.com/news/story-{i}" for i in range(6)]
+
+
+@pytest.fixture()
+def store(tmp_path):
+    s = QuestionStore(str(tmp_path / "bank.db"))
+    yield s
+    s.close()
+
+
+def fake_worker(url, difficulties, article=None):
+    """Stands in for scraping + OpenAI; story-5 always fails for Hard."""
+    result = {"url": url, "title": f"Title {url[-1]}", "content": "Body",
+              "scraped": article is None, "questions": [], "errors": {}}
+    for d in difficulties:
+        if url.endswith("5") and d == "Hard":
+            result["errors"][d] = "bad model output"
+            continue
+        result["questions"].append({
+            "question": f"{d} question about {url}?",
+            "answers": ["A", "B", "C", "D"],
+            "correct_index": 1,
+            "hint": "h",
+            "source_title": result["title"],
+            "difficulty": d,
+            "source_url": url,
+        })
+    return result
+
+
+def run(store, **kwargs):
+    return run_batch(URLS, ["Easy", "Hard"], store, workers=2, worker=fake_worker,
+                     executor_cls=ThreadPoolExecutor, **kwargs)
+
+
+def test_batch_fills_store_and_is_resumable(store):
+    summary = run(store)
+    assert summary["shards"] == 6
+    assert summary["questions"] == 11
+    assert summary["failed"] == 1
+    assert store.counts() == {"Easy": 6, "Hard": 5}
+    assert store.article(URLS[0]) == ("Title 0", "Body")
+
+    # Re-running only retries what's missing
+    assert plan_shards(URLS, ["Easy", "Hard"], store) == [(URLS[5], ["Hard"])]
+    again = run(store)
+    assert again["shards"] == 1 and again["questions"] == 0
+
+
+def test_target_caps_each_difficulty(store):
+    run_batch(URLS[:2], ["Easy"], store, worker=fake_worker, executor_cls=ThreadPoolExecutor)
+    shards = plan_shards(URLS, ["Easy", "Hard"], store, target=3)
+    easy = [url for url, needed in shards if "Easy" in needed]
+    hard = [url for url, needed in shards if "Hard" in needed]
+    assert easy == URLS[2:3]     # 2 already saved, 1 more to reach 3
+    assert hard == URLS[:3]
+
+
+def test_load_urls_file(tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text("# nightly\nhttps://a\n\nhttps://b\n", encoding="utf-8")
+    assert load_urls(str(path)) == ["https://a", "https://b"]
+
+
+def test_progress_line():
+    line = progress_line(5, 20, 10, 1, 60.0)
+    assert "5/20 articles" in line
+    assert "10.0 q/min" in line
+    assert "ETA 3m00s" in line
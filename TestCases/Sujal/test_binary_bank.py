@@ -0,0 +1,115 @@
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from binary_bank import BinaryBank, convert_to_binary, write_binary_bank
+
+QUESTIONS = [
+    {
+        "question": "Which library is being modernized?",
+        "answers": ["Bizzell", "Gaylord", "Catlett", "Dale"],
+        "correct_index": 0,
+        "hint": "Think of the main library.",
+        "source_title": "Bizzell modernization",
+        "source_url": "https://www.oudaily.com/news/bizzell",
+        "difficulty": "Easy",
+    },
+    {
+        "question": "Who is OU's quarterback?",
+        "answers": ["John Mateer", "Baker Mayfield", "Jalen Hurts", "Kyler Murray"],
+        "correct_index": 0,
+        "hint": "Transferred from Washington State.",
+        "source_title": "Mateer vs LSU",
+        "difficulty": "Hard",
+    },
+    {
+        "question": "Where did Mateer play against LSU?",
+        "answers": ["Norman", "Baton Rouge"],
+        "correct_index": 1,
+        "hint": "",
+        "source_title": "Mateer vs LSU",
+        "difficulty": "Hard",
+    },
+]
+
+
+@pytest.fixture()
+def bank_path(tmp_path):
+    path = str(tmp_path / "bank.bank")
+    write_binary_bank(QUESTIONS, path)
+    return path
+
+
+def test_round_trip(bank_path):
+    with BinaryBank(bank_path) as bank:
+        assert len(bank) == 3
+        assert list(bank) == QUESTIONS
+
+
+def test_difficulty_indexes(bank_path):
+    with BinaryBank(bank_path) as bank:
+        assert bank.count("Easy") == 1
+        assert bank.count("Hard") == 2
+        assert bank.count("Medium") == 0
+        assert bank.random_question("Medium") is None
+        assert bank.random_question("Easy", random.Random(1))["question"] == QUESTIONS[0]["question"]
+        hard = bank.sample(5, "Hard", random.Random(1))
+        assert sorted(q["question"] for q in hard) == sorted(q["question"] for q in QUESTIONS[1:])
+
+
+def test_convert_jsonl_with_default_difficulty(tmp_path):
+    src = tmp_path / "bank.jsonl"
+    with src.open("w", encoding="utf-8") as f:
+        for q in QUESTIONS:
+            q = dict(q)
+            del q["difficulty"]
+            f.write(json.dumps(q) + "\n")
+
+    dst = str(tmp_path / "bank.bank")
+    assert convert_to_binary(str(src), dst, "Medium") == 3
+    with BinaryBank(dst) as bank:
+        assert bank.count("Medium") == 3
+
+
+def test_rejects_non_bank_file(tmp_path):
+    bad = tmp_path / "bad.bank"
+    bad.write_bytes(b"not a bank" * 20)
+    with pytest.raises(ValueError):
+        BinaryBank(str(bad))
+
+
+def test_truncated_file_is_rejected_and_closed(bank_path, tmp_path):
+    data = open(bank_path, "rb").read()
+    for size in (10, len(data) - 4):
+        cut = tmp_path / f"cut{size}.bank"
+        cut.write_bytes(data[:size])
+        with pytest.raises(ValueError, match="not a question bank"):
+            BinaryBank(str(cut))
+        os.remove(cut)     # would fail on Windows if the file were still open
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    def fail(fd):
+        raise OSError("disk went away")
+
+    monkeypatch.setattr(os, "fsync", fail)
+    with pytest.raises(OSError):
+        write_binary_bank(QUESTIONS, str(tmp_path / "bank.bank"))
+    assert os.listdir(tmp_path) == []
+
+
+def test_convert_streams_json_bank(tmp_path, monkeypatch):
+    src = tmp_path / "trivia_questions.json"
+    src.write_text(json.dumps({"questions": QUESTIONS}), encoding="utf-8")
+    # The source is streamed, never parsed as a whole
+    monkeypatch.setattr(json, "load", None)
+
+    dst = str(tmp_path / "bank.bank")
+    assert convert_to_binary(str(src), dst) == 3
+    with BinaryBank(dst) as bank:
+        assert list(bank) == QUESTIONS
+        assert bank[0].source_url == QUESTIONS[0]["source_url"]
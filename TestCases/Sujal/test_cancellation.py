@@ -0,0 +1,111 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from cancellation import CancelledError, CancelToken, run_cancellable
+
+
+def test_cancel_runs_callbacks_once():
+    token = CancelToken()
+    calls = []
+    token.on_cancel(lambda: calls.append("a"))
+    unregister = token.on_cancel(lambda: calls.append("b"))
+    unregister()
+
+    token.cancel("window closed")
+    token.cancel("again")
+    assert calls == ["a"]
+    assert token.reason == "window closed"
+    with pytest.raises(CancelledError):
+        token.raise_if_cancelled()
+
+    # Registering after the fact fires immediately
+    token.on_cancel(lambda: calls.append("late"))
+    assert calls == ["a", "late"]
+
+
+def test_run_cancellable_returns_results_and_errors():
+    token = CancelToken()
+    assert run_cancellable(token, lambda x: x * 2, 21) == 42
+    assert run_cancellable(None, max, 1, 2) == 2
+    with pytest.raises(ValueError):
+        run_cancellable(token, int, "not a number")
+
+
+def test_blocked_call_is_abandoned_promptly():
+    token = CancelToken()
+    release = threading.Event()
+
+    def slow_request():
+        release.wait(10)   # e.g. an OpenAI call that takes ages
+        return "late result"
+
+    threading.Timer(0.05, token.cancel, args=("switched to Hard",)).start()
+    started = time.perf_counter()
+    with pytest.raises(CancelledError, match="switched to Hard"):
+        run_cancellable(token, slow_request)
+    assert time.perf_counter() - started < 1.0
+    release.set()
+
+
+def test_already_cancelled_token_never_starts_work():
+    token = CancelToken()
+    token.cancel()
+    started = []
+    with pytest.raises(CancelledError):
+        run_cancellable(token, lambda: started.append(1))
+    assert started == []
+
+
+def test_cancel_tears_down_the_openai_request(monkeypatch):
+    import generate_trivia
+
+    closed = threading.Event()
+    finished = threading.Event()
+
+    class FakeHttpClient:
+        def close(self):
+            closed.set()
+
+    class FakeOpenAI:
+        def with_options(self, http_client):
+            self.http_client = http_client
+            return self
+
+        @property
+        def responses(self):
+            return self
+
+        def create(self, **kwargs):
+            # Blocked on the network until the connection is closed
+            try:
+                if closed.wait(10):
+                    raise ConnectionError("connection closed")
+            finally:
+                finished.set()
+
+    monkeypatch.setattr(generate_trivia, "get_client", FakeOpenAI)
+    monkeypatch.setattr(generate_trivia, "_new_http_client", FakeHttpClient)
+
+    token = CancelToken()
+    threading.Timer(0.05, token.cancel).start()
+    with pytest.raises(CancelledError):
+        run_cancellable(token, generate_trivia.ask_openai, "prompt", token)
+
+    assert closed.is_set()
+    assert finished.wait(1)     # the request itself ended, not just the wait for it
+
+
+def test_error_caused_by_cancel_is_reported_as_cancelled():
+    token = CancelToken()
+
+    def call():
+        token.cancel("stop")          # e.g. on_cancel closed the connection...
+        raise ConnectionError("closed")   # ...and the call fails before the wait wakes
+
+    with pytest.raises(CancelledError):
+        run_cancellable(token, call)
@@ -0,0 +1,77 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from countdown import DeadlineCountdown
+
+
+class FakeLoop:
+    """Stands in for tk's after/after_cancel, with a controllable clock and lag."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.pending = {}
+        self.next_id = 0
+        self.lag = 0.0   # every callback fires this much late
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, fn):
+        self.next_id += 1
+        self.pending[self.next_id] = (self.now + ms / 1000 + self.lag, fn)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_until(self, t):
+        while self.pending:
+            after_id, (when, fn) = min(self.pending.items(), key=lambda item: item[1][0])
+            if when > t:
+                break
+            del self.pending[after_id]
+            self.now = when
+            fn()
+        self.now = t
+
+
+def make(loop):
+    shown, expired = [], []
+    countdown = DeadlineCountdown(loop, shown.append, lambda: expired.append(loop.now), clock=loop.clock)
+    return countdown, shown, expired
+
+
+def test_counts_down_each_second():
+    loop = FakeLoop()
+    countdown, shown, expired = make(loop)
+    countdown.start(3)
+    loop.run_until(10)
+    assert shown == [3, 2, 1, 0]
+    assert expired == [pytest.approx(3.0, abs=0.01)]
+    assert not countdown.running
+
+
+@pytest.mark.parametrize("lag", [0.1, 0.4, 0.9])
+def test_late_callbacks_do_not_stretch_the_limit(lag):
+    loop = FakeLoop()
+    loop.lag = lag
+    countdown, shown, expired = make(loop)
+    countdown.start(10)
+    loop.run_until(30)
+    # Expires at most one (late) callback after the real deadline, not 10 × lag
+    assert 10.0 <= expired[0] <= 10.0 + lag + 0.01
+    assert shown[-1] == 0
+    assert countdown.stats()["late_max_ms"] == pytest.approx(lag * 1000, abs=1)
+
+
+def test_stop_never_expires():
+    loop = FakeLoop()
+    countdown, shown, expired = make(loop)
+    countdown.start(2)
+    countdown.stop()
+    loop.run_until(10)
+    assert expired == [] and shown == [2]
+    assert countdown.remaining() == 0
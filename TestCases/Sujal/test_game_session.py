@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from game_session import (
+    ANSWERED,
+    ASKING,
+    GAME_OVER,
+    TIME_UP,
+    WON,
+    WRONG_ANSWER,
+    GameRuleError,
+    GameSession,
+    ManualClock,
+    simulate,
+)
+
+
+def make_questions(n):
+    return [
+        {"question": f"Q{i}?", "answers": ["A", "B", "C", "D"], "correct_index": i % 4, "hint": "h"}
+        for i in range(n)
+    ]
+
+
+def test_winning_game():
+    clock = ManualClock()
+    session = GameSession(make_questions(6), "Hard", clock)
+    question = session.start()
+    while question is not None:
+        clock.advance(3)
+        result = session.answer(question["correct_index"])
+        assert result.correct and session.state == ANSWERED
+        question = session.next_question()
+
+    assert session.state == WON
+    assert session.streak == session.answered == 6
+    assert result.milestone is False
+
+
+def test_milestone_and_wrong_answer():
+    clock = ManualClock()
+    session = GameSession(make_questions(10), "Easy", clock)
+    for i in range(5):
+        q = session.start() if i == 0 else session.next_question()
+        result = session.answer(q["correct_index"])
+    assert result.milestone and result.streak == 5
+
+    q = session.next_question()
+    result = session.answer((q["correct_index"] + 1) % 4)
+    assert not result.correct
+    assert session.state == GAME_OVER and session.end_reason == WRONG_ANSWER
+    with pytest.raises(GameRuleError):
+        session.next_question()
+
+
+def test_late_answer_is_a_timeout():
+    clock = ManualClock()
+    session = GameSession(make_questions(3), "Hard", clock)
+    q = session.start()
+    assert session.time_left() == 10
+    clock.advance(10.5)
+    with pytest.raises(GameRuleError):
+        session.answer(q["correct_index"])
+    assert session.end_reason == TIME_UP
+
+
+def test_expire_and_public_view():
+    clock = ManualClock()
+    session = GameSession(iter(make_questions(2)), "Medium", clock)
+    session.start()
+    view = session.to_dict()
+    assert view["state"] == ASKING
+    assert "correct_index" not in view["question"]
+    assert view["time_left"] == 20
+
+    session.expire()
+    assert session.to_dict()["state"] == GAME_OVER
+    assert session.to_dict()["question"] is None
+
+
+def test_empty_source_wins_immediately():
+    session = GameSession([], "Easy", ManualClock())
+    assert session.start() is None
+    assert session.state == WON
+
+
+def test_simulator_is_deterministic():
+    bank = make_questions(50)
+    first = simulate(bank, 300, questions_per_session=10, seed=3)
+    second = simulate(bank, 300, questions_per_session=10, seed=3)
+    assert first["outcomes"] == second["outcomes"]
+    assert sum(first["outcomes"].values()) == 300
@@ -0,0 +1,36 @@
+import os
+import sys
+import types
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+import generate_trivia
+from question_store import QuestionStore
+from run_checkpoint import RunCheckpoint
+
+URL = "https://www.oudaily.com/news/bizzell"
+RAW = 'Which library is being modernized?\n["Bizzell", "Gaylord", "Catlett", "Dale"]\nHint: The main one.\n0'
+
+
+class NoScraper:
+    def scrape(self, url, cancel=None):
+        raise AssertionError("a resumed article must not be downloaded again")
+
+
+def test_resumed_article_is_still_saved_for_search(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(sys.modules, "parseOUDaily", types.SimpleNamespace(ArticleScraper=NoScraper))
+    monkeypatch.setattr(generate_trivia, "URLS", [URL])
+    monkeypatch.setattr(generate_trivia, "make_trivia_from_article", lambda *args: RAW)
+
+    # An earlier attempt scraped the article, then died before generating
+    RunCheckpoint(difficulty="Easy").record(URL, "scraped", title="Bizzell modernization",
+                                            content="Bizzell Memorial Library is being modernized.")
+
+    store = QuestionStore(str(tmp_path / "bank.db"))
+    questions = generate_trivia.generate_questions_for_difficulty("Easy", json_path=None, resume=True,
+                                                                   store=store)
+
+    assert [q["question"] for q in questions] == ["Which library is being modernized?"]
+    row = store._conn().execute("SELECT title, content FROM articles WHERE url = ?", (URL,)).fetchone()
+    assert row == ("Bizzell modernization", "Bizzell Memorial Library is being modernized.")
+    store.close()
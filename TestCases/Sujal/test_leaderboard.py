@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from leaderboard import Leaderboard, period_bucket
+
+MONDAY = datetime(2026, 10, 19, 12, tzinfo=timezone.utc).timestamp()
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def board(tmp_path):
+    b = Leaderboard(str(tmp_path / "board.db"), clock=lambda: MONDAY)
+    yield b
+    b.close()
+
+
+def test_buckets():
+    assert period_bucket("all", MONDAY) == ""
+    assert period_bucket("week", MONDAY) == "2026-W43"
+    assert period_bucket("day", MONDAY) == "2026-10-19"
+    with pytest.raises(ValueError):
+        period_bucket("month", MONDAY)
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+def test_day_buckets_follow_local_midnight(monkeypatch):
+    # 03:00 UTC on Tuesday is still Monday evening in Norman
+    late_monday = datetime(2026, 10, 20, 3, tzinfo=timezone.utc).timestamp()
+    monkeypatch.setenv("TZ", "America/Chicago")
+    time.tzset()
+    try:
+        assert period_bucket("day", late_monday) == "2026-10-19"
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_rollups_keep_best_and_count_games(board):
+    board.record("sujal", "Hard", 4, finished_at=MONDAY)
+    board.record("sujal", "Hard", 9, finished_at=MONDAY + 60)
+    board.record("sujal", "Hard", 2, finished_at=MONDAY + 120)
+    board.record("jole", "Hard", 9, finished_at=MONDAY + 30)
+    board.record("jayce", "Hard", 1, finished_at=MONDAY)
+    board.record("abraham", "Easy", 20, finished_at=MONDAY)
+
+    top = board.top_k("all", "Hard", 10)
+    assert [(e.rank, e.player, e.best) for e in top] == [(1, "jole", 9), (1, "sujal", 9), (3, "jayce", 1)]
+    assert top[1].games == 3
+
+    assert board.my_rank("jayce", "day", "Hard").rank == 3
+    assert board.my_rank("sujal", "week", "Hard").rank == 1
+    assert board.my_rank("abraham", "all", "Hard") is None
+    assert board.player_count("all", "Hard") == 3
+
+
+def test_daily_board_starts_over_but_weekly_does_not(board):
+    board.record("sujal", "Medium", 10, finished_at=MONDAY)
+    board.record("jole", "Medium", 3, finished_at=MONDAY + DAY)
+
+    tuesday = MONDAY + DAY
+    assert [e.player for e in board.top_k("day", "Medium", when=tuesday)] == ["jole"]
+    assert board.my_rank("jole", "day", "Medium", when=tuesday).rank == 1
+    assert board.my_rank("jole", "week", "Medium", when=tuesday).rank == 2
+    assert board.my_rank("sujal", "day", "Medium", when=tuesday) is None
@@ -0,0 +1,65 @@
+import os
+import sys
+import tkinter as tk
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+import main
+from game_session import ASKING
+from question_store import QuestionStore
+
+
+@pytest.fixture
+def start_screen(tmp_path, monkeypatch):
+    # StartScreen opens trivia_bank.db (bank + leaderboard) in the working directory
+    monkeypatch.chdir(tmp_path)
+    with QuestionStore() as store:
+        store.add_questions(
+            [{"question": f"Q{i}?", "answers": ["A", "B", "C", "D"], "correct_index": 0, "hint": "h"}
+             for i in range(40)],
+            "Easy",
+        )
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    screen = main.StartScreen(root, main.DiffSelect(), player="tester")
+    yield screen
+    screen.close()
+
+
+def test_play_again_reuses_the_quiz_screen(start_screen):
+    start_screen.start_game("Easy")
+    quiz = start_screen.quiz_screen
+    assert start_screen.screens.current is quiz
+    first_buttons = list(quiz.option_buttons)
+
+    quiz.handle_answer(quiz.session.question["correct_index"])
+    quiz.stop_timer()
+    quiz._next_question()
+    quiz.handle_answer((quiz.session.question["correct_index"] + 1) % 4)
+    assert quiz.session.state != ASKING
+    assert quiz.end_frame.winfo_manager() == "pack"
+
+    first_session = quiz.session
+    quiz._play_again()
+    assert start_screen.quiz_screen is quiz
+    assert quiz.option_buttons == first_buttons
+    assert quiz.session is not first_session
+    assert quiz.session.state == ASKING and quiz.session.streak == 0
+    assert quiz.end_frame.winfo_manager() == ""
+    assert all(b.winfo_manager() == "pack" for b in quiz.option_buttons)
+
+    quiz._back_to_menu()
+    assert start_screen.screens.current is start_screen
+    start_screen.start_game("Easy")
+    assert start_screen.quiz_screen is quiz
+
+
+def test_close_closes_the_question_store(start_screen):
+    store = start_screen.question_store
+    assert store._all_conns
+    start_screen.close()
+    assert store._all_conns == []
+    start_screen.close = lambda: None    # already closed; keep the fixture from closing again
@@ -0,0 +1,113 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from conftest import make_questions
+from question_pool import PoolManager, QuestionPool, make_store_refill
+from question_store import QuestionStore
+from startup_bank import load_cached_bank
+
+
+class CountingRefill:
+    """Hands out new numbered questions; can be held up to test single-flight."""
+
+    def __init__(self, batch=25):
+        self.batch = batch
+        self.calls = 0
+        self.next_id = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, difficulty, count):
+        self.calls += 1
+        self.gate.wait(5)
+        n = min(count, self.batch)
+        start, self.next_id = self.next_id, self.next_id + n
+        return [
+            {"question": f"{difficulty} {i}?", "answers": ["A", "B", "C", "D"]}
+            for i in range(start, start + n)
+        ]
+
+
+def test_refill_goes_up_to_high_watermark():
+    refill = CountingRefill(batch=25)
+    pool = QuestionPool("Easy", refill, low=10, high=60)
+    assert pool.request_refill()
+    pool.wait_for_refill(5)
+    assert len(pool) == 60
+    assert refill.calls == 3  # 25 + 25 + 10
+
+
+def test_take_never_waits_and_triggers_single_refill():
+    refill = CountingRefill()
+    pool = QuestionPool("Hard", refill, low=10, high=40)
+    pool.request_refill()
+    pool.wait_for_refill(5)
+
+    refill.gate.clear()   # hold the next refill
+    calls_before = refill.calls
+    assert len(pool.take(35)) == 35       # 5 left: below low, refill starts
+    assert pool.refill_in_flight
+    assert len(pool.take(10)) == 5        # short, but immediate
+    assert pool.take(10) == []
+    assert not pool.request_refill()      # still only one in flight
+
+    refill.gate.set()
+    pool.wait_for_refill(5)
+    assert len(pool) == 40
+    assert refill.calls - calls_before == 2
+
+
+def test_no_duplicates_and_small_sources_stop():
+    same = [{"question": "Only?", "answers": ["A", "B", "C", "D"]}] * 5
+    pool = QuestionPool("Easy", lambda d, n: list(same), low=1, high=10)
+    pool.request_refill()
+    pool.wait_for_refill(5)
+    assert len(pool) == 1   # gave up after rounds that added nothing
+
+
+def test_metrics_and_errors():
+    pool = QuestionPool("Medium", CountingRefill(), low=5, high=20)
+    pool.request_refill()
+    pool.wait_for_refill(5)
+    pool.take(8)
+    m = pool.metrics()
+    assert m["consumed_total"] == 8
+    assert m["refilled_total"] == 20
+    assert m["consume_per_min"] > 0
+
+    def broken(difficulty, count):
+        raise RuntimeError("db locked")
+
+    failing = QuestionPool("Hard", broken, low=1, high=5)
+    failing.request_refill()
+    failing.wait_for_refill(5)
+    assert failing.metrics()["last_refill_error"] == "db locked"
+    assert failing.refill_failures == 1
+
+
+def test_bad_watermarks():
+    with pytest.raises(ValueError):
+        QuestionPool("Easy", CountingRefill(), low=10, high=10)
+
+
+def test_store_backed_pools_feed_sessions(tmp_path):
+    store = QuestionStore(str(tmp_path / "bank.db"))
+    store.add_questions(make_questions(100), "Hard")
+
+    pools = PoolManager(make_store_refill(store), low=10, high=50)
+    pools.prime()
+    for pool in pools.pools.values():
+        pool.wait_for_refill(5)
+
+    assert len(pools.pools["Hard"]) == 50
+    assert len(pools.pools["Easy"]) == 0
+
+    bank = load_cached_bank(store, "Hard", count=30, json_path=None, pool=pools)
+    assert len(bank.questions) == 30
+    assert len({q.question for q in bank.questions}) == 30
+    assert pools.metrics()["Hard"]["consumed_total"] == 30
+    store.close()
@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from jsonBuilder import JSONBuilder
+from question_record import QuestionRecord
+
+SAMPLE = {
+    "question": "Which library is being modernized?",
+    "answers": ["Bizzell", "Gaylord", "Catlett", "Dale"],
+    "correct_index": 0,
+    "hint": "Think of the main library.",
+    "source_title": "Bizzell modernization",
+}
+
+
+def test_reads_like_a_dict():
+    q = QuestionRecord.from_dict(SAMPLE)
+    assert q["question"] == SAMPLE["question"]
+    assert list(q["answers"]) == SAMPLE["answers"]
+    assert q.get("hint", "") == SAMPLE["hint"]
+    assert "source_title" in q
+    assert "difficulty" not in q
+    assert q.get("difficulty", "Easy") == "Easy"
+    with pytest.raises(KeyError):
+        q["difficulty"]
+    with pytest.raises(KeyError):
+        q["options"]
+    assert q == SAMPLE
+    assert q.to_dict() == SAMPLE
+
+
+def test_has_no_instance_dict():
+    q = QuestionRecord.from_dict(SAMPLE)
+    assert not hasattr(q, "__dict__")
+
+
+def test_records_are_hashable():
+    a = QuestionRecord.from_dict(SAMPLE)
+    b = QuestionRecord.from_dict(dict(SAMPLE))
+    assert a == b and hash(a) == hash(b)
+    assert len({a, b}) == 1
+    assert {a: "seen"}[b] == "seen"
+
+
+def test_source_titles_are_interned():
+    # Build the title at runtime so the two strings start out as different objects
+    a = QuestionRecord("Q1", ["A"], 0, source_title="".join(["Mateer ", "vs LSU"]))
+    b = QuestionRecord("Q2", ["B"], 0, source_title="".join(["Mateer vs", " LSU"]))
+    assert a.source_title is b.source_title
+
+
+def test_builder_saves_records_as_json(tmp_path):
+    builder = JSONBuilder()
+    builder.add_question(" Q? ", [" A ", "B", "C", "D"], 2, " hint ", " Title ", "Hard")
+    assert isinstance(builder.questions[0], QuestionRecord)
+
+    path = tmp_path / "trivia_questions.json"
+    builder.save_all(str(path))
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved == {"questions": [{
+        "question": "Q?",
+        "answers": ["A", "B", "C", "D"],
+        "correct_index": 2,
+        "hint": "hint",
+        "source_title": "Title",
+        "difficulty": "Hard",
+    }]}
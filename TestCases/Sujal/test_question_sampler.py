@@ -0,0 +1,106 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+import generate_trivia
+from binary_bank import BinaryBank, write_binary_bank
+from question_record import QuestionRecord
+from question_sampler import QuestionDealer, QuestionSampler, ShuffleBag
+from question_store import QuestionStore
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+
+def make_bank(n, per_article=4):
+    return [
+        QuestionRecord(f"Q{i}?", ["A", "B", "C", "D"], i % 4, "h", f"Article {i // per_article}",
+                       DIFFICULTIES[i % 3], f"https://example.com/{i // per_article}")
+        for i in range(n)
+    ]
+
+
+def no_article_repeats(questions):
+    return all(a.source_title != b.source_title for a, b in zip(questions, questions[1:]))
+
+
+def test_shuffle_bag_is_a_permutation_with_small_memory():
+    import random
+
+    bag = ShuffleBag(100_000, random.Random(1))
+    first = [bag.draw() for _ in range(50)]
+    assert len(set(first)) == 50
+    assert len(bag._swaps) <= 50
+
+    small = ShuffleBag(500, random.Random(2))
+    assert sorted(small.draw() for _ in range(500)) == list(range(500))
+    assert len(small) == 0
+
+
+def test_list_bank_no_repeats_and_reproducible():
+    bank = make_bank(60)
+    dealt = list(QuestionSampler(bank, seed=7))
+    assert len(dealt) == 60
+    assert len({q.question for q in dealt}) == 60
+    assert no_article_repeats(dealt)
+    assert dealt == list(QuestionSampler(bank, seed=7))
+    assert dealt != list(QuestionSampler(bank, seed=8))
+
+
+def test_difficulties_taken_in_turn():
+    sampler = QuestionSampler(make_bank(30), difficulties=["Easy", "Hard"], seed=3)
+    dealt = sampler.draw_many(10)
+    assert [q.difficulty for q in dealt] == ["Easy", "Hard"] * 5
+    assert len(sampler.draw_many(100)) == 10      # 10 Easy + 10 Hard in the bank
+    assert sampler.draw() is None
+
+
+def test_same_article_only_when_unavoidable():
+    # One article only: still deals everything
+    bank = make_bank(5, per_article=100)
+    assert len(list(QuestionSampler(bank, seed=1))) == 5
+
+
+def test_binary_and_store_banks(tmp_path):
+    bank = make_bank(90)
+    path = str(tmp_path / "q.bank")
+    write_binary_bank(bank, path)
+    with BinaryBank(path) as binary:
+        hard = list(QuestionSampler(binary, "Hard", seed=5))
+    assert len(hard) == 30 and {q.difficulty for q in hard} == {"Hard"}
+    assert no_article_repeats(hard)
+
+    store = QuestionStore(str(tmp_path / "q.db"))
+    store.add_questions(bank)
+    dealt = list(QuestionSampler(store, "Medium", seed=5))
+    assert sorted(q.question for q in dealt) == sorted(q.question for q in bank if q.difficulty == "Medium")
+    assert no_article_repeats(dealt)
+    store.close()
+
+
+def test_store_bank_is_uniform_when_difficulties_interleave(tmp_path):
+    # F0 sits alone before a long run of Easy ids; the other Hard questions follow it
+    store = QuestionStore(str(tmp_path / "q.db"))
+    store.add_questions([QuestionRecord("F0?", ["A", "B", "C", "D"], 0, "h", "F", "Hard")])
+    store.add_questions(QuestionRecord(f"E{i}?", ["A", "B", "C", "D"], 0, "h", "E", "Easy") for i in range(1000))
+    store.add_questions(QuestionRecord(f"L{i}?", ["A", "B", "C", "D"], 0, "h", f"L{i}", "Hard") for i in range(9))
+
+    firsts = [QuestionSampler(store, "Hard", seed=seed, spread_sources=False).draw().question
+              for seed in range(200)]
+    assert firsts.count("F0?") < 40          # 20 expected; a gap-biased pick gives ~0 or ~200
+    assert len(set(firsts)) == 10
+    assert len(list(QuestionSampler(store, "Hard", seed=1))) == 10
+    store.close()
+
+
+def test_dealer_cycles_without_repeats(tmp_path):
+    store = QuestionStore(str(tmp_path / "q.db"))
+    store.add_questions(make_bank(9))
+    dealer = QuestionDealer(store, "Easy")
+    first_round = [dealer.draw()["question"] for _ in range(3)]
+    assert len(set(first_round)) == 3
+    # Bank used up -> a new shuffle instead of None
+    assert dealer.draw() is not None
+    assert QuestionDealer([]).draw() is None
+
+    assert generate_trivia.get_random_question("Easy", bank=store)["question"] in first_round
+    store.close()
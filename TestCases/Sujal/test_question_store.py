@@ -0,0 +1,212 @@
+import json
+import os
+import random
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from conftest import make_questions
+from question_record import QuestionRecord
+from question_store import QuestionStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    s = QuestionStore(str(tmp_path / "bank.db"))
+    yield s
+    s.close()
+
+
+def test_wal_mode(store):
+    mode = store._conn().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_difficulties_do_not_clobber_each_other(store):
+    assert store.add_questions(make_questions(10), "Easy") == 10
+    assert store.add_questions(make_questions(6, prefix="H"), "Hard") == 6
+    assert store.counts() == {"Easy": 10, "Hard": 6}
+
+
+def test_duplicates_are_skipped(store):
+    store.add_questions(make_questions(10), "Easy")
+    assert store.add_questions(make_questions(12), "Easy") == 2
+    assert store.count("Easy") == 12
+
+
+def test_missing_difficulty_is_an_error(store):
+    with pytest.raises(ValueError):
+        store.add_questions(make_questions(1))
+
+
+def test_round_trip_records(store):
+    store.add_questions(make_questions(3, "Medium"))
+    got = store.questions("Medium")
+    assert all(isinstance(q, QuestionRecord) for q in got)
+    assert [q.to_dict() for q in got] == make_questions(3, "Medium")
+
+
+@pytest.mark.parametrize("total", [5, 500])
+def test_sample_is_distinct_and_filtered(store, total):
+    store.add_questions(make_questions(total, prefix="E"), "Easy")
+    store.add_questions(make_questions(total, prefix="H"), "Hard")
+    picked = store.sample("Hard", 10, random.Random(7))
+    assert len(picked) == min(10, total)
+    assert all(q.difficulty == "Hard" for q in picked)
+    assert len({q.question for q in picked}) == len(picked)
+
+
+def test_sample_is_uniform_when_difficulties_interleave(store):
+    # One Hard question, a long run of Easy ids, then nine more Hard ones:
+    # a pick by random id would almost always land on the later Hard block
+    store.add_questions(make_questions(1, prefix="F"), "Hard")
+    store.add_questions(make_questions(1000, prefix="E"), "Easy")
+    store.add_questions(make_questions(9, prefix="L"), "Hard")
+
+    rng = random.Random(3)
+    firsts = {}
+    for _ in range(2000):
+        q = store.sample("Hard", 1, rng)[0]
+        firsts[q.question] = firsts.get(q.question, 0) + 1
+    assert len(firsts) == 10
+    assert all(120 < n < 280 for n in firsts.values())   # 200 each if uniform
+
+
+def test_sample_sees_inserts_and_deletes(store):
+    store.add_questions(make_questions(10, prefix="A"), "Easy")
+    assert len(store.sample("Easy", 50)) == 10
+    store.add_questions(make_questions(5, prefix="B"), "Easy")
+    assert len(store.sample("Easy", 50)) == 15
+    store.delete_source("https://www.oudaily.com/news/0")
+    picked = store.sample("Easy", 50)
+    assert len(picked) == 12
+    assert all(q.source_url != "https://www.oudaily.com/news/0" for q in picked)
+
+
+def test_ids_grow_by_appending_after_inserts(store):
+    store.add_questions(make_questions(10, prefix="A"), "Easy")
+    ids = store.ids("Easy")
+    for batch in range(3):
+        store.add_questions(make_questions(1, prefix=f"B{batch}"), "Easy")
+        store.add_questions(make_questions(1, prefix=f"H{batch}"), "Hard")
+        assert store.ids("Easy") is ids            # extended in place, not rebuilt
+    assert list(ids) == sorted(ids) and len(ids) == 13
+    assert list(ids) == [r[0] for r in store._conn().execute(
+        "SELECT id FROM questions WHERE difficulty = 'Easy' ORDER BY id")]
+
+
+def test_import_json_and_delete_source(store, tmp_path):
+    path = tmp_path / "trivia_questions.json"
+    path.write_text(json.dumps({"questions": make_questions(20)}), encoding="utf-8")
+    assert store.import_json(str(path), "Easy", batch_size=6) == 20
+    assert store.delete_source("https://www.oudaily.com/news/0") == 4
+    assert store.count() == 16
+
+
+def test_concurrent_reader_and_writer(store):
+    errors = []
+
+    def writer():
+        try:
+            for batch in range(20):
+                store.add_questions(make_questions(25, prefix=f"W{batch}"), "Hard")
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(50):
+                store.sample("Hard", 3)
+                store.count("Hard")
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert store.count("Hard") == 500
+
+
+def test_released_thread_connections_are_closed(store):
+    store.add_questions(make_questions(20), "Easy")
+
+    def worker():
+        store.sample("Easy", 3)
+        store.release()
+
+    for _ in range(200):
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+    assert len(store._all_conns) == 1     # just the main thread's
+    store.release()
+    store.release()                       # nothing left to close: no error
+    assert store.count("Easy") == 20      # reopens on next use
+
+
+# -------- full-text search --------
+
+def test_search_ranks_question_text_first(store):
+    store.add_questions([
+        {"question": "What is being renovated at Bizzell?", "answers": ["Stacks", "Cafe", "Lobby", "Roof"],
+         "correct_index": 0, "hint": "", "source_url": "u1", "difficulty": "Easy"},
+        {"question": "Which building is oldest?", "answers": ["Evans", "Bizzell", "Carnegie", "Gould"],
+         "correct_index": 2, "hint": "", "source_url": "u2", "difficulty": "Hard"},
+        {"question": "Who threw for 300 yards?", "answers": ["Mateer", "Hawkins", "Arnold", "Thompson"],
+         "correct_index": 0, "hint": "", "source_url": "u3", "difficulty": "Hard"},
+    ])
+    hits = store.search("bizzell")
+    assert [h.question.source_url for h in hits] == ["u1", "u2"]
+    assert "[Bizzell]" in hits[0].snippet
+
+    assert [h.question.source_url for h in store.search("bizzell", difficulty="Hard")] == ["u2"]
+    assert [h.question.source_url for h in store.search("Mate")] == ["u3"]  # prefix match
+    assert store.search("OU's \"quoted\" (input)") == []  # no FTS syntax errors
+    assert store.search("   ") == []
+
+
+def test_search_stays_in_sync(store):
+    store.add_questions(make_questions(10, "Easy"))
+    assert len(store.search("Article 3")) == 2
+    store.delete_source("https://www.oudaily.com/news/3")
+    assert store.search("Article 3") == []
+
+    conn = store._conn()
+    with conn:
+        conn.execute("UPDATE questions SET hint = 'Catlett wasps' WHERE id = 1")
+    assert [h.id for h in store.search("wasps")] == [1]
+
+
+def test_article_search(store):
+    store.add_article("u1", "Wasps at Catlett", "Students found wasps in the music center.")
+    store.add_article("u2", "Playoff conflict", "Finals overlap with a home playoff game.")
+    assert [h.url for h in store.search_articles("wasps")] == ["u1"]
+
+    store.add_article("u1", "Wasps at Catlett", "Exterminators were called.")
+    assert store.search_articles("students") == []
+    assert [h.url for h in store.search_articles("exterminators")] == ["u1"]
+
+
+def test_existing_bank_gets_indexed(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.db")
+    store = QuestionStore(path)
+    store.add_questions(make_questions(3, "Easy"))
+    store.close()
+
+    # Simulate a bank made before search existed
+    conn = sqlite3.connect(path)
+    conn.executescript("DROP TABLE questions_fts; DROP TABLE articles_fts;")
+    conn.close()
+
+    reopened = QuestionStore(path)
+    assert len(reopened.search("Q")) == 3
+    reopened.close()
@@ -0,0 +1,105 @@
+import io
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+import question_stream
+from question_stream import iter_questions, random_question, sample_questions
+
+
+def make_questions(n):
+    return [
+        {
+            "question": f"Question {i} with \"quotes\", [brackets] and {{braces}}?",
+            "answers": ["A", "B", "C", "D"],
+            "correct_index": i % 4,
+            "hint": "ü ✓",
+            "source_title": f"Article {i % 3}",
+            "difficulty": ["Easy", "Medium", "Hard"][i % 3],
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture()
+def bank(tmp_path):
+    qs = make_questions(50)
+    path = tmp_path / "trivia_questions.json"
+    with path.open("w", encoding="utf-8") as f:
+        json.dump({"meta": {"questionsish": [1, 2]}, "questions": qs}, f, indent=4, ensure_ascii=False)
+    return str(path), qs
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 65536])
+def test_streams_every_question_in_order(bank, chunk_size):
+    path, qs = bank
+    assert list(iter_questions(path, chunk_size=chunk_size)) == qs
+
+
+def test_filters_and_limit(bank):
+    path, qs = bank
+    hard = list(iter_questions(path, difficulty="Hard"))
+    assert hard == [q for q in qs if q["difficulty"] == "Hard"]
+
+    first_two = list(iter_questions(path, source_title="Article 1", limit=2))
+    assert [q["question"] for q in first_two] == [qs[1]["question"], qs[4]["question"]]
+
+
+def test_bare_array_and_jsonl(tmp_path):
+    qs = make_questions(5)
+    array_path = tmp_path / "bank.json"
+    array_path.write_text(json.dumps(qs), encoding="utf-8")
+    jsonl_path = tmp_path / "bank.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(q) for q in qs) + "\n", encoding="utf-8")
+
+    assert list(iter_questions(str(array_path), chunk_size=5)) == qs
+    assert list(iter_questions(str(jsonl_path))) == qs
+
+
+def test_sampling(bank):
+    path, qs = bank
+    picked = sample_questions(path, 10, difficulty="Easy", rng=random.Random(3))
+    assert len(picked) == 10
+    assert all(q["difficulty"] == "Easy" for q in picked)
+    assert len({q["question"] for q in picked}) == 10
+
+    assert random_question(path, source_title="nope") is None
+
+
+@pytest.mark.parametrize("chunk_size", [3, 65536])
+def test_only_the_top_level_questions_key_counts(tmp_path, chunk_size):
+    qs = make_questions(4)
+    doc = {
+        "note": 'the "questions": [ list ] is below',
+        "version": 1234567,
+        "meta": {"questions": [{"question": "nested, not a real one"}], "empty": []},
+        "questions": qs,
+        "after": {"questions": []},
+    }
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    assert list(iter_questions(str(path), chunk_size=chunk_size)) == qs
+
+    path.write_text(json.dumps({"meta": {"questions": qs}}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_questions(str(path), chunk_size=chunk_size))
+
+
+def test_truncated_file_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"questions": [{"question": "Q"}, {"quest', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_questions(str(path), chunk_size=8))
+
+
+def test_malformed_value_fails_without_reading_to_the_end():
+    text = '{"questions": [{"question": "Q"}, {"question": oops}' + ", {}" * 10_000 + "]}"
+    f = io.StringIO(text)
+    with pytest.raises(json.JSONDecodeError, match=r"at file offset 47"):
+        for _ in question_stream._iter_array(f, chunk_size=16, max_value=200):
+            pass
+    assert f.tell() < 300
@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from jsonBuilder import JSONBuilder
+from question_validator import DEFAULT_VALIDATOR, QuestionValidator, validate_file
+
+
+def good(**changes):
+    q = {
+        "question": "Who started at quarterback against LSU?",
+        "answers": ["John Mateer", "Michael Hawkins Jr.", "Jackson Arnold", "Casey Thompson"],
+        "correct_index": 0,
+        "hint": "He transferred from Washington State.",
+        "source_title": "Mateer vs LSU",
+    }
+    q.update(changes)
+    return q
+
+
+def codes(q):
+    return {i.code for i in DEFAULT_VALIDATOR.validate_question(q)}
+
+
+def test_good_question_has_no_issues():
+    assert codes(good()) == set()
+
+
+@pytest.mark.parametrize("changes, code", [
+    ({"answers": ["A", "B", "C"]}, "answer_count"),
+    ({"correct_index": 4}, "index_range"),
+    ({"correct_index": -1}, "index_range"),
+    ({"correct_index": "0"}, "missing_field"),
+    ({"answers": None}, "missing_field"),
+    ({"question": "   "}, "empty_text"),
+    ({"answers": ["A", "", "C", "D"]}, "empty_text"),
+    ({"answers": ["Norman", "norman!", "Tulsa", "OKC"]}, "duplicate_answer"),
+    ({"question": "x" * 400}, "too_long"),
+    ({"hint": "Think John Mateer."}, "hint_leak"),
+])
+def test_each_rule(changes, code):
+    assert code in codes(good(**changes))
+
+
+@pytest.mark.parametrize("entry", [None, ["Q?", ["A", "B", "C", "D"], 0], "Q?"])
+def test_non_object_entries_are_reported_not_raised(entry):
+    assert [i.code for i in DEFAULT_VALIDATOR.validate_question(entry)] == ["not_an_object"]
+    valid, report = DEFAULT_VALIDATOR.filter_valid([good(), entry, good()])
+    assert len(valid) == 2
+    assert report.invalid_indexes == [1]
+
+
+def test_hint_leak_is_only_a_warning():
+    report = DEFAULT_VALIDATOR.validate_bank([good(hint="It was John Mateer")])
+    assert report.ok
+    assert [i.code for i in report.warnings] == ["hint_leak"]
+
+
+def test_bank_report_and_filter():
+    bank = [good(), good(correct_index=9), good(answers=["A", "A", "B", "C"]), good()]
+    valid, report = DEFAULT_VALIDATOR.filter_valid(bank)
+    assert report.total == 4
+    assert report.invalid_indexes == [1, 2]
+    assert report.valid_count == 2
+    assert len(valid) == 2
+    assert report.to_dict()["counts"] == {"index_range": 1, "duplicate_answer": 1}
+
+
+def test_custom_limits():
+    strict = QuestionValidator(max_question_length=10)
+    assert not strict.validate_bank([good()]).ok
+
+
+def test_builder_rejects_invalid_question():
+    builder = JSONBuilder()
+    with pytest.raises(ValueError):
+        builder.add_question("Q?", ["A", "B", "C", "D"], 5, "hint")
+    with pytest.raises(ValueError):
+        builder.add_question("Q?", ["A", "a", "C", "D"], 0, "hint")
+    assert builder.questions == []
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_validate_file(tmp_path, processes):
+    bank = [good() for _ in range(30)] + [good(correct_index=7)]
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps({"questions": bank}), encoding="utf-8")
+
+    report = validate_file(str(path), processes=processes, chunk_size=7)
+    assert report.total == 31
+    assert report.invalid_indexes == [30]
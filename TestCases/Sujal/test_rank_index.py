@@ -0,0 +1,85 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from leaderboard import Leaderboard
+from rank_index import FenwickTree, LiveRanks, RankIndex
+
+
+def brute_rank(scores, player):
+    return 1 + sum(1 for s in scores.values() if s > scores[player])
+
+
+def test_fenwick_prefix_sums_and_find():
+    counts = [3, 0, 2, 5, 0, 1]
+    tree = FenwickTree.from_counts(counts)
+    assert [tree.prefix_sum(i) for i in range(6)] == [3, 3, 5, 10, 10, 11]
+    assert [tree.find(k) for k in (1, 3, 4, 6, 11)] == [0, 0, 2, 3, 5]
+    tree.add(4, 2)
+    assert tree.prefix_sum(4) == 12
+
+
+def test_ranks_match_brute_force_under_updates():
+    rng = random.Random(5)
+    scores = {f"p{i}": rng.randrange(40) for i in range(300)}
+    index = RankIndex.build(scores.items(), max_score=100)
+    for _ in range(2000):
+        player = f"p{rng.randrange(320)}"
+        scores[player] = rng.randrange(40)
+        index.set(player, scores[player])
+    assert all(index.rank(p) == brute_rank(scores, p) for p in scores)
+
+    top = index.top_k(15)
+    expected = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:15]
+    assert [(p, s) for _, p, s in top] == expected
+    assert all(rank == brute_rank(scores, p) for rank, p, _ in top)
+
+    index.remove("p0")
+    assert index.rank("p0") is None and len(index) == len(scores) - 1
+
+
+def test_scores_above_the_cap_share_the_top_bucket():
+    index = RankIndex(max_score=10)
+    index.set("a", 50)
+    index.set("b", 12)
+    index.set("c", 3)
+    assert index.rank("a") == index.rank("b") == 1 and index.rank("c") == 3
+
+
+def test_live_ranks_rebuild_and_flush(tmp_path):
+    board = Leaderboard(str(tmp_path / "board.db"))
+    board.record("sujal", "Hard", 7)
+    board.record("jole", "Hard", 4)
+
+    live = LiveRanks(board, flush_interval=60)
+    assert live.rank("sujal", "Hard") == 1
+    assert live.offer("jole", "Hard", 9) == 1
+    assert live.offer("jole", "Hard", 2) == 1      # lower than the best: ignored
+    assert board.my_rank("jole", "all", "Hard").rank == 2   # not flushed yet
+
+    live.close()
+    assert board.my_rank("jole", "all", "Hard").rank == 1
+    assert board.my_rank("jole", "all", "Hard").games == 1
+    assert LiveRanks(board).rank("sujal", "Hard") == 2
+    board.close()
+
+
+def test_live_ranks_follow_the_day_bucket(tmp_path):
+    now = [1_760_000_000.0]
+    board = Leaderboard(str(tmp_path / "board.db"), clock=lambda: now[0])
+    board.record("sujal", "Hard", 7)
+
+    live = LiveRanks(board, period="day", flush_interval=60)
+    assert live.rank("sujal", "Hard") == 1
+    assert live.offer("jole", "Hard", 3) == 2
+
+    now[0] += 86_400                                # next day: a fresh board
+    assert live.rank("sujal", "Hard") is None
+    assert live.offer("jole", "Hard", 1) == 1
+
+    live.close()
+    yesterday = now[0] - 86_400
+    assert board.my_rank("jole", "day", "Hard", when=yesterday).best == 3
+    assert board.my_rank("jole", "day", "Hard").best == 1
+    board.close()
@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from jsonBuilder import atomic_write_json
+from run_checkpoint import RunCheckpoint
+
+
+@pytest.fixture()
+def run_dir(tmp_path):
+    return str(tmp_path / "runs")
+
+
+def test_new_run_gets_id_and_saves(run_dir):
+    cp = RunCheckpoint(difficulty="Easy", checkpoint_dir=run_dir)
+    cp.record("url1", "scraped", title="T", content="C")
+    assert cp.run_id
+    assert os.path.exists(cp.path)
+    assert cp.stage_of("url1") == "scraped"
+    assert not cp.is_done("url1")
+
+
+def test_reopen_keeps_progress(run_dir):
+    cp = RunCheckpoint(difficulty="Hard", checkpoint_dir=run_dir)
+    cp.record("url1", "parsed", question={"question": "Q1"})
+    cp.record("url2", "skipped")
+    cp.record("url3", "generated", raw="raw text")
+
+    again = RunCheckpoint(cp.run_id, checkpoint_dir=run_dir)
+    assert again.urls_done() == ["url1", "url2"]
+    assert again.article("url3")["raw"] == "raw text"
+    assert again.difficulty == "Hard"
+
+
+def test_questions_follow_url_order(run_dir):
+    cp = RunCheckpoint(difficulty="Easy", checkpoint_dir=run_dir)
+    cp.record("b", "parsed", question={"question": "B"})
+    cp.record("a", "parsed", question={"question": "A"})
+    cp.record("c", "failed", error="boom")
+    assert [q["question"] for q in cp.questions(["a", "b", "c"])] == ["A", "B"]
+
+
+def test_latest_incomplete_skips_finished_runs(run_dir):
+    finished = RunCheckpoint("20250101-000000-aaaaaa", "Easy", run_dir)
+    finished.mark_complete()
+    open_run = RunCheckpoint("20250102-000000-bbbbbb", "Easy", run_dir)
+    open_run.save()
+    RunCheckpoint("20250103-000000-cccccc", "Hard", run_dir).save()
+
+    found = RunCheckpoint.latest_incomplete("Easy", run_dir)
+    assert found.run_id == open_run.run_id
+    assert RunCheckpoint.latest_incomplete("Medium", run_dir) is None
+
+
+def test_background_runs_are_never_resumed(run_dir):
+    RunCheckpoint("20250101-000000-aaaaaa", "Easy", run_dir).save()
+    RunCheckpoint("20250102-000000-bbbbbb", "Easy", run_dir, background=True).save()
+
+    assert RunCheckpoint.latest_incomplete("Easy", run_dir).run_id == "20250101-000000-aaaaaa"
+    assert RunCheckpoint("20250102-000000-bbbbbb", checkpoint_dir=run_dir).state["background"]
+
+
+def test_atomic_write_replaces_without_temp_files(tmp_path):
+    target = tmp_path / "trivia_questions.json"
+    atomic_write_json(str(target), {"questions": [1]})
+    atomic_write_json(str(target), {"questions": [1, 2]})
+
+    assert json.loads(target.read_text(encoding="utf-8")) == {"questions": [1, 2]}
+    assert os.listdir(tmp_path) == ["trivia_questions.json"]
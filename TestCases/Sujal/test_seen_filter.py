@@ -0,0 +1,77 @@
+import hashlib
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from question_record import QuestionRecord
+from question_sampler import QuestionSampler
+from seen_filter import SeenFilter, SeenFilterStore
+
+
+def key(i):
+    return hashlib.sha256(f"question {i}".encode()).hexdigest()[:32]
+
+
+def make_bank(n):
+    return [QuestionRecord(f"Q{i}?", ["A", "B", "C", "D"], 0, "h", f"Article {i}", "Easy") for i in range(n)]
+
+
+def test_no_false_negatives_and_low_false_positives():
+    seen = SeenFilter(capacity=2000, fp_rate=0.01)
+    for i in range(2000):
+        seen.add(key(i))
+    assert all(key(i) in seen for i in range(2000))
+    false_hits = sum(1 for i in range(2000, 12000) if key(i) in seen)
+    assert false_hits / 10000 < 0.02
+
+
+def test_size_stays_fixed_as_answers_grow():
+    seen = SeenFilter()
+    size = seen.nbytes
+    for i in range(30000):
+        seen.add(key(i))
+    assert seen.nbytes == size < 12 * 1024
+    # The most recent capacity's worth is always remembered
+    assert all(key(i) in seen for i in range(30000 - seen.capacity, 30000))
+
+
+def test_round_trip_through_store(tmp_path):
+    store = SeenFilterStore(str(tmp_path / "seen.db"))
+    seen = store.load("sujal")
+    bank = make_bank(5)
+    seen.add(bank[0])
+    seen.add(key(1))
+    store.save("sujal", seen)
+    assert key(1) in store.load("sujal")      # before the write-behind flush
+    store.close()
+
+    again_store = SeenFilterStore(str(tmp_path / "seen.db"))
+    again = again_store.load("sujal")
+    assert bank[0] in again and key(1) in again
+    assert bank[3] not in again_store.load("someone else")
+    again_store.close()
+
+
+def test_save_is_write_behind(tmp_path):
+    store = SeenFilterStore(str(tmp_path / "seen.db"), flush_interval=60)
+    seen = store.load("sujal")
+    seen.add(key(7))
+    store.save("sujal", seen)
+    assert store.pending() == 1
+
+    reader = SeenFilterStore(str(tmp_path / "seen.db"))
+    assert len(reader.load("sujal")) == 0         # not on disk yet
+    assert store.flush() == 1 and store.pending() == 0
+    assert key(7) in reader.load("sujal")
+    reader.close()
+    store.close()
+
+
+def test_sampler_deals_seen_questions_last():
+    bank = make_bank(20)
+    seen = SeenFilter()
+    for q in bank[:15]:
+        seen.add(q)
+    dealt = list(QuestionSampler(bank, seed=4, seen=seen))
+    assert {q.question for q in dealt[:5]} == {f"Q{i}?" for i in range(15, 20)}
+    assert len(dealt) == 20
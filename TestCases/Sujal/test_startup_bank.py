@@ -0,0 +1,98 @@
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from conftest import make_questions
+from question_store import QuestionStore
+from startup_bank import (
+    GENERATE,
+    PLAY,
+    PLAY_AND_REFRESH,
+    BackgroundRefresher,
+    CachedBank,
+    load_cached_bank,
+    plan_startup,
+)
+
+
+@pytest.fixture()
+def store(tmp_path):
+    s = QuestionStore(str(tmp_path / "bank.db"))
+    yield s
+    s.close()
+
+
+def test_loads_from_store_first(store, tmp_path):
+    store.add_questions(make_questions(50, "Hard"))
+    bank = load_cached_bank(store, "Hard", count=10, json_path=None)
+    assert bank.source == "store"
+    assert len(bank.questions) == 10
+    assert bank.age_seconds < 60
+    assert load_cached_bank(store, "Easy", json_path=None) is None
+
+
+def test_falls_back_to_legacy_json(store, tmp_path):
+    path = tmp_path / "trivia_questions.json"
+    path.write_text(json.dumps({"questions": make_questions(5) + make_questions(3, "Hard", "H")}),
+                    encoding="utf-8")
+    easy = load_cached_bank(store, "Easy", json_path=str(path))
+    assert easy.source == "json"
+    assert len(easy.questions) == 5
+    assert len(load_cached_bank(store, "Hard", json_path=str(path)).questions) == 8
+
+
+def bank_aged(hours):
+    return CachedBank(make_questions(3), hours * 3600, "store")
+
+
+@pytest.mark.parametrize("bank, generate_ok, expected", [
+    (None, True, GENERATE),
+    (CachedBank([], 0, "store"), True, GENERATE),
+    (bank_aged(1), True, PLAY),
+    (bank_aged(20), True, PLAY_AND_REFRESH),
+    (bank_aged(20), False, PLAY),
+    (bank_aged(1000), True, GENERATE),
+    (bank_aged(1000), False, PLAY),  # offline: old questions beat no game
+])
+def test_plan(bank, generate_ok, expected):
+    plan = plan_startup(bank, mode="swr", fresh_for_hours=12, max_stale_hours=336, generate_ok=generate_ok)
+    assert plan == expected
+
+
+def test_fresh_mode_always_generates():
+    assert plan_startup(bank_aged(0), mode="fresh", generate_ok=True) == GENERATE
+
+
+def test_refresher_is_single_flight_and_fills_store(store):
+    release = threading.Event()
+    calls = []
+
+    def fake_generate(difficulty, target):
+        calls.append(difficulty)
+        release.wait(5)
+        target.add_questions(make_questions(4, difficulty, "New"))
+
+    refresher = BackgroundRefresher(store, fake_generate)
+    assert refresher.refresh("Hard")
+    assert not refresher.refresh("Hard")  # already running
+    assert refresher.is_running("Hard")
+    release.set()
+    refresher.join(5)
+
+    assert calls == ["Hard"]
+    assert store.count("Hard") == 4
+    assert not refresher.is_running("Hard")
+
+
+def test_refresher_survives_errors(store):
+    def broken(difficulty, target):
+        raise RuntimeError("no network")
+
+    refresher = BackgroundRefresher(store, broken)
+    refresher.refresh("Easy")
+    refresher.join(5)
+    assert refresher.last_error["Easy"] == "no network"
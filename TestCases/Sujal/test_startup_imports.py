@@ -0,0 +1,27 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+PROBE = """
+import json, sys
+import main
+print(json.dumps(sorted(m for m in ("openai", "requests", "bs4", "generate_trivia", "parseOUDaily")
+                        if m in sys.modules)))
+"""
+
+
+def run_probe(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return out.stdout
+
+
+def test_start_screen_does_not_import_generation_stack():
+    # The game window must not wait on openai/requests/bs4 (they may not even be installed)
+    assert json.loads(run_probe(PROBE).strip().splitlines()[-1]) == []
+
+
+def test_importing_urls_prints_nothing():
+    assert run_probe("import urls") == ""
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from streak_store import StreakStore
+from streaks import StreakManager
+
+
+def rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return dict((p, (s, b)) for p, s, b in conn.execute("SELECT player, streak, best FROM streaks"))
+
+
+def test_updates_are_batched_and_survive_restart(tmp_path):
+    db = str(tmp_path / "streaks.db")
+    store = StreakStore(db, flush_interval=60)   # flusher won't fire on its own during the test
+    manager = StreakManager("sujal", store)
+    for _ in range(10):
+        manager.correct()
+    StreakManager("jole", store).correct()
+
+    assert store.pending() == 2
+    assert store.flush() == 2              # ten answers, one row for sujal
+    assert rows(db) == {"sujal": (50, 50), "jole": (5, 5)}
+
+    manager.wrong()
+    store.close()                          # shutdown writes what is still dirty
+    assert rows(db)["sujal"] == (0, 50)
+
+    again = StreakManager("sujal", StreakStore(db))
+    assert (again.streak, again.best) == (0, 50)
+
+
+def test_background_flusher_writes_within_the_window(tmp_path):
+    db = str(tmp_path / "streaks.db")
+    store = StreakStore(db, flush_interval=0.05)
+    store.record("abraham", 15, 15)
+    deadline = time.monotonic() + 5
+    while store.flushes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert rows(db) == {"abraham": (15, 15)}
+    assert store.metrics()["pending"] == 0
+    store.close()
+    store.close()
+
+
+def test_memory_only_manager_still_works():
+    manager = StreakManager()
+    assert manager.correct() == 5
+    assert manager.wrong() == 0
@@ -0,0 +1,42 @@
+import os
+import sys
+import tkinter as tk
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from seen_filter import SeenFilterStore
+from streak_store import StreakStore
+from streaks import QuizScreen
+
+
+@pytest.fixture
+def root():
+    try:
+        window = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    yield window
+    window.destroy()
+
+
+def make_question(i, answers=4):
+    return {"question": f"Q{i}", "answers": [f"A{j}" for j in range(answers)], "correct_index": 0, "hint": "h"}
+
+
+def test_widgets_are_reused_between_questions(root):
+    feed = iter([make_question(0), make_question(1, answers=3), make_question(2, answers=6), make_question(3)])
+    screen = QuizScreen(root, None, "tester", None, next_question=lambda: next(feed, None),
+                        seen_store=SeenFilterStore(":memory:"), streak_store=StreakStore(":memory:"))
+    first_button = screen.answer_buttons[0]
+
+    screen.check_answer(0)
+    assert [b.winfo_manager() for b in screen.answer_buttons] == ["pack"] * 3 + [""]
+    screen.check_answer(0)
+    assert len(screen.answer_buttons) == 6 and all(b.winfo_manager() == "pack" for b in screen.answer_buttons)
+    screen.check_answer(0)
+
+    assert screen.answer_buttons[0] is first_button
+    assert screen.answer_buttons[0].cget("text") == "A0"
+    assert screen.question_label.cget("text") == "Q3"
+    assert screen.streak_mgr.streak == 15
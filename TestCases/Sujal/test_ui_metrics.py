@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from ui_metrics import NULL_MONITOR, UIMonitor, monitor_from_setting
+
+
+class FakeTk:
+    def __init__(self, root):
+        self.root = root
+
+    def call(self, *args):
+        assert args == ("after", "info")
+        return tuple(f"after#{i}" for i in self.root.pending)
+
+    def splitlist(self, value):
+        return value
+
+
+class FakeWidget:
+    def __init__(self, cls):
+        self.cls = cls
+
+    def winfo_class(self):
+        return self.cls
+
+
+class FakeRoot:
+    """after()/after_cancel() on a fake clock; each callback fires `lag` seconds late."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.pending = {}
+        self.next_id = 0
+        self.lag = 0.0
+        self.children = []
+        self.tk = FakeTk(self)
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, fn):
+        self.next_id += 1
+        self.pending[self.next_id] = (self.now + ms / 1000, fn)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def winfo_children(self):
+        return self.children
+
+    def fire_next(self):
+        after_id = min(self.pending, key=lambda i: self.pending[i][0])
+        when, fn = self.pending.pop(after_id)
+        self.now = when + self.lag
+        fn()
+
+
+def test_heartbeat_lag_and_counts(tmp_path):
+    root = FakeRoot()
+    lines = []
+    trace = tmp_path / "ui.jsonl"
+    monitor = UIMonitor(root, interval_ms=100, summary_every_s=1.0, trace_path=str(trace),
+                        clock=root.clock, printer=lines.append).start()
+
+    root.children = [FakeWidget("Frame"), FakeWidget("Toplevel"), FakeWidget("Toplevel")]
+    root.after(5000, lambda: None)   # some other scheduled callback
+    root.lag = 0.02
+    for _ in range(12):
+        root.fire_next()
+
+    report = monitor.summaries[0]
+    assert report["lag_p95_ms"] == 20.0
+    assert report["toplevels_max"] == 2
+    assert report["after_max"] == 1      # the other callback (the running heartbeat is not pending)
+    assert lines and lines[0].startswith("[UI] lag p50 20.0")
+
+    with monitor.span("load_question"):
+        root.now += 0.004
+    monitor.stop()
+    assert monitor.summaries[-1]["spans"]["load_question"]["mean_ms"] == 4.0
+    assert not any(fn == monitor._beat for _, fn in root.pending.values())
+
+    events = [json.loads(line) for line in trace.read_text(encoding="utf-8").splitlines()]
+    assert {e["type"] for e in events} == {"beat", "span", "summary"}
+
+
+def test_off_by_default():
+    assert monitor_from_setting(FakeRoot(), "") is NULL_MONITOR
+    with NULL_MONITOR.span("anything"):
+        pass
+    NULL_MONITOR.record("timer", ticks=3)
+    NULL_MONITOR.stop()
+
+
+def test_record_prints_and_traces(tmp_path):
+    root = FakeRoot()
+    lines = []
+    trace = tmp_path / "ui.jsonl"
+    monitor = UIMonitor(root, trace_path=str(trace), clock=root.clock, printer=lines.append)
+    monitor.record("timer", ticks=9, late_max_ms=12.5)
+    monitor.stop()
+
+    assert lines == ["[UI] timer: ticks 9, late_max_ms 12.5"]
+    event = json.loads(trace.read_text(encoding="utf-8"))
+    assert event["type"] == "timer" and event["late_max_ms"] == 12.5
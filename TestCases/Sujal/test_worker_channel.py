@@ -0,0 +1,58 @@
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worker_channel import ProgressTracker, WorkerChannel
+
+
+def test_messages_arrive_in_order_on_the_draining_thread():
+    received = []
+    woken = threading.Event()
+    channel = WorkerChannel(lambda kind, payload: received.append((kind, payload, threading.get_ident())),
+                            wakeup=woken.set)
+
+    def worker():
+        for done in range(1, 4):
+            channel.post("progress", (done, 3))
+        channel.post("done", ["q1", "q2"])
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert woken.is_set()
+    assert channel.drain() == 4
+    assert [r[:2] for r in received] == [
+        ("progress", (1, 3)), ("progress", (2, 3)), ("progress", (3, 3)), ("done", ["q1", "q2"]),
+    ]
+    assert {r[2] for r in received} == {threading.get_ident()}
+    assert channel.drain() == 0
+
+
+def test_closed_channel_and_failed_wakeup():
+    received = []
+
+    def dead_window():
+        raise RuntimeError("main thread is not in main loop")
+
+    channel = WorkerChannel(lambda k, p: received.append(k), wakeup=dead_window)
+    channel.post("progress", (1, 2))   # wakeup error is swallowed
+    channel.close()
+    channel.post("done", [])
+    channel.drain()
+    assert received == ["progress"]
+
+
+def test_progress_tracker_eta_ignores_resumed_articles():
+    now = [100.0]
+    tracker = ProgressTracker(clock=lambda: now[0])
+    tracker.update(20, 34)          # resumed run: 20 done before we started
+    assert tracker.eta_seconds() is None
+    assert tracker.describe() == "20/34 articles"
+
+    now[0] += 10
+    tracker.update(22, 34)          # 2 articles in 10 s → 5 s each, 12 left
+    assert tracker.eta_seconds() == 60
+    assert tracker.describe() == "22/34 articles · about 1m00s left"
+    assert abs(tracker.fraction - 22 / 34) < 1e-9
@@ -0,0 +1,231 @@
+"""
+Offline batch generation: build a big question bank ahead of time.
+
+The app generates questions one article at a time while a player waits. This
+CLI does the same work in bulk (e.g. as a nightly job) so players only ever
+read from the bank:
+
+    python batch_generate.py                                 -> every URL in urls.py, all difficulties
+    python batch_generate.py --urls nightly_urls.txt --difficulties Easy Hard
+    python batch_generate.py --target 200 --workers 8        -> stop at 200 questions per difficulty
+
+How it works:
+    - The work is sharded by article. A shard is one URL plus the difficulties
+      it still needs, so each article is downloaded at most once per job even
+      when it feeds Easy, Medium and Hard questions.
+    - Shards run in a process pool (--workers). Workers only scrape and call
+      OpenAI; the parent process does every database write, so SQLite has a
+      single writer.
+    - The question store is the checkpoint. Finished questions are saved as
+      each shard completes, and a (URL, difficulty) pair that already has a
+      question in the store is skipped. Re-running the same command after a
+      crash or Ctrl+C only does the remaining work. Saved article text is
+      reused instead of being downloaded again.
+    - --target caps questions per difficulty (counting what the store already
+      has), so a nightly run only tops the bank up.
+    - A progress line after each shard shows throughput and an ETA.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from question_store import DEFAULT_DB_PATH, QuestionStore
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+DEFAULT_WORKERS = 4
+
+
+def load_urls(path=None):
+    """URLs from a text file (one per line, # comments allowed), or urls.py by default."""
+    if path is None:
+        from urls import urls
+
+        return list(urls)
+
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def plan_shards(urls, difficulties, store, target=None):
+    """
+    [(url, [difficulties...])] still to do. Pairs already in the store are
+    skipped, and with a `target` no difficulty is planned past it.
+    """
+    done = {d: store.sources(d) for d in difficulties}
+    room = {
+        d: None if target is None else max(target - store.count(d), 0)
+        for d in difficulties
+    }
+
+    shards = []
+    seen = set()
+    for url in urls:
+        if url in seen:
+            continue
+        seen.add(url)
+
+        needed = []
+        for d in difficulties:
+            if url in done[d] or room[d] == 0:
+                continue
+            needed.append(d)
+            if room[d] is not None:
+                room[d] -= 1
+        if needed:
+            shards.append((url, needed))
+    return shards
+
+
+def generate_shard(url, difficulties, article=None):
+    """
+    Worker: scrape one article (unless `article` = (title, content) is given)
+    and make one question per difficulty. Runs in a child process, so it only
+    returns plain data and never touches the store.
+    """
+    # Imported here so the parent process doesn't need openai/requests/bs4
+    from generate_trivia import make_trivia_from_article
+    from jsonBuilder import JSONBuilder
+    from parseOUDaily import ArticleScraper
+
+    result = {"url": url, "title": None, "content": None, "scraped": False,
+              "questions": [], "errors": {}}
+
+    if article is not None:
+        title, content = article
+    else:
+        try:
+            title, content = ArticleScraper().scrape(url)
+        except Exception as e:
+            result["errors"] = {d: f"scrape failed: {e}" for d in difficulties}
+            return result
+        result["scraped"] = True
+
+    result["title"], result["content"] = title, content
+    if not content or content == "No content found":
+        result["errors"] = {d: "no content" for d in difficulties}
+        return result
+
+    builder = JSONBuilder()
+    for difficulty in difficulties:
+        try:
+            raw = make_trivia_from_article(title, content, difficulty)
+            question, answers, correct_index, hint = builder.parse_openai_output(raw)
+            builder.add_question(
+                question=question,
+                answers=answers,
+                correct_index=correct_index,
+                hint=hint,
+                source_title=title,
+                difficulty=difficulty,
+                source_url=url,
+            )
+            result["questions"].append(builder.questions[-1].to_dict())
+        except Exception as e:
+            result["errors"][difficulty] = str(e)
+
+    return result
+
+
+def _format_seconds(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def progress_line(shards_done, shards_total, questions, failures, elapsed):
+    """One status line: shards done, questions saved, questions/min and ETA."""
+    rate = questions / elapsed * 60 if elapsed > 0 else 0.0
+    if shards_done:
+        eta = _format_seconds(elapsed / shards_done * (shards_total - shards_done))
+    else:
+        eta = "?"
+    return (f"[Batch] {shards_done}/{shards_total} articles | {questions} questions "
+            f"| {failures} failed | {rate:.1f} q/min | ETA {eta}")
+
+
+def run_batch(urls, difficulties, store, target=None, workers=DEFAULT_WORKERS,
+              worker=generate_shard, executor_cls=ProcessPoolExecutor):
+    """
+    Generate questions for every (url, difficulty) pair the store is missing.
+    Returns a summary dict. Safe to stop and re-run at any point.
+    """
+    shards = plan_shards(urls, difficulties, store, target)
+    pairs = sum(len(needed) for _, needed in shards)
+    print(f"[Batch] {len(shards)} articles / {pairs} questions to generate "
+          f"with {workers} workers → {store.db_path}")
+
+    summary = {"shards": len(shards), "questions": 0, "failed": 0, "elapsed": 0.0}
+    if not shards:
+        return summary
+
+    started = time.perf_counter()
+    pending = iter(shards)
+    in_flight = set()
+
+    with executor_cls(max_workers=workers) as pool:
+        def submit_next():
+            shard = next(pending, None)
+            if shard is None:
+                return
+            url, needed = shard
+            in_flight.add(pool.submit(worker, url, needed, store.article(url)))
+
+        # A couple of shards queued per worker keeps them busy without
+        # scheduling the whole job up front (Ctrl+C stops quickly)
+        for _ in range(workers * 2):
+            submit_next()
+
+        shards_done = 0
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                in_flight.discard(future)
+                shards_done += 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[Batch] Worker crashed: {e}")
+                    summary["failed"] += 1
+                    submit_next()
+                    continue
+
+                # Checkpoint: everything from this shard is in the store now
+                if result["scraped"] and result["content"]:
+                    store.add_article(result["url"], result["title"], result["content"])
+                if result["questions"]:
+                    summary["questions"] += store.add_questions(result["questions"])
+                for difficulty, error in result["errors"].items():
+                    print(f"[Batch] {difficulty} failed for {result['url']}: {error}")
+                summary["failed"] += len(result["errors"])
+
+                print(progress_line(shards_done, len(shards), summary["questions"],
+                                    summary["failed"], time.perf_counter() - started))
+                submit_next()
+
+    summary["elapsed"] = time.perf_counter() - started
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pre-generate OU trivia questions in bulk.")
+    parser.add_argument("--urls", default=None, help="text file with one article URL per line (default: urls.py)")
+    parser.add_argument("--difficulties", nargs="+", default=list(DIFFICULTIES), choices=DIFFICULTIES)
+    parser.add_argument("--target", type=int, default=None,
+                        help="stop once the store has this many questions per difficulty")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="worker processes")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+
+    store = QuestionStore(args.db)
+    summary = run_batch(load_urls(args.urls), args.difficulties, store, args.target, args.workers)
+    print(f"[Batch] Done: {summary['questions']} new questions, {summary['failed']} failed, "
+          f"in {_format_seconds(summary['elapsed'])}.")
+    for level, n in sorted(store.counts().items()):
+        print(f"{level:>6}: {n}")
+    store.close()
@@ -0,0 +1,422 @@
+"""
+Compact binary question bank, opened with mmap.
+
+trivia_questions.json is easy to read and edit, but loading it means parsing
+the whole document into one dict per question. The binary bank keeps the same
+data in a layout that can be used straight off disk:
+
+    +--------------------+  offset 0
+    | header             |  magic, version, counts, section offsets
+    +--------------------+
+    | record table       |  one fixed-width record per question
+    +--------------------+
+    | string heap        |  UTF-8 text for questions/answers/hints/sources
+    +--------------------+
+    | difficulty indexes |  uint32 record numbers per difficulty
+    +--------------------+
+
+Each record only stores (offset, length) references into the string heap, so
+picking question #123456 is one struct.unpack_from plus decoding its strings.
+Identical strings (the same source title and URL on many questions, repeated
+answer choices like "All of the above") are stored once in the heap.
+
+Usage:
+    python binary_bank.py convert trivia_questions.json trivia_questions.bank
+    python binary_bank.py bench --count 200000
+"""
+import json
+import mmap
+import os
+import random
+import struct
+import tempfile
+import time
+
+from question_record import QuestionRecord
+from question_stream import iter_questions
+
+MAGIC = b"OUTQBANK"
+# 2: records also store source_url
+VERSION = 2
+
+# Answer slots per record. The OpenAI format always gives 4 choices.
+MAX_ANSWERS = 4
+
+# Difficulty codes stored in each record (and used for the index table)
+DIFFICULTIES = ("Easy", "Medium", "Hard", None)
+DIFFICULTY_CODES = {name: code for code, name in enumerate(DIFFICULTIES)}
+
+# magic, version, record_size, record_count, records_offset, heap_offset,
+# then (offset, count) for each difficulty index
+HEADER = struct.Struct("<8sHHIII" + "II" * len(DIFFICULTIES))
+
+# question, hint, source_title, source_url, 4 answers -> (offset, length) pairs,
+# then answer count, correct index, difficulty code, padding
+RECORD = struct.Struct("<" + "II" * (4 + MAX_ANSWERS) + "BBBx")
+
+# Record fields before the answer references
+_ANSWER_REFS = 8
+
+INDEX_ENTRY = struct.Struct("<I")
+
+
+# -------- reading JSON / JSONL banks --------
+
+def load_json_questions(path):
+    """
+    Read questions from either format the project uses:
+      - .json  -> {"questions": [ {...}, {...} ]}  (trivia_questions.json)
+      - .jsonl -> one question dict per line
+    """
+    if path.endswith(".jsonl"):
+        questions = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    questions.append(json.loads(line))
+        return questions
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["questions"] if isinstance(data, dict) else data
+
+
+# -------- writing --------
+
+class _StringHeap:
+    """Collects UTF-8 strings, storing each distinct string once."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.seen = {}
+
+    def add(self, text):
+        text = text or ""
+        ref = self.seen.get(text)
+        if ref is None:
+            data = text.encode("utf-8")
+            ref = (self.size, len(data))
+            self.chunks.append(data)
+            self.size += len(data)
+            self.seen[text] = ref
+        return ref
+
+
+def write_binary_bank(questions, path, default_difficulty=None):
+    """
+    Write `questions` (any iterable of question dicts, read once) to `path`
+    in the binary format. Questions without a "difficulty" key get
+    `default_difficulty`. Returns the number of records written.
+    """
+    heap = _StringHeap()
+    records = []
+    index = {code: [] for code in range(len(DIFFICULTIES))}
+
+    for number, q in enumerate(questions):
+        answers = list(q["answers"])
+        if len(answers) > MAX_ANSWERS:
+            raise ValueError(f"Question {number} has more than {MAX_ANSWERS} answers.")
+
+        difficulty = q.get("difficulty") or default_difficulty
+        if difficulty not in DIFFICULTY_CODES:
+            raise ValueError(f"Question {number} has unknown difficulty {difficulty!r}.")
+        code = DIFFICULTY_CODES[difficulty]
+
+        refs = [heap.add(q["question"]), heap.add(q.get("hint")), heap.add(q.get("source_title")),
+                heap.add(q.get("source_url"))]
+        refs += [heap.add(a) for a in answers]
+        refs += [(0, 0)] * (MAX_ANSWERS - len(answers))
+
+        fields = [n for ref in refs for n in ref]
+        records.append(RECORD.pack(*fields, len(answers), q["correct_index"], code))
+        index[code].append(number)
+
+    records_offset = HEADER.size
+    heap_offset = records_offset + RECORD.size * len(records)
+    index_offset = heap_offset + heap.size
+
+    index_dir = []
+    for code in range(len(DIFFICULTIES)):
+        index_dir += [index_offset, len(index[code])]
+        index_offset += INDEX_ENTRY.size * len(index[code])
+
+    header = HEADER.pack(
+        MAGIC, VERSION, RECORD.size, len(records), records_offset, heap_offset, *index_dir
+    )
+
+    # Same temp file + rename trick as atomic_write_json
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".bank", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(b"".join(records))
+            f.write(b"".join(heap.chunks))
+            for code in range(len(DIFFICULTIES)):
+                f.write(struct.pack(f"<{len(index[code])}I", *index[code]))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return len(records)
+
+
+def convert_to_binary(src_path, dst_path, default_difficulty=None):
+    """
+    Convert a .json or .jsonl question bank into a binary bank. The source is
+    streamed one question at a time, so it is never parsed as a whole.
+    """
+    return write_binary_bank(iter_questions(src_path), dst_path, default_difficulty)
+
+
+# -------- reading --------
+
+class BinaryBank:
+    """
+    Read-only view over a binary bank file.
+
+    Nothing is deserialized up front: opening the bank only maps the file and
+    reads the header. Questions are decoded one at a time when asked for.
+
+        with BinaryBank("trivia_questions.bank") as bank:
+            q = bank.random_question("Hard")
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mm = None
+        self._file = open(path, "rb")
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError(f"{self.path} is not a question bank (too short for a header).")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        fields = HEADER.unpack_from(self._mm, 0)
+        magic, version, record_size = fields[0], fields[1], fields[2]
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{self.path} is not a version {VERSION} question bank.")
+
+        self.record_count = fields[3]
+        self._records_offset = fields[4]
+        self._heap_offset = fields[5]
+
+        self._index = {}
+        for code, name in enumerate(DIFFICULTIES):
+            self._index[name] = (fields[6 + 2 * code], fields[7 + 2 * code])
+
+        # A truncated file would otherwise fail later, on some random read
+        ends = [self._records_offset + self.record_count * RECORD.size, self._heap_offset]
+        ends += [offset + count * INDEX_ENTRY.size for offset, count in self._index.values()]
+        if max(ends) > size:
+            raise ValueError(f"{self.path} is not a question bank (file is truncated).")
+
+    def __len__(self):
+        return self.record_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def _text(self, offset, length):
+        start = self._heap_offset + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def __getitem__(self, number):
+        """Decode record `number` into a QuestionRecord."""
+        if number < 0:
+            number += self.record_count
+        if not 0 <= number < self.record_count:
+            raise IndexError("question index out of range")
+
+        fields = RECORD.unpack_from(self._mm, self._records_offset + number * RECORD.size)
+        refs = fields[:-3]
+        answer_count, correct_index, code = fields[-3:]
+
+        return QuestionRecord(
+            self._text(refs[0], refs[1]),
+            [self._text(refs[_ANSWER_REFS + 2 * i], refs[_ANSWER_REFS + 1 + 2 * i]) for i in range(answer_count)],
+            correct_index,
+            self._text(refs[2], refs[3]),
+            self._text(refs[4], refs[5]) if refs[5] else None,
+            DIFFICULTIES[code],
+            self._text(refs[6], refs[7]) if refs[7] else None,
+        )
+
+    def __iter__(self):
+        for number in range(self.record_count):
+            yield self[number]
+
+    def count(self, difficulty=None):
+        """Number of questions for a difficulty (None = whole bank)."""
+        if difficulty is None:
+            return self.record_count
+        return self._index[difficulty][1]
+
+    def record_number(self, difficulty, position):
+        """Record number of the `position`-th question of this difficulty."""
+        offset, count = self._index[difficulty]
+        if not 0 <= position < count:
+            raise IndexError("position out of range for this difficulty")
+        return INDEX_ENTRY.unpack_from(self._mm, offset + position * INDEX_ENTRY.size)[0]
+
+    def random_question(self, difficulty=None, rng=random):
+        """Pick one question uniformly at random, optionally by difficulty."""
+        total = self.count(difficulty)
+        if total == 0:
+            return None
+        position = rng.randrange(total)
+        if difficulty is None:
+            return self[position]
+        return self[self.record_number(difficulty, position)]
+
+    def sample(self, k, difficulty=None, rng=random):
+        """Up to `k` distinct questions, decoding only the ones picked."""
+        total = self.count(difficulty)
+        positions = rng.sample(range(total), min(k, total))
+        if difficulty is None:
+            return [self[p] for p in positions]
+        return [self[self.record_number(difficulty, p)] for p in positions]
+
+
+# -------- benchmark --------
+
+def _rss_mb():
+    """
+    Resident memory of this process in MB (None where unsupported).
+    Uses the current RSS on Linux, and the peak RSS on other Unix systems.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if peak > 10 ** 9 else peak / 1024
+
+
+def _fake_questions(count):
+    rng = random.Random(42)
+    titles = [f"OU Daily article number {n} about Sooners news" for n in range(500)]
+    for n in range(count):
+        yield {
+            "question": f"Sample question {n}: which detail appears in the article?",
+            "answers": [f"Answer {n}-{i} " + "x" * rng.randint(5, 30) for i in range(4)],
+            "correct_index": rng.randrange(4),
+            "hint": f"Think about detail {n % 97}.",
+            "source_title": titles[n % len(titles)],
+            "difficulty": DIFFICULTIES[n % 3],
+        }
+
+
+def _bench_load(kind, path, samples=1000):
+    """Runs in a child process so each measurement starts from a clean RSS."""
+    base_rss = _rss_mb()
+    start = time.perf_counter()
+    if kind == "json":
+        questions = load_json_questions(path)
+        load_s = time.perf_counter() - start
+        picked = [random.choice(questions) for _ in range(samples)]
+    else:
+        bank = BinaryBank(path)
+        load_s = time.perf_counter() - start
+        picked = [bank.random_question("Hard") for _ in range(samples)]
+    total_s = time.perf_counter() - start
+    rss = _rss_mb()
+    print(json.dumps({
+        "load_ms": load_s * 1000,
+        "load_plus_samples_ms": total_s * 1000,
+        "rss_growth_mb": None if rss is None else rss - base_rss,
+        "picked": len(picked),
+    }))
+
+
+def run_benchmark(count=200_000):
+    import subprocess
+    import sys
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        json_path = os.path.join(folder, "bank.json")
+        bin_path = os.path.join(folder, "bank.bank")
+
+        questions = list(_fake_questions(count))
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"questions": questions}, f, indent=4, ensure_ascii=False)
+        start = time.perf_counter()
+        write_binary_bank(questions, bin_path)
+        convert_s = time.perf_counter() - start
+        del questions
+
+        print(f"Questions:     {count:,}")
+        print(f"JSON size:     {os.path.getsize(json_path) / 1e6:.1f} MB")
+        print(f"Binary size:   {os.path.getsize(bin_path) / 1e6:.1f} MB (written in {convert_s:.2f}s)")
+
+        for kind, path in (("json", json_path), ("binary", bin_path)):
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "_bench-load", kind, path],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(out)
+            rss = result["rss_growth_mb"]
+            rss_text = "n/a" if rss is None else f"{rss:.1f} MB"
+            print(
+                f"{kind:>6}: open {result['load_ms']:.1f} ms, "
+                f"open + 1000 samples {result['load_plus_samples_ms']:.1f} ms, "
+                f"RSS growth {rss_text}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Binary question bank tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    conv = sub.add_parser("convert", help="convert a .json/.jsonl bank to binary")
+    conv.add_argument("src")
+    conv.add_argument("dst")
+    conv.add_argument("--difficulty", choices=["Easy", "Medium", "Hard"], default=None,
+                      help="difficulty for questions that don't have one")
+
+    bench = sub.add_parser("bench", help="compare JSON vs binary load time and RSS")
+    bench.add_argument("--count", type=int, default=200_000)
+
+    child = sub.add_parser("_bench-load")
+    child.add_argument("kind")
+    child.add_argument("path")
+
+    args = parser.parse_args()
+    if args.command == "convert":
+        n = convert_to_binary(args.src, args.dst, args.difficulty)
+        print(f"[BinaryBank] Wrote {n} questions → {args.dst}")
+    elif args.command == "bench":
+        run_benchmark(args.count)
+    else:
+        _bench_load(args.kind, args.path)
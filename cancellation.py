@@ -0,0 +1,128 @@
+"""
+Cooperative cancellation for background generation.
+
+A CancelToken is created per generation run and passed down to everything
+that might block: the scraper, the OpenAI call and the per-article loop.
+
+    token = CancelToken()
+    worker: generate_questions_for_difficulty("Hard", cancel=token)
+    UI:     token.cancel("window closed")
+
+What happens on cancel():
+    - The article loop checks the token before every stage and stops
+      (raising CancelledError); articles not started yet are dropped.
+    - Callbacks registered with on_cancel() run right away. The scraper uses
+      this to close its HTTP response, and generate_trivia.ask_openai closes
+      the call's own HTTP client, so the download or OpenAI request in
+      progress is torn down rather than left to run (and be billed).
+    - Blocking calls wrapped in run_cancellable() return to the worker at once
+      by raising CancelledError. The helper thread running the call ends as
+      soon as its connection is closed; its result is thrown away.
+
+So the worker gives up within a few milliseconds of cancel(), whatever it was
+doing. A call with no on_cancel hook is still bounded by its timeout
+(parseOUDaily.REQUEST_TIMEOUT, generate_trivia.OPENAI_TIMEOUT).
+"""
+import threading
+
+
+class CancelledError(Exception):
+    """Raised inside a worker when its CancelToken has been cancelled."""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self.reason = None
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self, reason="cancelled"):
+        """Cancel (only the first call counts) and run the on_cancel callbacks."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[Cancel] on_cancel callback failed: {e}")
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CancelledError(self.reason)
+
+    def wait(self, timeout=None):
+        """Sleep up to `timeout` seconds, waking early on cancel. True if cancelled."""
+        return self._event.wait(timeout)
+
+    def on_cancel(self, callback):
+        """
+        Call `callback` when the token is cancelled (immediately if it already is).
+        Returns a function that unregisters it.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                registered = True
+            else:
+                registered = False
+
+        if not registered:
+            callback()
+            return lambda: None
+
+        def unregister():
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+        return unregister
+
+
+def run_cancellable(token, fn, *args, **kwargs):
+    """
+    fn(*args, **kwargs), but give up with CancelledError as soon as `token` is
+    cancelled instead of waiting for fn to return. With token=None this is a
+    plain call.
+    """
+    if token is None:
+        return fn(*args, **kwargs)
+
+    token.raise_if_cancelled()
+
+    wake = threading.Event()
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = fn(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            wake.set()
+
+    unregister = token.on_cancel(wake.set)
+    threading.Thread(target=target, name="cancellable-call", daemon=True).start()
+    try:
+        wake.wait()
+    finally:
+        unregister()
+
+    if "value" not in outcome and "error" not in outcome:
+        # Woken by cancel(); the call ends when its on_cancel hook tears it down
+        raise CancelledError(token.reason)
+    if "error" in outcome:
+        if token.cancelled:
+            # The call most likely failed because cancel() closed its connection
+            raise CancelledError(token.reason) from outcome["error"]
+        raise outcome["error"]
+    return outcome["value"]
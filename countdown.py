@@ -0,0 +1,124 @@
+"""
+Drift-free countdown for the quiz timer.
+
+The old timer subtracted one from `remaining_time` on every
+root.after(1000, ...). Each callback that fired late (a GC pause, the streak
+popup, a slow redraw) added its delay to the question, so a "10 second" Hard
+question could run noticeably longer under load.
+
+DeadlineCountdown works from a deadline on the monotonic clock instead:
+
+    - start() sets deadline = now + duration.
+    - Every tick works out remaining = deadline - now. A late tick just shows
+      the correct value; the lateness is never added to the time limit.
+    - The next wakeup is timed for the moment the displayed whole second
+      changes (not a fixed 1000 ms), so a late tick is made up by a shorter
+      wait and the label never lags behind.
+    - stats() reports how late ticks fired (count, mean, max in ms), to see
+      how loaded the event loop is.
+
+It only needs something with Tk's after(ms, fn) / after_cancel(id) methods,
+so tests can drive it with a fake scheduler and clock.
+"""
+import math
+import time
+
+# Wake a few ms after the second boundary, so the tick lands on the new value
+BOUNDARY_SLACK = 0.005
+
+# Never sleep longer than this between ticks
+MAX_INTERVAL = 1.0
+
+
+class DeadlineCountdown:
+    def __init__(self, scheduler, on_update, on_expire, clock=time.monotonic):
+        self.scheduler = scheduler    # tk root (or anything with after/after_cancel)
+        self.on_update = on_update    # on_update(whole_seconds_left)
+        self.on_expire = on_expire    # called once when time runs out
+        self.clock = clock
+
+        self.deadline = None
+        self._after_id = None
+        self._expected_at = None
+        self._shown = None
+
+        self.ticks = 0
+        self.late_total = 0.0
+        self.late_max = 0.0
+
+    # -------- control --------
+
+    def start(self, duration):
+        """(Re)start counting down `duration` seconds from now."""
+        self.stop()
+        self.deadline = self.clock() + duration
+        self._shown = None
+        self._show(self.remaining())
+        self._schedule()
+
+    def stop(self):
+        """Stop without expiring (e.g. the player answered)."""
+        if self._after_id is not None:
+            self.scheduler.after_cancel(self._after_id)
+            self._after_id = None
+        self.deadline = None
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def remaining(self):
+        """Exact seconds left (0 when stopped or expired)."""
+        if self.deadline is None:
+            return 0.0
+        return max(self.deadline - self.clock(), 0.0)
+
+    def seconds_left(self):
+        """Whole seconds as shown on screen (rounded up: 9.2 s left shows 10)."""
+        return math.ceil(self.remaining())
+
+    # -------- ticking --------
+
+    def _schedule(self):
+        remaining = self.deadline - self.clock()
+        # Time until the displayed value drops to the next whole second
+        until_change = remaining - (math.ceil(remaining) - 1)
+        delay = min(max(until_change, 0.0) + BOUNDARY_SLACK, MAX_INTERVAL)
+        self._expected_at = self.clock() + delay
+        self._after_id = self.scheduler.after(int(delay * 1000), self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        if self.deadline is None:
+            return
+
+        now = self.clock()
+        late = max(now - self._expected_at, 0.0)
+        self.ticks += 1
+        self.late_total += late
+        self.late_max = max(self.late_max, late)
+
+        remaining = self.deadline - now
+        if remaining <= 0:
+            self.deadline = None
+            self._show(0)
+            self.on_expire()
+            return
+
+        self._show(remaining)
+        self._schedule()
+
+    def _show(self, remaining):
+        shown = math.ceil(remaining)
+        if shown != self._shown:
+            self._shown = shown
+            self.on_update(shown)
+
+    def stats(self):
+        """How late ticks fired, in milliseconds."""
+        mean = self.late_total / self.ticks if self.ticks else 0.0
+        return {
+            "ticks": self.ticks,
+            "late_mean_ms": round(mean * 1000, 1),
+            "late_max_ms": round(self.late_max * 1000, 1),
+        }
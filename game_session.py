@@ -0,0 +1,269 @@
+"""
+Headless game rules: one quiz session as a small state machine.
+
+The rules used to live inside main.QuizScreen's widget callbacks, so they
+could only be exercised with a display. GameSession holds them with no Tk
+dependency. The Tk QuizScreen, the FastAPI runtime and bots all drive the
+same object:
+
+    session = GameSession(questions, "Hard")
+    question = session.start()              # state: asking
+    result = session.answer(2)              # correct -> answered, wrong -> game_over
+    question = session.next_question()      # asking again, or won when out of questions
+    session.expire()                        # the UI's countdown ran out -> game_over
+
+States:
+    ready      created, start() not called yet
+    asking     a question is up and its clock is running
+    answered   last answer was right; call next_question()
+    game_over  wrong answer or time ran out (see end_reason)
+    won        every question answered correctly
+
+The clock is injectable (any function returning seconds, time.monotonic by
+default). An answer that arrives after the question's deadline counts as a
+timeout even if the UI never called expire(), so a slow client can't beat
+the timer.
+
+    python game_session.py --sessions 50000   -> headless simulator (bots),
+                                                 prints sessions/second
+"""
+import time
+from dataclasses import dataclass
+
+# Time limits per difficulty (in seconds)
+TIME_PER_DIFFICULTY = {
+    "Easy": 30,
+    "Medium": 20,
+    "Hard": 10,
+}
+DEFAULT_TIME_LIMIT = 30
+
+# Streak lengths that get a "N in a row!" celebration
+STREAK_MILESTONES = (5, 10, 15)
+
+READY = "ready"
+ASKING = "asking"
+ANSWERED = "answered"
+GAME_OVER = "game_over"
+WON = "won"
+
+# end_reason values for GAME_OVER
+WRONG_ANSWER = "wrong_answer"
+TIME_UP = "time_up"
+
+
+class GameRuleError(Exception):
+    """An action that isn't allowed in the session's current state."""
+
+
+@dataclass
+class AnswerResult:
+    correct: bool
+    correct_index: int
+    streak: int
+    milestone: bool      # streak just hit one of STREAK_MILESTONES
+    state: str
+    end_reason: str = None
+
+
+class GameSession:
+    def __init__(self, questions, difficulty, clock=time.monotonic, time_limit=None):
+        # Any iterable works as the question source: a list, a generator
+        # pulling from the store, a sampler...
+        self._source = iter(questions)
+        self.difficulty = difficulty
+        self.clock = clock
+        self.time_limit = time_limit or TIME_PER_DIFFICULTY.get(difficulty, DEFAULT_TIME_LIMIT)
+
+        self.state = READY
+        self.end_reason = None
+        self.question = None
+        self.answered = 0          # questions answered correctly
+        self.streak = 0
+        self.deadline = None
+        self.started_at = None
+        self.ended_at = None
+
+    # -------- transitions --------
+
+    def start(self):
+        """Show the first question. Returns it (None if there are no questions: won)."""
+        self._require(READY)
+        self.started_at = self.clock()
+        return self._advance()
+
+    def answer(self, choice):
+        """Answer the current question with answer index `choice`."""
+        # An answer after the deadline is a timeout, whatever the UI thought
+        if self.check_timeout():
+            raise GameRuleError("Time is up for this question.")
+        self._require(ASKING)
+
+        correct_index = self.question["correct_index"]
+        if choice == correct_index:
+            self.answered += 1
+            self.streak += 1
+            self.state = ANSWERED
+            self.deadline = None
+            return AnswerResult(True, correct_index, self.streak,
+                                self.streak in STREAK_MILESTONES, self.state)
+
+        self._end(WRONG_ANSWER)
+        return AnswerResult(False, correct_index, self.streak, False, self.state, self.end_reason)
+
+    def next_question(self):
+        """After a correct answer: the next question, or None (won) if there are no more."""
+        self._require(ANSWERED)
+        return self._advance()
+
+    def expire(self):
+        """The question's time ran out (e.g. the UI countdown hit zero)."""
+        if self.state == ASKING:
+            self._end(TIME_UP)
+
+    def check_timeout(self):
+        """End the game if the current question's deadline has passed. True if it has."""
+        if self.state == ASKING and self.clock() >= self.deadline:
+            self._end(TIME_UP)
+        return self.state == GAME_OVER and self.end_reason == TIME_UP
+
+    # -------- queries --------
+
+    @property
+    def finished(self):
+        return self.state in (GAME_OVER, WON)
+
+    def time_left(self):
+        if self.state != ASKING:
+            return 0.0
+        return max(self.deadline - self.clock(), 0.0)
+
+    def to_dict(self):
+        """Public view of the session (never includes the correct answer)."""
+        self.check_timeout()
+        view = {
+            "state": self.state,
+            "difficulty": self.difficulty,
+            "answered": self.answered,
+            "streak": self.streak,
+            "time_left": round(self.time_left(), 2),
+            "end_reason": self.end_reason,
+            "question": None,
+        }
+        if self.state == ASKING:
+            view["question"] = {
+                "question": self.question["question"],
+                "answers": list(self.question["answers"]),
+                "hint": self.question.get("hint", ""),
+            }
+        return view
+
+    # -------- internals --------
+
+    def _require(self, state):
+        if self.state != state:
+            raise GameRuleError(f"Not allowed while the session is '{self.state}'.")
+
+    def _advance(self):
+        self.question = next(self._source, None)
+        if self.question is None:
+            self.state = WON
+            self.deadline = None
+            self.ended_at = self.clock()
+            return None
+        self.state = ASKING
+        self.deadline = self.clock() + self.time_limit
+        return self.question
+
+    def _end(self, reason):
+        self.state = GAME_OVER
+        self.end_reason = reason
+        self.deadline = None
+        self.ended_at = self.clock()
+
+
+# ============================================================
+#                   HEADLESS SIMULATOR
+# ============================================================
+
+class ManualClock:
+    """A clock that only moves when told to (for tests and the simulator)."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def play_bot(session, clock, rng, accuracy, mean_think):
+    """
+    Play one session to the end: the bot thinks for a random time, then
+    answers right with probability `accuracy`.
+    """
+    question = session.start()
+    while question is not None:
+        clock.advance(rng.expovariate(1.0 / mean_think))
+        if session.check_timeout():
+            return session
+        n = len(question["answers"])
+        right = question["correct_index"]
+        choice = right if rng.random() < accuracy else (right + 1 + rng.randrange(n - 1)) % n
+        if not session.answer(choice).correct:
+            return session
+        question = session.next_question()
+    return session
+
+
+def simulate(questions, sessions, difficulty="Hard", accuracy=0.9, mean_think=4.0,
+             questions_per_session=30, seed=0):
+    """
+    Run `sessions` bot games over `questions` and return outcome counts,
+    the average streak and the throughput.
+    """
+    import random
+
+    rng = random.Random(seed)
+    clock = ManualClock()
+    outcomes = {WON: 0, WRONG_ANSWER: 0, TIME_UP: 0}
+    streak_total = 0
+
+    started = time.perf_counter()
+    for _ in range(sessions):
+        picked = rng.sample(questions, min(questions_per_session, len(questions)))
+        session = play_bot(GameSession(picked, difficulty, clock), clock, rng, accuracy, mean_think)
+        outcomes[session.end_reason or session.state] += 1
+        streak_total += session.streak
+    elapsed = time.perf_counter() - started
+
+    return {
+        "sessions": sessions,
+        "outcomes": outcomes,
+        "mean_streak": round(streak_total / sessions, 2) if sessions else 0.0,
+        "elapsed": elapsed,
+        "sessions_per_second": sessions / elapsed if elapsed else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate bot quiz sessions without a UI.")
+    parser.add_argument("--sessions", type=int, default=50_000)
+    parser.add_argument("--difficulty", default="Hard", choices=list(TIME_PER_DIFFICULTY))
+    parser.add_argument("--accuracy", type=float, default=0.9, help="chance a bot answers right")
+    parser.add_argument("--think", type=float, default=4.0, help="mean seconds a bot takes to answer")
+    parser.add_argument("--questions", type=int, default=10, help="questions per session")
+    args = parser.parse_args()
+
+    bank = [
+        {"question": f"Q{i}?", "answers": ["A", "B", "C", "D"], "correct_index": i % 4, "hint": ""}
+        for i in range(500)
+    ]
+    report = simulate(bank, args.sessions, args.difficulty, args.accuracy, args.think, args.questions)
+    print(f"{report['sessions']} sessions in {report['elapsed']:.2f}s "
+          f"({report['sessions_per_second']:,.0f} sessions/s)")
+    print("Outcomes:", report["outcomes"], "| mean streak:", report["mean_streak"])
@@ -1,26 +1,67 @@
 import re  # (Currently unused; you can remove this if not needed)
-from openai import OpenAI
 
-from parseOUDaily import ArticleScraper, URLS  # Your scraper + list of OU Daily URLs
+from urls import urls as URLS                  # List of OU Daily URLs
 from jsonBuilder import JSONBuilder            # Helper to parse/save trivia into JSON
+from run_checkpoint import RunCheckpoint       # Crash-safe progress file per run
+from question_record import QuestionRecord     # Compact, dict-compatible question type
+from cancellation import CancelledError, run_cancellable  # Stop a run partway
+from question_sampler import QuestionSampler  # No-repeat random order over a bank
 
-# Uses OPENAI_API_KEY from your environment
-client = OpenAI()
+# Seconds before an OpenAI call gives up (bounds work left running after a cancel)
+OPENAI_TIMEOUT = 60
 
+# Uses OPENAI_API_KEY from your environment.
+# Created on first use, so importing this module works without an API key
+# (the app can still play questions from the saved bank). openai, requests
+# and bs4 are also only imported once a run starts, which keeps app startup fast.
+client = None
 
-def ask_openai(prompt: str) -> str:
+
+def get_client():
+    global client
+    if client is None:
+        from openai import OpenAI
+
+        client = OpenAI()
+    return client
+
+
+def _new_http_client():
+    """A private HTTP connection pool for one OpenAI call (httpx comes with openai)."""
+    import httpx
+
+    return httpx.Client(timeout=OPENAI_TIMEOUT)
+
+
+def ask_openai(prompt: str, cancel=None) -> str:
     """
     Send a prompt to OpenAI and return the text output.
+
+    With a CancelToken the call runs on its own HTTP client, and cancelling
+    closes that client: the request's connection is torn down, so nothing
+    keeps running (or being billed) until the timeout.
     """
-    response = client.responses.create(
-        model="gpt-4.1-mini",  # Model to use
-        input=prompt,          # Prompt text
-    )
+    client = get_client()
+    http_client = unregister = None
+    if cancel is not None:
+        http_client = _new_http_client()
+        client = client.with_options(http_client=http_client)
+        unregister = cancel.on_cancel(http_client.close)
+    try:
+        response = client.responses.create(
+            model="gpt-4.1-mini",  # Model to use
+            input=prompt,          # Prompt text
+            timeout=OPENAI_TIMEOUT,
+        )
+    finally:
+        if http_client is not None:
+            unregister()
+            http_client.close()
     # response.output_text is a convenience for "just give me the text"
     return response.output_text
 
 
-def make_trivia_from_article(title: str, content: str, difficulty: str) -> str:
+def make_trivia_from_article(title: str, content: str, difficulty: str, cancel=None) -> str:
     """
     Turn a single OU Daily article into ONE trivia question string
     using the given difficulty setting.
@@ -67,10 +108,39 @@ Article text (you can skim and extract key facts; don't copy this whole thing in
 \"\"\" 
 """
     # Send the prompt to OpenAI and return the raw 4-line string
-    return ask_openai(prompt)
+    return ask_openai(prompt, cancel)
+
+
+def _with_progress(urls, checkpoint, progress):
+    """
+    Yield each URL; once the loop body for it has finished (however it ended),
+    report progress(done, total, url). Articles finished by an earlier attempt
+    are counted up front instead of reported one by one.
+    """
+    total = len(urls)
+    done = len(checkpoint.urls_done())
+    if progress is not None:
+        progress(done, total, None)
+
+    for url in urls:
+        already_done = checkpoint.is_done(url)
+        yield url
+        if not already_done:
+            done += 1
+            if progress is not None:
+                progress(done, total, url)
 
 
-def generate_questions_for_difficulty(difficulty: str, json_path: str = "trivia_questions.json"):
+def generate_questions_for_difficulty(
+    difficulty: str,
+    json_path: str = "trivia_questions.json",
+    run_id: str = None,
+    resume: bool = False,
+    store=None,
+    progress=None,
+    cancel=None,
+    background=False,
+):
     """
     Generate trivia questions for a given difficulty level.
 
@@ -80,38 +150,111 @@ def generate_questions_for_difficulty(difficulty: str, json_path: str = "trivia_
     - Ask OpenAI for ONE question per article.
     - Parse the model output into a question dict.
     - Save all questions into a JSON file (overwrite each time).
-    - Return the list of question dicts.
+    - Return the list of questions (QuestionRecord, readable like dicts).
+
+    Every run has a run ID and checkpoints its progress in .trivia_runs/
+    after each stage (scraped -> generated -> parsed). Pass `run_id` to
+    continue that run, or `resume=True` to continue the newest unfinished
+    run for this difficulty. Articles that are already done are skipped,
+    and half-finished ones restart from their last completed stage.
+
+    `json_path=None` skips writing the JSON file (the questions still go to
+    `store`). `background=True` marks the run's checkpoint as a background
+    run, which resume=True never picks up; BackgroundRefresher uses both so
+    its run can't collide with one the player started.
+
+    If a QuestionStore is passed as `store`, the questions are also added to
+    that SQLite bank, next to the ones from other difficulties, and the
+    scraped article text is saved there for full-text search.
 
-    Each dict looks like:
+    `progress(done, total, url)` is called once at the start and after each
+    article (done counts articles finished in this run or an earlier attempt).
+    It runs on the generating thread, so a UI should hand it off (see
+    worker_channel.WorkerChannel) rather than touch widgets directly.
+
+    `cancel` is an optional cancellation.CancelToken. Once it is cancelled the
+    run stops before its next step (an in-flight download or OpenAI call is
+    abandoned) and CancelledError is raised. The checkpoint stays unfinished,
+    so a later resume=True run continues from there.
+
+    Each question reads like this dict (record.to_dict() gives exactly this):
         {
             "question": str,
             "answers": [str, str, str, str],
             "correct_index": int,
             "hint": str,
-            "source_title": str
+            "source_title": str,
+            "difficulty": str,
+            "source_url": str
         }
     """
+    from parseOUDaily import ArticleScraper  # Your scraper (imports requests + bs4)
+
     scraper = ArticleScraper()  # Handles downloading/parsing OU Daily articles
     builder = JSONBuilder()     # Collects questions and writes JSON
 
-    for url in URLS:
-        print(f"\n--- Scraping ---\n{url}")
-        try:
-            # Get article title and body text from the URL
-            title_text, content_text = scraper.scrape(url)
-        except Exception as e:
-            # If scraping fails, log and move on to the next URL
-            print(f"[ERROR] Failed to scrape URL: {url}\n{e}")
-            continue
+    checkpoint = None
+    if run_id is None and resume:
+        checkpoint = RunCheckpoint.latest_incomplete(difficulty)
+    if checkpoint is None:
+        checkpoint = RunCheckpoint(run_id, difficulty, background=background)
+
+    done_before = len(checkpoint.urls_done())
+    if done_before:
+        print(f"[Run {checkpoint.run_id}] Resuming: {done_before}/{len(URLS)} articles already done.")
+    else:
+        print(f"[Run {checkpoint.run_id}] Starting {difficulty} run over {len(URLS)} articles.")
+
+    for url in _with_progress(URLS, checkpoint, progress):
+        if cancel is not None:
+            # Drop the remaining articles as soon as the run is cancelled
+            cancel.raise_if_cancelled()
 
-        # Skip articles with no usable content
-        if not content_text or content_text == "No content found":
-            print("(No content found, skipping this article.)")
+        if checkpoint.is_done(url):
             continue
 
+        saved = checkpoint.article(url)
+        stage = saved.get("stage")
+
+        if stage in ("scraped", "generated") or (stage == "failed" and saved.get("content")):
+            # Already downloaded on a previous attempt
+            title_text, content_text = saved["title"], saved["content"]
+        else:
+            print(f"\n--- Scraping ---\n{url}")
+            try:
+                # Get article title and body text from the URL
+                title_text, content_text = run_cancellable(cancel, scraper.scrape, url, cancel)
+            except CancelledError:
+                print(f"[Run {checkpoint.run_id}] Cancelled while scraping {url}")
+                raise
+            except Exception as e:
+                # If scraping fails, log and move on to the next URL
+                print(f"[ERROR] Failed to scrape URL: {url}\n{e}")
+                checkpoint.record(url, "failed", error=str(e))
+                continue
+
+            # Skip articles with no usable content
+            if not content_text or content_text == "No content found":
+                print("(No content found, skipping this article.)")
+                checkpoint.record(url, "skipped", title=title_text)
+                continue
+
+            checkpoint.record(url, "scraped", title=title_text, content=content_text)
+
+        if store is not None:
+            # Keep the article text so the bank can be searched by it later
+            # (also when it was scraped on an earlier attempt; this is an upsert)
+            store.add_article(url, title_text, content_text)
+
         try:
-            # Ask OpenAI to turn this article into a trivia question
-            raw = make_trivia_from_article(title_text, content_text, difficulty)
+            if stage == "generated":
+                # Reuse the model output we already paid for
+                raw = saved["raw"]
+            else:
+                # Ask OpenAI to turn this article into a trivia question
+                raw = run_cancellable(cancel, make_trivia_from_article, title_text, content_text, difficulty,
+                                      cancel)
+                checkpoint.record(url, "generated", raw=raw)
 
             # Parse the 4-line output string into structured pieces
             question, answers, correct_index, hint = builder.parse_openai_output(raw)
@@ -123,7 +266,14 @@ def generate_questions_for_difficulty(difficulty: str, json_path: str = "trivia_
                 correct_index=correct_index,
                 hint=hint,
                 source_title=title_text,
+                difficulty=difficulty,
+                source_url=url,
             )
+            checkpoint.record(url, "parsed", question=builder.questions[-1].to_dict())
+
+            if store is not None:
+                # Available to new sessions right away, even if the run dies later
+                store.add_questions(builder.questions[-1:], difficulty)
 
             # Optional debug print to see what was generated
             print("Q:", question)
@@ -131,21 +281,75 @@ def generate_questions_for_difficulty(difficulty: str, json_path: str = "trivia_
             print("Correct index:", correct_index)
             print("Hint:", hint)
 
+        except CancelledError:
+            print(f"[Run {checkpoint.run_id}] Cancelled while generating for {url}")
+            raise
         except Exception as e:
-            # If something goes wrong parsing or building, log it and continue
+            # If something goes wrong parsing or building, log it and continue.
+            # Drop the stored output so a resumed run asks OpenAI again.
             print("[ERROR] Could not build question for this article:", e)
+            checkpoint.record(url, "failed", raw=None, error=str(e))
             continue
 
+    # Rebuild the bank from the checkpoint so questions finished before a
+    # crash are included, in the original URL order.
+    builder.questions = [QuestionRecord.from_dict(q) for q in checkpoint.questions(URLS)]
+
     # Write all collected questions into the JSON file (overwrites existing file)
-    builder.save_all(json_path)
+    if json_path is not None:
+        builder.save_all(json_path)
+
+    if store is not None:
+        # Catch-up for questions finished by an earlier attempt (duplicates are skipped)
+        store.add_questions(builder.questions, difficulty)
+        print(f"[QuestionStore] {store.count(difficulty)} {difficulty} questions in {store.db_path}")
+
+    checkpoint.mark_complete()
 
     # Also return the list of questions for whoever called this function (e.g., GUI)
     return builder.questions
 
 
+def get_random_question(difficulty=None, bank=None, seen=None):
+    """
+    One random question from a bank (the SQLite store by default), or None if
+    it has none. With a player's SeenFilter, questions they answered in
+    earlier sessions are avoided. Each call is independent: to deal a whole
+    session without repeats, keep a question_sampler.QuestionDealer.
+    """
+    if bank is not None:
+        return QuestionSampler(bank, difficulty, seen=seen).draw()
+
+    from question_store import QuestionStore
+
+    with QuestionStore() as store:
+        return QuestionSampler(store, difficulty, seen=seen).draw()
+
+
 if __name__ == "__main__":
     # If you run this file directly:
     #   python generate_trivia.py
     # it will generate Easy questions and save them to trivia_questions.json
-    generated = generate_questions_for_difficulty("Easy")
-    print(f"Generated {len(generated)} questions for Easy mode.")
+    #
+    # Optional arguments:
+    #   python generate_trivia.py Hard              -> pick another difficulty
+    #   python generate_trivia.py --resume          -> continue the last unfinished run
+    #   python generate_trivia.py --run-id <RUN_ID> -> continue a specific run
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate OU trivia questions.")
+    parser.add_argument("difficulty", nargs="?", default="Easy", choices=["Easy", "Medium", "Hard"])
+    parser.add_argument("--resume", action="store_true", help="continue the newest unfinished run")
+    parser.add_argument("--run-id", default=None, help="continue the run with this ID")
+    parser.add_argument("--no-store", action="store_true", help="only write trivia_questions.json")
+    args = parser.parse_args()
+
+    from question_store import QuestionStore
+
+    generated = generate_questions_for_difficulty(
+        args.difficulty,
+        run_id=args.run_id,
+        resume=args.resume,
+        store=None if args.no_store else QuestionStore(),
+    )
+    print(f"Generated {len(generated)} questions for {args.difficulty} mode.")
@@ -1,5 +1,34 @@
 import json
 import ast
+import os
+import tempfile
+
+from question_record import QuestionRecord
+from question_validator import DEFAULT_VALIDATOR
+
+
+def atomic_write_json(filename, data, indent=4):
+    """
+    Write `data` as JSON to `filename` without ever exposing a half-written file.
+
+    The JSON goes to a temp file in the same folder first, gets flushed to disk,
+    and is then renamed over the target. os.replace is atomic on both POSIX and
+    Windows, so readers see either the old file or the new one, never a mix.
+    """
+    folder = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        # Don't leave stray temp files behind if anything goes wrong
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 class JSONBuilder:
     def __init__(self):
@@ -56,36 +85,40 @@ class JSONBuilder:
 
         return question, answers, correct_index, hint
 
-    # ADD: Build dict and add to list
-    def add_question(self, question, answers, correct_index, hint, source_title=None):
+    # ADD: Build a QuestionRecord and add to list
+    def add_question(self, question, answers, correct_index, hint, source_title=None, difficulty=None,
+                     source_url=None):
         question = question.strip()
         answers = [a.strip() for a in answers]
         hint = hint.strip()
 
-        if correct_index < 0 or correct_index >= len(answers):
-            raise ValueError("correct_index out of range.")
-
-        q_dict = {
-            "question": question,
-            "answers": answers,
-            "correct_index": correct_index,
-            "hint": hint,
-        }
+        # Compact record instead of a plain dict (reads like a dict: q["question"])
+        record = QuestionRecord(
+            question=question,
+            answers=answers,
+            correct_index=correct_index,
+            hint=hint,
+            source_title=source_title.strip() if source_title else None,
+            difficulty=difficulty,
+            source_url=source_url,
+        )
 
-        if source_title:
-            q_dict["source_title"] = source_title.strip()
+        # Same rules as a full bank check (index range, duplicates, lengths...)
+        errors = DEFAULT_VALIDATOR.errors_for(record)
+        if errors:
+            raise ValueError(errors[0].message)
 
-        self.questions.append(q_dict)
+        self.questions.append(record)
 
     # SAVE ALL: Write *all questions* to one JSON file
     def save_all(self, filename="trivia_questions.json"):
         """
         Overwrites trivia_questions.json each time it's called.
         So every time you pick a difficulty and generate, you get a fresh set.
+        The file is published atomically (temp file + rename).
         """
-        bundle = {"questions": self.questions}
+        bundle = {"questions": [q.to_dict() for q in self.questions]}
 
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(bundle, f, indent=4, ensure_ascii=False)
+        atomic_write_json(filename, bundle)
 
         print(f"[JSONBuilder] Saved {len(self.questions)} questions → {filename}")
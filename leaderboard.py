@@ -0,0 +1,282 @@
+"""
+SQLite leaderboards: all-time, weekly and daily, per difficulty.
+
+Final streaks used to be shown once on the end screen and thrown away. The
+Leaderboard keeps them:
+
+    - session_results: one row per finished game (the raw history).
+    - leaderboard: one row per (period, bucket, difficulty, player) with the
+      player's best streak, games played and total streak. Buckets are ""
+      for all-time, "2026-W42" for a week and "2026-10-19" for a day, in
+      local time so "Today" rolls over at the player's midnight.
+    - score_counts: how many players hold each best streak in a bucket.
+
+record() writes the game and updates the three rollups with upserts in one
+transaction, so nothing ever rescans session_results. Reads are index-only:
+
+    - top_k: walks the covering index (period, bucket, difficulty, best DESC,
+      best_at, player, games) and stops after k rows.
+    - my_rank: one primary-key lookup for the player's best, then a sum over
+      score_counts for the higher scores. That is one row per distinct streak
+      value, not one per player, so it stays fast with a million players.
+      Players with the same best share a rank (1, 2, 2, 4).
+
+    board = Leaderboard()
+    board.record("sujal", "Hard", streak=12, answered=12, outcome="wrong_answer")
+    board.top_k("week", "Hard", 10)
+    board.my_rank("sujal", "week", "Hard")
+
+    python leaderboard.py --players 1000000   -> query timings on a big board
+"""
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+DEFAULT_DB_PATH = "trivia_bank.db"
+
+PERIODS = ("all", "week", "day")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_results (
+    id          INTEGER PRIMARY KEY,
+    player      TEXT NOT NULL,
+    difficulty  TEXT NOT NULL,
+    streak      INTEGER NOT NULL,
+    answered    INTEGER NOT NULL,
+    outcome     TEXT,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_session_results_player ON session_results(player, finished_at);
+
+CREATE TABLE IF NOT EXISTS leaderboard (
+    period      TEXT NOT NULL,
+    bucket      TEXT NOT NULL,
+    difficulty  TEXT NOT NULL,
+    player      TEXT NOT NULL,
+    best        INTEGER NOT NULL,
+    best_at     REAL NOT NULL,      -- when `best` was first reached (earlier wins ties in top_k)
+    games       INTEGER NOT NULL,
+    total       INTEGER NOT NULL,
+    PRIMARY KEY (period, bucket, difficulty, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_leaderboard_top
+    ON leaderboard(period, bucket, difficulty, best DESC, best_at, player, games);
+
+CREATE TABLE IF NOT EXISTS score_counts (
+    period      TEXT NOT NULL,
+    bucket      TEXT NOT NULL,
+    difficulty  TEXT NOT NULL,
+    best        INTEGER NOT NULL,
+    players     INTEGER NOT NULL,
+    PRIMARY KEY (period, bucket, difficulty, best)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO leaderboard (period, bucket, difficulty, player, best, best_at, games, total)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(period, bucket, difficulty, player) DO UPDATE SET
+        best_at = CASE WHEN excluded.best > best THEN excluded.best_at ELSE best_at END,
+        best = MAX(best, excluded.best),
+        games = games + excluded.games,
+        total = total + excluded.total
+"""
+
+_COUNT_SQL = """
+    INSERT INTO score_counts (period, bucket, difficulty, best, players) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(period, bucket, difficulty, best) DO UPDATE SET players = players + excluded.players
+"""
+
+
+def period_bucket(period, when):
+    """Bucket key of a period for a unix time: "", "2026-W42" or "2026-10-19" (local time)."""
+    if period == "all":
+        return ""
+    day = datetime.fromtimestamp(when).date()
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "day":
+        return day.isoformat()
+    raise ValueError(f"unknown leaderboard period {period!r} (expected one of {PERIODS})")
+
+
+@dataclass
+class Entry:
+    rank: int
+    player: str
+    best: int
+    games: int
+
+
+class Leaderboard:
+    def __init__(self, db_path=DEFAULT_DB_PATH, clock=time.time):
+        self.db_path = db_path
+        self.clock = clock
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self):
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # -------- writing --------
+
+    def record(self, player, difficulty, streak, answered=0, outcome=None, finished_at=None):
+        """Store a finished game and fold it into the all-time, weekly and daily boards."""
+        finished_at = self.clock() if finished_at is None else finished_at
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO session_results (player, difficulty, streak, answered, outcome, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (player, difficulty, streak, answered, outcome, finished_at),
+            )
+            self._fold(conn, player, difficulty, streak, finished_at, games=1)
+
+    def raise_bests(self, difficulty, bests, when=None):
+        """
+        Raise players' best streaks mid-game ([(player, streak), ...]) without
+        counting a game; lower values are ignored. One transaction for the batch.
+        rank_index.LiveRanks flushes through this.
+        """
+        when = self.clock() if when is None else when
+        conn = self._conn()
+        with conn:
+            for player, streak in bests:
+                self._fold(conn, player, difficulty, streak, when, games=0)
+
+    def _fold(self, conn, player, difficulty, streak, when, games):
+        for period in PERIODS:
+            key = (period, period_bucket(period, when), difficulty)
+            row = conn.execute(
+                "SELECT best FROM leaderboard WHERE period = ? AND bucket = ? AND difficulty = ? AND player = ?",
+                key + (player,),
+            ).fetchone()
+            conn.execute(_UPSERT_SQL, key + (player, streak, when, games, streak * games))
+
+            # Keep score_counts in step: the player moves from their old best to the new one
+            if row is None:
+                conn.execute(_COUNT_SQL, key + (streak, 1))
+            elif streak > row[0]:
+                conn.execute(_COUNT_SQL, key + (row[0], -1))
+                conn.execute(_COUNT_SQL, key + (streak, 1))
+
+    # -------- reading --------
+
+    def top_k(self, period, difficulty, k=10, when=None):
+        """Best `k` players of the current (or `when`'s) day/week/all-time board."""
+        bucket = period_bucket(period, self.clock() if when is None else when)
+        rows = self._conn().execute(
+            "SELECT player, best, games FROM leaderboard "
+            "WHERE period = ? AND bucket = ? AND difficulty = ? "
+            "ORDER BY best DESC, best_at, player LIMIT ?",
+            (period, bucket, difficulty, k),
+        ).fetchall()
+
+        entries = []
+        for i, (player, best, games) in enumerate(rows):
+            # Shared rank for equal bests, like my_rank
+            rank = entries[-1].rank if entries and entries[-1].best == best else i + 1
+            entries.append(Entry(rank, player, best, games))
+        return entries
+
+    def my_rank(self, player, period, difficulty, when=None):
+        """The player's Entry on a board, or None if they haven't played in that period."""
+        bucket = period_bucket(period, self.clock() if when is None else when)
+        key = (period, bucket, difficulty)
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT best, games FROM leaderboard WHERE period = ? AND bucket = ? AND difficulty = ? AND player = ?",
+            key + (player,),
+        ).fetchone()
+        if row is None:
+            return None
+        best, games = row
+        ahead = conn.execute(
+            "SELECT COALESCE(SUM(players), 0) FROM score_counts "
+            "WHERE period = ? AND bucket = ? AND difficulty = ? AND best > ?",
+            key + (best,),
+        ).fetchone()[0]
+        return Entry(ahead + 1, player, best, games)
+
+    def player_count(self, period, difficulty, when=None):
+        bucket = period_bucket(period, self.clock() if when is None else when)
+        return self._conn().execute(
+            "SELECT COALESCE(SUM(players), 0) FROM score_counts WHERE period = ? AND bucket = ? AND difficulty = ?",
+            (period, bucket, difficulty),
+        ).fetchone()[0]
+
+    def scores(self, period, difficulty, when=None):
+        """(player, best) for everyone on a board, in index order. Used to rebuild rank_index."""
+        bucket = period_bucket(period, self.clock() if when is None else when)
+        return self._conn().execute(
+            "SELECT player, best FROM leaderboard WHERE period = ? AND bucket = ? AND difficulty = ?",
+            (period, bucket, difficulty),
+        )
+
+
+# -------- benchmark --------
+
+def _bench(players, db_path, queries=2000):
+    import os
+    import random
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    board = Leaderboard(db_path)
+    now = time.time()
+    rng = random.Random(1)
+
+    # Bulk-load the all-time Hard board directly (record() is one transaction per game)
+    started = time.perf_counter()
+    counts = {}
+    rows = []
+    for i in range(players):
+        best = int(rng.expovariate(1 / 8))
+        counts[best] = counts.get(best, 0) + 1
+        rows.append(("all", "", "Hard", f"player{i}", best, now - i, 1 + i % 7, best))
+    conn = board._conn()
+    with conn:
+        conn.executemany("INSERT INTO leaderboard VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.executemany("INSERT INTO score_counts VALUES ('all', '', 'Hard', ?, ?)", counts.items())
+    print(f"Loaded {players:,} players in {time.perf_counter() - started:.1f} s")
+
+    def timed(label, fn):
+        started = time.perf_counter()
+        for _ in range(queries):
+            fn()
+        print(f"  {label:22}: {(time.perf_counter() - started) * 1e6 / queries:8.1f} us")
+
+    timed("top_k(10)", lambda: board.top_k("all", "Hard", 10))
+    timed("my_rank", lambda: board.my_rank(f"player{rng.randrange(players)}", "all", "Hard"))
+    timed("record (3 boards)", lambda: board.record(f"player{rng.randrange(players)}", "Hard",
+                                                    rng.randrange(30), outcome="bench"))
+    board.close()
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Time leaderboard queries on a large board.")
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--db", default="leaderboard_bench.db")
+    args = parser.parse_args()
+    _bench(args.players, args.db)
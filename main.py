@@ -1,36 +1,115 @@
-import random
+import os
+import sqlite3
 import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
 
 from DiffSelect import DiffSelect
-from generate_trivia import generate_questions_for_difficulty
+from cancellation import CancelledError, CancelToken
+from countdown import DeadlineCountdown
+from game_session import ASKING, TIME_PER_DIFFICULTY, GameSession
+from leaderboard import Leaderboard
+from question_pool import PoolManager, make_store_refill
+from question_sampler import QuestionSampler
+from question_store import QuestionStore
+from question_validator import DEFAULT_VALIDATOR
+from startup_bank import (
+    GENERATE,
+    PLAY_AND_REFRESH,
+    BackgroundRefresher,
+    load_cached_bank,
+    plan_startup,
+)
+from ui_metrics import NULL_MONITOR, monitor_from_setting
+from worker_channel import ProgressTracker, WorkerChannel
 
 #------ UI Theme -------
 # OU crimson and cream
 OU_CRIMSON = "#841617"
 OU_CREAM = "#FDF9D8"
 
-# Time limits per difficulty (in seconds)
-TIME_PER_DIFFICULTY = {
-    "Easy": 30,
-    "Medium": 20,
-    "Hard": 10,
-}
+# Leaderboard name (there are no accounts in the desktop app yet)
+PLAYER_ENV_VAR = "OU_TRIVIA_PLAYER"
+DEFAULT_PLAYER = "player"
+
+#------ Screen Manager -------
+# Each screen builds its widgets once, inside its own frame.
+# Switching screens just hides one frame and shows another,
+# so going back and forth (or playing again) costs milliseconds.
+class ScreenManager:
+    def __init__(self, root: tk.Tk, monitor=NULL_MONITOR):
+        self.root = root
+        self.monitor = monitor   # times each transition (ui_metrics)
+        self.screens = {}
+        self.current = None
+
+    def add(self, name: str, screen):
+        """Register a screen: anything with a `frame` and `pack_options`."""
+        self.screens[name] = screen
+
+    def show(self, name: str):
+        screen = self.screens[name]
+        with self.monitor.span(f"show:{name}"):
+            if self.current is not None and self.current is not screen:
+                self.current.frame.pack_forget()
+            if self.current is not screen:
+                screen.frame.pack(**screen.pack_options)
+                self.current = screen
+        return screen
+
 
 #------ Start Screen -------
 # -Shows game title 
 # - Lets users choose difficulty
 # - Handles async loading of questions via worker thread
 class StartScreen:
-    def __init__(self, root: tk.Tk, diff_manager: DiffSelect):
+    def __init__(self, root: tk.Tk, diff_manager: DiffSelect, monitor=NULL_MONITOR, player: str = None):
         self.root = root
         self.diff_manager = diff_manager
+        self.monitor = monitor
+        # Name results are saved under on the leaderboard
+        self.player = player or os.environ.get(PLAYER_ENV_VAR) or DEFAULT_PLAYER
 
         # threading-related state
         self.worker_thread = None
-        self.generated_questions = None
-        self.worker_error = None
         self.chosen_difficulty = None
+        self.progress = None
+
+        # Questions of the last game, reshuffled for "Play again" if the bank has none
+        self.last_questions = []
+
+        # Screens are built once and swapped (see ScreenManager)
+        self.screens = ScreenManager(root, monitor)
+        self.quiz_screen = None
+
+        # Cancellation of the running generation (None when nothing runs).
+        # Each run gets a new id so late messages from a cancelled run are ignored.
+        self.cancel_token = None
+        self.generation_id = 0
+        self.generating_difficulty = None
+
+        # The worker posts progress/results here; Tk handles them on the main thread
+        self.channel = WorkerChannel.for_tk(root, self._on_worker_message)
+
+        # SQLite bank that keeps every difficulty's questions side by side
+        self.question_store = QuestionStore()
+
+        # Finished games (all-time / weekly / daily boards per difficulty).
+        # Results are saved on one background thread, in order, so the Tk
+        # thread never waits on SQLite; the rank line arrives via self.channel
+        self.leaderboard = Leaderboard()
+        self.results = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard")
+
+        # Generates new questions in the background while the saved bank is played
+        self.refresher = BackgroundRefresher(self.question_store)
+
+        # Ready-to-play questions per difficulty, topped up from the bank in
+        # the background (refills never start generation)
+        self.pools = PoolManager(make_store_refill(self.question_store))
+        # Filled once the window has been drawn, so the first paint isn't
+        # competing with the refill threads
+        self.root.after_idle(self.pools.prime)
 
         # Basic UI setup
         self.root.title("OU Trivia Game")
@@ -38,9 +117,13 @@ class StartScreen:
         self.root.configure(bg=OU_CREAM)
         self.root.resizable(False, False)
 
-        # Main container frame
+        # Closing the window stops any generation still running
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Main container frame (packed by the screen manager)
         main_frame = tk.Frame(root, bg=OU_CREAM)
-        main_frame.pack(expand=True, padx=20, pady=20, fill="both")
+        self.frame = main_frame
+        self.pack_options = {"expand": True, "padx": 20, "pady": 20, "fill": "both"}
 
         # Title + subtitle
         title_main = tk.Label(
@@ -103,7 +186,7 @@ class StartScreen:
             bg=OU_CRIMSON,
             activebackground="#660000",
             relief="raised",
-            command=root.quit,
+            command=self.close,
         )
         exit_button.pack(pady=25)
 
@@ -117,12 +200,31 @@ class StartScreen:
         )
         self.status_label.pack(pady=(5, 0))
 
+        # Generation progress (only shown while generating)
+        self.progress_bar = ttk.Progressbar(main_frame, length=400, mode="determinate", maximum=1.0)
+        self.progress_label = tk.Label(main_frame, text="", bg=OU_CREAM, fg="black", font=("Arial", 12))
+        self.cancel_button = tk.Button(
+            main_frame,
+            text="Cancel",
+            font=("Arial", 13),
+            fg="white",
+            bg=OU_CRIMSON,
+            activebackground="#660000",
+            command=self.cancel_generation,
+        )
+
+        self.screens.add("start", self)
+        self.screens.show("start")
+
     # -------- difficulty click → start worker thread --------
 
     def start_game(self, difficulty: str):
-        # If a worker is already running, ignore extra clicks
-        if self.worker_thread is not None and self.worker_thread.is_alive():
-            return
+        if self.cancel_token is not None:
+            # Same difficulty again: keep the run going (ignore extra clicks)
+            if difficulty == self.generating_difficulty:
+                return
+            # Different difficulty: replace-and-cancel the current run
+            self.cancel_generation(f"switched to {difficulty}")
 
         # Save difficulty in DiffSelect
         try:
@@ -132,77 +234,212 @@ class StartScreen:
             return
 
         self.chosen_difficulty = difficulty
-        self.generated_questions = None
-        self.worker_error = None
-
-        # Disable difficulty buttons while loading
-        for btn in self.diff_buttons:
-            btn.config(state="disabled")
 
-        # Show loading message
+        # Stale-while-revalidate: play the saved bank right away if it's usable,
+        # and refresh it in the background for the next session
+        try:
+            bank = load_cached_bank(self.question_store, difficulty, pool=self.pools)
+        except Exception as e:
+            print("[Startup] Could not read the saved bank:", e)
+            bank = None
+
+        plan = plan_startup(bank)
+        if plan != GENERATE:
+            if plan == PLAY_AND_REFRESH:
+                self.refresher.refresh(difficulty)
+            if self._launch_quiz(bank.questions):
+                return
+
+        # Show loading message (difficulty buttons stay enabled: picking
+        # another one cancels this run and starts that one instead)
         self.status_label.config(
             text=f"Generating {difficulty} questions... please wait."
         )
         self.root.update_idletasks()
 
-        # Start background thread to generate questions
+        # Progress bar fills as articles finish
+        self.progress = ProgressTracker()
+        self.progress_bar["value"] = 0
+        self.progress_bar.pack(pady=(10, 0))
+        self.progress_label.config(text="Starting...")
+        self.progress_label.pack(pady=(5, 0))
+        self.cancel_button.pack(pady=(8, 0))
+
+        self.generation_id += 1
+        self.cancel_token = CancelToken()
+        self.generating_difficulty = difficulty
+
+        # Start background thread to generate questions; it reports back
+        # through self.channel, so there is nothing to poll
         self.worker_thread = threading.Thread(
-            target=self._worker_generate, args=(difficulty,), daemon=True
+            target=self._worker_generate,
+            args=(difficulty, self.cancel_token, self.generation_id),
+            daemon=True,
         )
         self.worker_thread.start()
 
-        # Start polling to see when thread is done
-        self.root.after(200, self._check_worker_done)
-
-    def _worker_generate(self, difficulty: str):
+    def _worker_generate(self, difficulty: str, cancel: CancelToken, generation_id: int):
         """
         Background thread: DO NOT touch any Tk widgets here.
-        Just call generate_questions_for_difficulty and store the result.
+        Everything goes back to the main thread as channel messages,
+        tagged with generation_id.
         """
+        def report(done, total, url):
+            self.channel.post("progress", (generation_id, (done, total)))
+
         try:
-            self.generated_questions = generate_questions_for_difficulty(difficulty)
-        except Exception as e:
-            self.worker_error = str(e)
+            # Imported on first use: openai/requests/bs4 aren't needed to show
+            # the start screen or to play saved questions
+            from generate_trivia import generate_questions_for_difficulty
 
-    def _check_worker_done(self):
+            # resume=True picks up an unfinished run left by a crash/close
+            questions = generate_questions_for_difficulty(
+                difficulty, resume=True, store=self.question_store, progress=report, cancel=cancel
+            )
+        except CancelledError:
+            # The UI already moved on when it cancelled us
+            return
+        except Exception as e:
+            self.channel.post("error", (generation_id, str(e)))
+            return
+        finally:
+            self.question_store.release()
+        self.channel.post("done", (generation_id, questions))
+
+    def _end_generation(self):
+        """Back to the idle start screen (main thread)."""
+        self.cancel_token = None
+        self.generating_difficulty = None
+        self.progress_bar.pack_forget()
+        self.progress_label.pack_forget()
+        self.cancel_button.pack_forget()
+
+    def cancel_generation(self, reason="cancelled by player"):
+        """Stop the running generation; its partial progress is kept for a resume."""
+        if self.cancel_token is None:
+            return
+        self.cancel_token.cancel(reason)
+        print(f"[StartScreen] {self.generating_difficulty} generation {reason}.")
+        self._end_generation()
+        self.status_label.config(text="Generation cancelled.")
+
+    def close(self):
+        """Exit button / window close: cancel any generation, then quit."""
+        if self.cancel_token is not None:
+            self.cancel_token.cancel("window closed")
+        self.channel.close()
+        self.monitor.stop()
+        # Let queued results finish saving, then close the saver's connection
+        self.results.submit(self.leaderboard.close)
+        self.results.shutdown(wait=True)
+        self.leaderboard.close()
+        self.question_store.close()
+        self.root.destroy()
+
+    def _on_worker_message(self, kind, payload):
         """
-        Called periodically on the Tk main thread.
-        When the worker finishes, we either show an error
-        or launch the QuizScreen.
+        Runs on the Tk main thread for every message the worker posts.
+        "progress" updates the bar; "done"/"error" end the loading state.
+        Messages from a run that was cancelled or replaced are ignored.
+        "rank" (from the leaderboard thread) adds the rank line to the end panel
+        if that game is still the one on screen.
         """
-        if self.worker_thread is None:
+        if kind == "rank":
+            session, note = payload
+            if self.quiz_screen is not None and self.quiz_screen.session is session:
+                self.quiz_screen.add_end_note(note)
             return
 
-        if self.worker_thread.is_alive():
-            # Still working -> check again later
-            self.root.after(200, self._check_worker_done)
+        generation_id, payload = payload
+        if generation_id != self.generation_id or self.cancel_token is None:
             return
 
-        # Worker finished
-        if self.worker_error:
+        if kind == "progress":
+            done, total = payload
+            self.progress.update(done, total)
+            self.progress_bar["value"] = self.progress.fraction
+            self.progress_label.config(text=self.progress.describe())
+            return
+
+        self._end_generation()
+
+        if kind == "error":
             self.status_label.config(
-                text=f"Error generating questions: {self.worker_error}"
+                text=f"Error generating questions: {payload}"
             )
-            for btn in self.diff_buttons:
-                btn.config(state="normal")
             return
 
-        questions = self.generated_questions or []
-        if not questions:
+        if not self._launch_quiz(payload or []):
             self.status_label.config(
                 text=f"No questions were generated. Check URLs or API key."
             )
-            for btn in self.diff_buttons:
-                btn.config(state="normal")
-            return
 
-        # Shuffle questions to vary order
-        random.shuffle(questions)
+    def _launch_quiz(self, questions):
+        """
+        Validate the questions and hand them to the QuizScreen in sampler order.
+        Returns False (and stays on this screen) if none are usable.
+        """
+        # Drop anything QuizScreen can't show safely (bad index, missing answers...)
+        questions, report = DEFAULT_VALIDATOR.filter_valid(questions)
+        if report.issues:
+            print("[Validator]", report.summary())
+
+        if not questions:
+            return False
+
+        # Deal them in random order, one at a time, with no two in a row from
+        # the same article (nothing is copied or shuffled up front)
+        self.last_questions = questions
 
-        # Go to quiz screen
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        QuizScreen(self.root, questions, self.chosen_difficulty)
+        # Go to quiz screen (built the first time, reused after that)
+        if self.quiz_screen is None:
+            self.quiz_screen = QuizScreen(
+                self.root, on_play_again=self.play_again, on_menu=self.show_menu,
+                on_game_end=self.record_result, monitor=self.monitor,
+            )
+            self.screens.add("quiz", self.quiz_screen)
+        self.screens.show("quiz")
+        self.quiz_screen.bind(QuestionSampler(questions), self.chosen_difficulty)
+        return True
+
+    def play_again(self, difficulty: str):
+        """
+        New game at the same difficulty without generating: fresh questions
+        from the bank/pool if there are any, otherwise the last set reshuffled.
+        """
+        self.chosen_difficulty = difficulty
+        try:
+            bank = load_cached_bank(self.question_store, difficulty, pool=self.pools)
+        except Exception as e:
+            print("[Startup] Could not read the saved bank:", e)
+            bank = None
+
+        questions = bank.questions if bank is not None and bank.questions else list(self.last_questions)
+        if not self._launch_quiz(questions):
+            self.show_menu()
+
+    def record_result(self, difficulty: str, session):
+        """Queue a finished game for the leaderboard; its rank line shows up once saved."""
+        self.results.submit(self._save_result, self.player, difficulty, session, session.streak,
+                            session.answered, session.end_reason or session.state)
+
+    def _save_result(self, player, difficulty, session, streak, answered, outcome):
+        """Leaderboard thread: DO NOT touch any Tk widgets here."""
+        try:
+            self.leaderboard.record(player, difficulty, streak, answered, outcome)
+            entry = self.leaderboard.my_rank(player, "day", difficulty)
+            players = self.leaderboard.player_count("day", difficulty)
+        except sqlite3.Error as e:
+            print("[Leaderboard] Could not save the result:", e)
+            return
+        self.channel.post("rank", (session, f"Today's {difficulty} rank: #{entry.rank} of {players} "
+                                            f"(best streak {entry.best})"))
+
+    def show_menu(self):
+        """Back to difficulty selection."""
+        self.root.title("OU Trivia Game")
+        self.status_label.config(text="")
+        self.screens.show("start")
 
 
 # ============================================================
@@ -220,22 +457,32 @@ class StartScreen:
 # - Game-over & win states
 # ============================================================
 class QuizScreen:
-    def __init__(self, root: tk.Tk, questions, difficulty: str):
+    def __init__(self, root: tk.Tk, questions=None, difficulty: str = None,
+                 on_play_again=None, on_menu=None, on_game_end=None, monitor=NULL_MONITOR):
+        """
+        Widgets are built once. bind() starts a game with new questions, so the
+        same screen is reused for every game ("Play again" included).
+        """
         self.root = root
-        self.questions = questions
+        self.on_play_again = on_play_again   # on_play_again(difficulty)
+        self.on_menu = on_menu
+        self.on_game_end = on_game_end       # on_game_end(difficulty, session) -> extra end-panel text
+        self.monitor = monitor    # times question rendering (ui_metrics)
+        self.questions = []
         self.difficulty = difficulty
-        self.current_index = 0
-        self.streak = 0
-        self.timer_id = None
         self.remaining_time = TIME_PER_DIFFICULTY.get(difficulty, 30)
 
-        # Window setup
-        self.root.title(f"OU Trivia — {difficulty} mode")
-        self.root.configure(bg=OU_CREAM)
+        # All game rules (index, streak, time limit, win/lose) live in the session;
+        # this screen only displays it and forwards clicks
+        self.session = None
+
+        # Counts down to a monotonic deadline, so late callbacks don't stretch the time limit
+        self.countdown = DeadlineCountdown(root, self._on_time_update, self._on_time_up)
 
-        # Layout frames
+        # Layout frames (packed by the screen manager)
         self.main_frame = tk.Frame(self.root, bg=OU_CREAM)
-        self.main_frame.pack(expand=True, fill="both", padx=25, pady=25)
+        self.frame = self.main_frame
+        self.pack_options = {"expand": True, "fill": "both", "padx": 25, "pady": 25}
 
         # Top info: difficulty, timer, streak
         self.info_frame = tk.Frame(self.main_frame, bg=OU_CREAM)
@@ -325,35 +572,89 @@ class QuizScreen:
         )
         self.status_label.pack(pady=(15, 0))
 
-         # Load first question
-        self.load_question()
+        # ---------------- End panel (hidden until the game ends) ----------------
+        self.end_frame = tk.Frame(self.main_frame, bg=OU_CREAM)
 
-    # ---------------- Timer logic ----------------
+        self._final_text = ""
+        self.final_label = tk.Label(
+            self.end_frame,
+            text="",
+            font=("Arial", 16, "bold"),
+            bg=OU_CREAM,
+            fg="black",
+            justify="center",
+        )
+        self.final_label.pack(pady=8)
 
-    def start_timer(self):
-        # Set starting time based on difficulty (default 30s)
-        self.remaining_time = TIME_PER_DIFFICULTY.get(self.difficulty, 30)
-        self.update_timer_label()
+        goodbye_label = tk.Label(
+            self.end_frame,
+            text="Thank you for playing OU Trivia!",
+            font=("Arial", 14),
+            bg=OU_CREAM,
+            fg="black",
+        )
+        goodbye_label.pack(pady=4)
 
-        # Cancel any existing timer before starting a new one
-        if self.timer_id is not None:
-            self.root.after_cancel(self.timer_id)
+        end_buttons = tk.Frame(self.end_frame, bg=OU_CREAM)
+        end_buttons.pack(pady=(15, 0))
+        for text, command in (("Play again", self._play_again), ("Main menu", self._back_to_menu)):
+            tk.Button(
+                end_buttons,
+                text=text,
+                font=("Arial", 14, "bold"),
+                bg=OU_CRIMSON,
+                fg="white",
+                activebackground="#660000",
+                activeforeground="white",
+                width=12,
+                command=command,
+            ).pack(side="left", padx=10)
 
-        # Call _tick every 1000 ms (1 second)
-        self.timer_id = self.root.after(1000, self._tick)
+        # Old style: QuizScreen(root, questions, difficulty) shows itself right away
+        if questions is not None:
+            self.main_frame.pack(**self.pack_options)
+            self.bind(questions, difficulty)
 
-    def _tick(self):
-        # Decrease time each second
-        self.remaining_time -= 1
+    def bind(self, questions, difficulty: str):
+        """Start a new game on this screen (widgets are reused, not rebuilt)."""
+        self.stop_timer()
+        self.questions = questions
+        self.difficulty = difficulty
+        self.session = GameSession(questions, difficulty)
 
-        if self.remaining_time <= 0:
-            self.update_timer_label()
-            self.game_over("Time's up! Game end. Goodbye!")
-            return
+        # Window title + labels for this game
+        self.root.title(f"OU Trivia — {difficulty} mode")
+        self.root.configure(bg=OU_CREAM)
+        self.diff_label.config(text=f"Difficulty: {difficulty}")
+        self.status_label.config(text="", fg="black", font=("Arial", 14))
+
+        # Bring the answer buttons back in place of the end panel
+        self.end_frame.pack_forget()
+        for btn in self.option_buttons:
+            btn.pack(pady=6, padx=100, fill="x")
+
+        # Load first question
+        self.session.start()
+        self.load_question()
+
+    # ---------------- Timer logic ----------------
+
+    def start_timer(self):
+        # Count down whatever the session allows for this question; restarting
+        # replaces any countdown that is still running
+        self.countdown.start(self.session.time_left())
 
+    def stop_timer(self):
+        self.countdown.stop()
+
+    def _on_time_update(self, seconds_left: int):
+        # Called by the countdown whenever the whole-second value changes
+        self.remaining_time = seconds_left
         self.update_timer_label()
-        # Schedule next tick
-        self.timer_id = self.root.after(1000, self._tick)
+
+    def _on_time_up(self):
+        self.session.expire()
+        self.game_over("Time's up! Game end. Goodbye!")
 
     def update_timer_label(self):
         # Refresh timer label text
@@ -361,13 +662,21 @@ class QuizScreen:
 
     # ---------------- Question logic ----------------
 
+    @property
+    def streak(self):
+        return self.session.streak
+
     def load_question(self):
-        if self.current_index >= len(self.questions):
+        with self.monitor.span("load_question"):
+            self._render_question()
+
+    def _render_question(self):
+        q = self.session.question
+        if q is None:
+            # Session ran out of questions: won
             self.you_win()
             return
 
-        q = self.questions[self.current_index]
-
         self.question_label.config(text=q["question"])
         self.hint_label.config(text=f"Hint: {q.get('hint', '')}")
         self.status_label.config(text="")
@@ -384,55 +693,62 @@ class QuizScreen:
 
     def handle_answer(self, idx: int):
         # Stop timer during processing
-        if self.timer_id is not None:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
+        self.stop_timer()
 
-        q = self.questions[self.current_index]
-        correct_idx = q["correct_index"]
+        # Ignore clicks once the question is over (e.g. a double click)
+        if self.session.state != ASKING:
+            return
+        # A click after the deadline is a timeout, even if the countdown
+        # hasn't ticked to zero yet
+        if self.session.check_timeout():
+            self.game_over("Time's up! Game end. Goodbye!")
+            return
 
-        if idx == correct_idx:
-            self.streak += 1
+        result = self.session.answer(idx)
+        if result.correct:
             self.status_label.config(text="Correct!", fg="green")
             self.update_streak_label()
-            self._maybe_show_streak_popup()
-            self.current_index += 1
+            if result.milestone:
+                self._show_streak_popup()
             # load next question after short delay
-            self.root.after(600, self.load_question)
+            self.root.after(600, self._next_question)
         else:
             # Wrong answer: then show friendly goodbye
             self.game_over("Incorrect choice! Game over. Goodbye!")
 
+    def _next_question(self):
+        self.session.next_question()
+        self.load_question()
+
     def update_streak_label(self):
         self.streak_label.config(text=f"Streak: {self.streak}")
 
-    def _maybe_show_streak_popup(self):
-        # Show popup for 5, 10, 15 in a row
-        if self.streak in (5, 10, 15):
-            popup = tk.Toplevel(self.root)
-            popup.title("Streak!")
-            popup.configure(bg=OU_CREAM)
-            popup.geometry("320x160")
-
-            msg = tk.Label(
-                popup,
-                text=f"{self.streak} in a row!",
-                font=("Arial Black", 20),
-                bg=OU_CREAM,
-                fg=OU_CRIMSON,
-            )
-            msg.pack(expand=True, pady=20)
+    def _show_streak_popup(self):
+        # Popup for 5, 10, 15 in a row (game_session.STREAK_MILESTONES)
+        popup = tk.Toplevel(self.root)
+        popup.title("Streak!")
+        popup.configure(bg=OU_CREAM)
+        popup.geometry("320x160")
+
+        msg = tk.Label(
+            popup,
+            text=f"{self.streak} in a row!",
+            font=("Arial Black", 20),
+            bg=OU_CREAM,
+            fg=OU_CRIMSON,
+        )
+        msg.pack(expand=True, pady=20)
 
-            ok_btn = tk.Button(
-                popup,
-                text="Keep Going",
-                font=("Arial", 12, "bold"),
-                bg=OU_CRIMSON,
-                fg="white",
-                activebackground="#660000",
-                command=popup.destroy,
-            )
-            ok_btn.pack(pady=10)
+        ok_btn = tk.Button(
+            popup,
+            text="Keep Going",
+            font=("Arial", 12, "bold"),
+            bg=OU_CRIMSON,
+            fg="white",
+            activebackground="#660000",
+            command=popup.destroy,
+        )
+        ok_btn.pack(pady=10)
 
     # ---------------- End states ----------------
 
@@ -445,84 +761,131 @@ class QuizScreen:
         for btn in self.option_buttons:
             btn.pack_forget()
 
-    def game_over(self, message: str):
-        if self.timer_id is not None:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
+    def _end_timer(self):
+        self.stop_timer()
+        # Tick lateness for the game, only reported when UI metrics are on
+        self.monitor.record("timer", **self.countdown.stats())
 
-        self.disable_all_buttons()
-        self.hide_buttons()
+    def game_over(self, message: str):
+        self._end_timer()
 
         # Big goodbye message
         self.status_label.config(text=message, fg="red", font=("Arial", 16, "bold"))
-
-        end_frame = tk.Frame(self.main_frame, bg=OU_CREAM)
-        end_frame.pack(pady=30)
-
-        final_label = tk.Label(
-            end_frame,
-            text=f"Final streak: {self.streak}",
-            font=("Arial", 16, "bold"),
-            bg=OU_CREAM,
-            fg="black",
-        )
-        final_label.pack(pady=8)
-
-        goodbye_label = tk.Label(
-            end_frame,
-            text="Thank you for playing OU Trivia!",
-            font=("Arial", 14),
-            bg=OU_CREAM,
-            fg="black",
-        )
-        goodbye_label.pack(pady=4)
-
-        # Automatically close the window after 2 seconds
-        self.root.after(2000, self.root.destroy)
+        self._show_end(f"Final streak: {self.streak}")
 
     def you_win(self):
-        if self.timer_id is not None:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
-
-        self.disable_all_buttons()
-        self.hide_buttons()
+        self._end_timer()
 
         self.status_label.config(
             text="End game – you win!",
             fg="green",
             font=("Arial", 16, "bold"),
         )
+        self._show_end(f"You answered all questions!\nFinal streak: {self.streak}")
 
-        end_frame = tk.Frame(self.main_frame, bg=OU_CREAM)
-        end_frame.pack(pady=30)
-
-        final_label = tk.Label(
-            end_frame,
-            text=f"You answered all questions!\nFinal streak: {self.streak}",
-            font=("Arial", 16, "bold"),
-            bg=OU_CREAM,
-            fg="black",
-            justify="center",
-        )
-        final_label.pack(pady=8)
-
-        goodbye_label = tk.Label(
-            end_frame,
-            text="Thank you for playing OU Trivia!",
-            font=("Arial", 14),
-            bg=OU_CREAM,
-            fg="black",
+    def _show_end(self, final_text: str):
+        # Swap the answer buttons for the (already built) end panel
+        self.disable_all_buttons()
+        self.hide_buttons()
+        self._final_text = final_text
+        self.final_label.config(text=final_text)
+        self.end_frame.pack(pady=30)
+        if self.on_game_end is not None:
+            note = self.on_game_end(self.difficulty, self.session)
+            if note:
+                self.add_end_note(note)
+
+    def add_end_note(self, note: str):
+        # Extra line under the final streak (e.g. the leaderboard rank, saved later)
+        self._final_text += "\n" + note
+        self.final_label.config(text=self._final_text)
+
+    def _play_again(self):
+        if self.on_play_again is not None:
+            self.on_play_again(self.difficulty)
+
+    def _back_to_menu(self):
+        if self.on_menu is not None:
+            self.on_menu()
+
+
+# --------- Startup benchmark ---------
+# Time to an interactive start screen, measured in a fresh interpreter each
+# run: importing this module, then building and painting StartScreen.
+# Heavy modules (openai, requests, bs4) must not load here; they load only
+# once a generation run starts.
+STARTUP_TARGET_MS = 200
+
+_STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+result = {"import_ms": (imported - started) * 1000, "paint_ms": None,
+          "heavy": [m for m in ("openai", "requests", "bs4", "generate_trivia") if m in sys.modules]}
+try:
+    root = main.tk.Tk()
+except main.tk.TclError:
+    pass  # no display: import time only
+else:
+    main.StartScreen(root, main.DiffSelect())
+    root.update()
+    result["paint_ms"] = (time.perf_counter() - imported) * 1000
+    root.destroy()
+print(json.dumps(result))
+"""
+
+
+def run_startup_benchmark(runs=5):
+    import json
+    import os
+    import statistics
+    import subprocess
+    import sys
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP_PROBE], cwd=here, capture_output=True, text=True, check=True
         )
-        goodbye_label.pack(pady=4)
-
-        # Close after a short delay
-        self.root.after(2500, self.root.destroy)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    import_ms = statistics.median(r["import_ms"] for r in results)
+    print(f"import main:      {import_ms:6.1f} ms (median of {runs})")
+    total_ms = import_ms
+    if results[0]["paint_ms"] is not None:
+        paint_ms = statistics.median(r["paint_ms"] for r in results)
+        total_ms += paint_ms
+        print(f"first paint:      {paint_ms:6.1f} ms")
+    else:
+        print("first paint:      skipped (no display)")
+    print(f"to start screen:  {total_ms:6.1f} ms (target < {STARTUP_TARGET_MS} ms)")
+    if results[0]["heavy"]:
+        print("Heavy modules loaded at startup:", ", ".join(results[0]["heavy"]))
+    return total_ms < STARTUP_TARGET_MS and not results[0]["heavy"]
 
 
 # --------- Main entry ---------
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="OU Trivia")
+    parser.add_argument("--startup-bench", type=int, nargs="?", const=5, default=None, metavar="RUNS",
+                        help="measure time to the start screen instead of running the game")
+    parser.add_argument("--player", default=None,
+                        help=f"name saved on the leaderboard (default: ${PLAYER_ENV_VAR} or '{DEFAULT_PLAYER}')")
+    parser.add_argument("--ui-metrics", nargs="?", const="1", default=None, metavar="TRACE",
+                        help="print event-loop lag/render summaries (and write a JSONL trace)")
+    args = parser.parse_args()
+
+    if args.startup_bench:
+        raise SystemExit(0 if run_startup_benchmark(args.startup_bench) else 1)
+
     root = tk.Tk()
     diff_manager = DiffSelect()
-    StartScreen(root, diff_manager)
+    # Off unless --ui-metrics or OU_TRIVIA_UI_METRICS is set
+    monitor = monitor_from_setting(root, args.ui_metrics)
+    StartScreen(root, diff_manager, monitor, player=args.player)
     root.mainloop()
+    monitor.stop()
@@ -2,17 +2,47 @@ import requests  # request website
 from bs4 import BeautifulSoup  # html scrape
 import re  # for text "\n" * (n amt of times) reoccurrence formatting
 from urls import urls as URLS
+from cancellation import CancelledError
+
+# (connect, read) timeouts in seconds, so a stuck server can't hold a run forever
+REQUEST_TIMEOUT = (5, 15)
+
+# Page is downloaded in chunks so a cancel can stop it partway
+CHUNK_SIZE = 64 * 1024
 
 class ArticleScraper:
     def __init__(self):
         # Mozilla or Chrome doesn't matter, Mozilla is more reliable
         self.headers = {"User-Agent": "Mozilla/5.0"}
 
-    def scrape(self, url):
-        # fetch webpage
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+    def _download(self, url, cancel=None):
+        response = requests.get(url, headers=self.headers, timeout=REQUEST_TIMEOUT, stream=True)
+        # Cancelling closes the connection, which aborts a download in progress
+        unregister = cancel.on_cancel(response.close) if cancel is not None else None
+        try:
+            response.raise_for_status()
+            chunks = []
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                chunks.append(chunk)
+            return b"".join(chunks)
+        except CancelledError:
+            raise
+        except Exception:
+            if cancel is not None and cancel.cancelled:
+                # The read failed because we closed the connection ourselves
+                raise CancelledError(cancel.reason)
+            raise
+        finally:
+            if unregister is not None:
+                unregister()
+            response.close()
+
+    def scrape(self, url, cancel=None):
+        # fetch webpage (bytes; BeautifulSoup works out the encoding)
+        html = self._download(url, cancel)
+        soup = BeautifulSoup(html, "html.parser")
 
         # get title
         title = soup.select_one("h1")
@@ -0,0 +1,261 @@
+"""
+In-memory question pools with low/high watermarks.
+
+Each difficulty keeps a pool of ready-to-play questions in memory. Sessions
+take questions from the pool without ever waiting. When a take leaves the
+pool below its low watermark, one background refill job (never more than one
+per difficulty) tops it back up to the high watermark.
+
+The refill function decides where questions come from. make_store_refill
+only samples the SQLite bank: the pool is a read-ahead cache that keeps
+SQLite off the session's path, not a source of new questions. Adding to the
+bank stays with generation (startup_bank's empty/stale-bank checks and
+BackgroundRefresher), which the user can see and cancel; a pool refill that
+runs after those have written picks the new questions up.
+
+Metrics (per pool): size, questions consumed/refilled, consume and refill
+rates over the last few minutes, refill jobs run/failed, and whether a refill
+is in flight.
+
+    python question_pool.py     -> short simulation that prints the metrics
+"""
+import threading
+import time
+from collections import deque
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+DEFAULT_LOW_WATERMARK = 30
+DEFAULT_HIGH_WATERMARK = 120
+
+# Rates are averaged over this window
+RATE_WINDOW_SECONDS = 300
+
+# A refill job gives up after this many rounds that add nothing new
+# (e.g. the bank has fewer distinct questions than the high watermark)
+MAX_EMPTY_ROUNDS = 2
+
+
+def _key(q):
+    """Identity used to keep the same question out of a pool twice."""
+    if hasattr(q, "content_hash"):
+        return q.content_hash()
+    return (q["question"], tuple(q["answers"]))
+
+
+class _RateCounter:
+    """Counts events in a sliding time window."""
+
+    def __init__(self, clock, window=RATE_WINDOW_SECONDS):
+        self.clock = clock
+        self.window = window
+        self.events = deque()
+        self.total = 0
+
+    def add(self, n):
+        self.total += n
+        self.events.append((self.clock(), n))
+
+    def per_minute(self):
+        now = self.clock()
+        while self.events and self.events[0][0] < now - self.window:
+            self.events.popleft()
+        return sum(n for _, n in self.events) * 60.0 / self.window
+
+
+class QuestionPool:
+    def __init__(self, difficulty, refill, low=DEFAULT_LOW_WATERMARK, high=DEFAULT_HIGH_WATERMARK,
+                 clock=time.monotonic):
+        if not 0 <= low < high:
+            raise ValueError("Watermarks must satisfy 0 <= low < high.")
+
+        self.difficulty = difficulty
+        self.refill = refill      # refill(difficulty, count) -> list of questions
+        self.low = low
+        self.high = high
+
+        self._items = deque()
+        self._keys = set()
+        self._lock = threading.Lock()
+        self._refill_thread = None
+        # Guards the run/failure counters, which refill threads update
+        self._stats_lock = threading.Lock()
+
+        self._consumed = _RateCounter(clock)
+        self._refilled = _RateCounter(clock)
+        self.refill_runs = 0
+        self.refill_failures = 0
+        self.last_refill_error = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    # -------- consuming --------
+
+    def take(self, n):
+        """
+        Up to `n` questions, immediately. Never waits for a refill: if the pool
+        is short, you get what's there and a refill starts in the background.
+        """
+        with self._lock:
+            taken = []
+            while self._items and len(taken) < n:
+                q = self._items.popleft()
+                self._keys.discard(_key(q))
+                taken.append(q)
+            self._consumed.add(len(taken))
+            below_low = len(self._items) < self.low
+
+        if below_low:
+            self.request_refill()
+        return taken
+
+    # -------- refilling --------
+
+    @property
+    def refill_in_flight(self):
+        thread = self._refill_thread
+        return thread is not None and thread.is_alive()
+
+    def request_refill(self):
+        """Start a refill job unless one is already running. Returns True if started."""
+        with self._lock:
+            if self.refill_in_flight or len(self._items) >= self.high:
+                return False
+            self._refill_thread = threading.Thread(
+                target=self._run_refill, name=f"pool-refill-{self.difficulty}", daemon=True
+            )
+            self._refill_thread.start()
+            return True
+
+    def _add(self, questions):
+        """Add new questions (skipping ones already pooled). Returns how many were added."""
+        added = 0
+        with self._lock:
+            for q in questions:
+                if len(self._items) >= self.high:
+                    break
+                key = _key(q)
+                if key in self._keys:
+                    continue
+                self._keys.add(key)
+                self._items.append(q)
+                added += 1
+            self._refilled.add(added)
+        return added
+
+    def _wanted(self):
+        """How many questions the pool is short of its high watermark."""
+        with self._lock:
+            return self.high - len(self._items)
+
+    def _run_refill(self):
+        with self._stats_lock:
+            self.refill_runs += 1
+        empty_rounds = 0
+        try:
+            while empty_rounds < MAX_EMPTY_ROUNDS:
+                wanted = self._wanted()
+                if wanted <= 0:
+                    break
+                if self._add(self.refill(self.difficulty, wanted)) == 0:
+                    empty_rounds += 1
+            with self._stats_lock:
+                self.last_refill_error = None
+        except Exception as e:
+            with self._stats_lock:
+                self.refill_failures += 1
+                self.last_refill_error = str(e)
+            print(f"[Pool] {self.difficulty} refill failed: {e}")
+
+    def wait_for_refill(self, timeout=None):
+        thread = self._refill_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    # -------- metrics --------
+
+    def metrics(self):
+        with self._lock:
+            size = len(self._items)
+            consumed, refilled = self._consumed.total, self._refilled.total
+            consume_rate, refill_rate = self._consumed.per_minute(), self._refilled.per_minute()
+        with self._stats_lock:
+            runs, failures, error = self.refill_runs, self.refill_failures, self.last_refill_error
+        return {
+            "difficulty": self.difficulty,
+            "size": size,
+            "low": self.low,
+            "high": self.high,
+            "consumed_total": consumed,
+            "refilled_total": refilled,
+            "consume_per_min": round(consume_rate, 2),
+            "refill_per_min": round(refill_rate, 2),
+            "refill_in_flight": self.refill_in_flight,
+            "refill_runs": runs,
+            "refill_failures": failures,
+            "last_refill_error": error,
+        }
+
+
+class PoolManager:
+    """One QuestionPool per difficulty, sharing the same refill function."""
+
+    def __init__(self, refill, low=DEFAULT_LOW_WATERMARK, high=DEFAULT_HIGH_WATERMARK,
+                 difficulties=DIFFICULTIES):
+        self.pools = {d: QuestionPool(d, refill, low, high) for d in difficulties}
+
+    def take(self, difficulty, n):
+        return self.pools[difficulty].take(n)
+
+    def prime(self):
+        """Start filling every pool in the background (e.g. at app startup)."""
+        for pool in self.pools.values():
+            pool.request_refill()
+
+    def metrics(self):
+        return {d: pool.metrics() for d, pool in self.pools.items()}
+
+
+def make_store_refill(store):
+    """
+    Refill function backed by the SQLite bank. It only reads: a bank that is
+    short just gives a smaller pool (generation is never started from here).
+    """
+    def refill(difficulty, count):
+        try:
+            return store.sample(difficulty, count)
+        finally:
+            # Refills run on short-lived pool threads
+            store.release()
+
+    return refill
+
+
+if __name__ == "__main__":
+    # Simulation: players take 10 questions every 50 ms, refill is slow-ish
+    import random
+
+    counter = [0]
+
+    def slow_refill(difficulty, count):
+        time.sleep(0.2)
+        batch = []
+        for _ in range(min(count, 40)):
+            counter[0] += 1
+            batch.append({"question": f"Q{counter[0]}", "answers": ["A", "B", "C", "D"]})
+        return batch
+
+    pool = QuestionPool("Hard", slow_refill, low=30, high=120)
+    pool.request_refill()
+    pool.wait_for_refill()
+
+    short_sessions = 0
+    for _ in range(60):
+        if len(pool.take(10)) < 10:
+            short_sessions += 1
+        time.sleep(random.uniform(0.03, 0.07))
+
+    print(pool.metrics())
+    print(f"Sessions that got fewer than 10 questions: {short_sessions}")
@@ -0,0 +1,177 @@
+"""
+Compact question record used instead of one plain dict per question.
+
+A dict per question carries its own hash table with six key slots, a list for
+the answers, and (when loaded from JSON) its own copy of strings such as the
+source title that are repeated across many questions. QuestionRecord keeps
+the same fields in __slots__, stores the answers as a tuple and interns the
+repeated strings (source title, difficulty) so every question from the same
+article points at one shared string.
+
+While the rest of the code migrates, a record still behaves like the old dict
+for reading: q["question"], q.get("hint", ""), "source_title" in q, and
+to_dict() for anything that needs real JSON (save_all, checkpoints, FastAPI).
+
+Memory benchmark:
+    python question_record.py --count 100000
+"""
+import hashlib
+import sys
+
+# Fields that may be missing from a question dict
+_OPTIONAL = ("source_title", "difficulty", "source_url")
+
+
+class QuestionRecord:
+    __slots__ = ("question", "answers", "correct_index", "hint", "source_title", "difficulty", "source_url")
+
+    def __init__(self, question, answers, correct_index, hint="", source_title=None, difficulty=None,
+                 source_url=None):
+        self.question = question
+        self.answers = tuple(answers)
+        self.correct_index = correct_index
+        self.hint = hint
+        # Interned: many questions share the same article title / difficulty
+        self.source_title = sys.intern(source_title) if source_title else None
+        self.difficulty = sys.intern(difficulty) if difficulty else None
+        self.source_url = sys.intern(source_url) if source_url else None
+
+    @classmethod
+    def from_dict(cls, q):
+        """Build a record from a question dict (or return it as-is if it already is one)."""
+        if isinstance(q, cls):
+            return q
+        return cls(
+            q["question"],
+            q["answers"],
+            q["correct_index"],
+            q.get("hint", ""),
+            q.get("source_title"),
+            q.get("difficulty"),
+            q.get("source_url"),
+        )
+
+    def to_dict(self):
+        """Plain dict in the trivia_questions.json layout."""
+        q = {
+            "question": self.question,
+            "answers": list(self.answers),
+            "correct_index": self.correct_index,
+            "hint": self.hint,
+        }
+        if self.source_title:
+            q["source_title"] = self.source_title
+        if self.difficulty:
+            q["difficulty"] = self.difficulty
+        if self.source_url:
+            q["source_url"] = self.source_url
+        return q
+
+    def content_hash(self):
+        """
+        Stable ID for the question's content (question text + answer choices).
+        Same question -> same hash, across runs, machines and storage formats.
+        """
+        return content_hash(self.question, self.answers)
+
+    # -------- dict-compatible read access (for code written against dicts) --------
+
+    def keys(self):
+        return [k for k in self.__slots__ if k in self]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __contains__(self, key):
+        if key in _OPTIONAL:
+            return getattr(self, key) is not None
+        return key in self.__slots__
+
+    def __getitem__(self, key):
+        if not isinstance(key, str) or key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if not isinstance(key, str) or key not in self:
+            return default
+        return getattr(self, key)
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self.keys()]
+
+    def __eq__(self, other):
+        if isinstance(other, QuestionRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __hash__(self):
+        # Equal records have the same question and answers, so they share a
+        # content hash; records can go in sets and be dict keys. Don't change
+        # a record's question or answers while it is in one.
+        return hash(self.content_hash())
+
+    def __repr__(self):
+        return f"QuestionRecord({self.question!r}, difficulty={self.difficulty!r})"
+
+
+def content_hash(question, answers):
+    """Hash of the normalized question text and answers (see QuestionRecord.content_hash)."""
+    parts = [question.strip().lower()] + [a.strip().lower() for a in answers]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+# -------- memory benchmark --------
+
+def _fake_bank_json(count):
+    """A JSON document like trivia_questions.json, 100 questions per article."""
+    import json
+
+    questions = []
+    for n in range(count):
+        questions.append({
+            "question": f"Sample question {n}: which detail appears in the article?",
+            "answers": [f"Answer {n}-{i}" for i in range(4)],
+            "correct_index": n % 4,
+            "hint": f"Think about detail {n % 97}.",
+            "source_title": f"OU Daily article number {n // 100} about Sooners news",
+            "difficulty": ("Easy", "Medium", "Hard")[n % 3],
+        })
+    return json.dumps({"questions": questions})
+
+
+def run_benchmark(count=100_000):
+    import gc
+    import json
+    import tracemalloc
+
+    text = _fake_bank_json(count)
+
+    tracemalloc.start()
+    dicts = json.loads(text)["questions"]
+    gc.collect()
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+
+    records = [QuestionRecord.from_dict(q) for q in dicts]
+    del dicts
+    gc.collect()
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"Questions:         {len(records):,}")
+    print(f"dict per question: {dict_bytes / count:,.0f} bytes")
+    print(f"QuestionRecord:    {record_bytes / count:,.0f} bytes")
+    print(f"Saved:             {(1 - record_bytes / dict_bytes) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bytes per question: dict vs QuestionRecord.")
+    parser.add_argument("--count", type=int, default=100_000)
+    run_benchmark(parser.parse_args().count)
@@ -0,0 +1,343 @@
+"""
+Shuffle-bag question sampler: random order, no repeats within a session.
+
+StartScreen used to random.shuffle() the whole question list before every
+game, and streaks.QuizScreen asked for a get_random_question() that didn't
+exist. QuestionSampler deals questions one at a time instead:
+
+    - Without replacement: a lazy Fisher-Yates shuffle over positions. Only
+      the positions that have been swapped are remembered, so each draw is
+      O(1) and memory grows with the questions drawn, not with the bank.
+    - Stratified by difficulty: with several difficulties the sampler takes
+      them in turn (Easy, Medium, Hard, Easy, ...), skipping any that run out.
+    - Spread over sources: two questions in a row never come from the same
+      article if it can be helped. A draw from the same article is held back
+      and dealt later, once something else has come in between.
+    - Reproducible: the same bank, difficulties and seed give the same order.
+      A sampler made without a seed picks one and keeps it in `.seed`.
+    - Fresh for the player: given a `seen` filter (seen_filter.SeenFilter),
+      questions the player answered in earlier sessions are skipped. If only
+      seen questions are left, some of those are dealt rather than none.
+
+It works over every bank format through a small source adapter:
+
+    list of questions / QuestionRecords   -> ListSource
+    binary_bank.BinaryBank (mmap)         -> BinarySource
+    question_store.QuestionStore (SQLite) -> StoreSource
+
+    sampler = QuestionSampler(store, difficulties="Hard", seed=42)
+    q = sampler.draw()          # None once the bank is used up
+    for q in QuestionSampler(questions): ...
+    dealer = QuestionDealer(store, seen=seen)   # reshuffles instead of running out
+
+    python question_sampler.py --count 200000   -> draw-time benchmark
+"""
+import random
+from array import array
+from collections import deque
+
+from question_record import QuestionRecord
+
+# Fresh draws tried before giving up on avoiding a same-article repeat
+SOURCE_LOOKAHEAD = 8
+
+# Already-seen questions skipped per draw before one is dealt anyway, and how
+# many skipped ones are kept to fall back on once the bank runs out
+MAX_SEEN_SKIPS = 50
+SEEN_SPILL = 64
+
+
+class ShuffleBag:
+    """
+    Positions 0..n-1 in random order without materialising the list.
+
+    Fisher-Yates swaps position i with a random j >= i; here the swaps live in
+    a dict, so an untouched position stands for itself.
+    """
+
+    def __init__(self, n, rng):
+        self.n = n
+        self.drawn = 0
+        self._rng = rng
+        self._swaps = {}
+
+    def __len__(self):
+        return self.n - self.drawn
+
+    def draw(self):
+        if self.drawn >= self.n:
+            raise IndexError("shuffle bag is empty")
+        i = self.drawn
+        j = self._rng.randrange(i, self.n)
+        picked = self._swaps.get(j, j)
+        current = self._swaps.pop(i, i)   # position i is never looked at again
+        if j != i:
+            self._swaps[j] = current
+        self.drawn += 1
+        return picked
+
+
+# -------- bank adapters --------
+#
+# A source answers two questions: how many positions a difficulty has, and
+# which question sits at a position. A source whose positions can map to the
+# same question sets `exact = False`, and the sampler skips repeats itself.
+
+class ListSource:
+    exact = True
+
+    def __init__(self, questions):
+        self.questions = questions
+        self._by_difficulty = {}   # difficulty -> array of list indexes, built on first use
+
+    def _positions(self, difficulty):
+        if difficulty not in self._by_difficulty:
+            self._by_difficulty[difficulty] = array(
+                "I", (i for i, q in enumerate(self.questions) if q.get("difficulty") == difficulty)
+            )
+        return self._by_difficulty[difficulty]
+
+    def count(self, difficulty):
+        if difficulty is None:
+            return len(self.questions)
+        return len(self._positions(difficulty))
+
+    def get(self, difficulty, position):
+        if difficulty is None:
+            return self.questions[position]
+        return self.questions[self._positions(difficulty)[position]]
+
+
+class BinarySource:
+    """Uses the bank's own per-difficulty index, so nothing is built."""
+
+    exact = True
+
+    def __init__(self, bank):
+        self.bank = bank
+
+    def count(self, difficulty):
+        return self.bank.count(difficulty)
+
+    def get(self, difficulty, position):
+        if difficulty is None:
+            return self.bank[position]
+        return self.bank[self.bank.record_number(difficulty, position)]
+
+
+class StoreSource:
+    """
+    Positions index the difficulty's sorted id array (QuestionStore.ids(),
+    taken when the sampler starts), so they are dense: every question has
+    exactly one position whatever gaps the ids have. A position is one
+    primary-key lookup. Rows deleted since then come back as None and are
+    skipped.
+    """
+
+    exact = True
+
+    def __init__(self, store):
+        self.store = store
+        self._ids = {}
+
+    def count(self, difficulty):
+        self._ids[difficulty] = self.store.ids(difficulty)
+        return len(self._ids[difficulty])
+
+    def get(self, difficulty, position):
+        found = self.store.by_ids([self._ids[difficulty][position]], difficulty)
+        return found[0] if found else None
+
+
+def as_source(bank):
+    """Wrap a question list, BinaryBank or QuestionStore in the matching adapter."""
+    if isinstance(bank, (ListSource, BinarySource, StoreSource)):
+        return bank
+    if hasattr(bank, "record_number"):
+        return BinarySource(bank)
+    if hasattr(bank, "ids") and hasattr(bank, "by_ids"):
+        return StoreSource(bank)
+    return ListSource(bank if isinstance(bank, list) else list(bank))
+
+
+def _source_key(q):
+    return q.get("source_url") or q.get("source_title")
+
+
+def _content_key(q):
+    return QuestionRecord.from_dict(q).content_hash()
+
+
+class QuestionSampler:
+    def __init__(self, bank, difficulties=None, seed=None, spread_sources=True, seen=None):
+        """
+        difficulties: None (whole bank), one difficulty, or a list of them to
+        take in turn. spread_sources=False deals in plain shuffled order.
+        seen: anything that answers `content_hash in seen` (e.g. a SeenFilter).
+        """
+        self.source = as_source(bank)
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.spread_sources = spread_sources
+        self.seen = seen
+        rng = random.Random(self.seed)
+
+        if difficulties is None or isinstance(difficulties, str):
+            difficulties = [difficulties]
+        self._order = list(dict.fromkeys(difficulties))
+        self._bags = {d: ShuffleBag(self.source.count(d), rng) for d in self._order}
+        self._held = {d: deque() for d in self._order}
+        self._seen_spill = {d: deque(maxlen=SEEN_SPILL) for d in self._order}
+        self._turn = 0
+
+        self._dealt = set()        # only used when the source can repeat itself
+        self._last_source = None
+        self.drawn = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        q = self.draw()
+        if q is None:
+            raise StopIteration
+        return q
+
+    def remaining(self):
+        """Upper bound on questions left (exact unless questions were deleted from the bank mid-session)."""
+        return sum(len(bag) + len(self._held[d]) + len(self._seen_spill[d]) for d, bag in self._bags.items())
+
+    def draw(self):
+        """Next question, or None when every stratum is used up."""
+        for _ in range(len(self._order)):
+            difficulty = self._order[self._turn % len(self._order)]
+            self._turn += 1
+            q = self._draw_from(difficulty)
+            if q is not None:
+                self._last_source = _source_key(q)
+                self.drawn += 1
+                return q
+        return None
+
+    def draw_many(self, k):
+        """Up to `k` questions (fewer if the bank runs out)."""
+        picked = []
+        while len(picked) < k:
+            q = self.draw()
+            if q is None:
+                break
+            picked.append(q)
+        return picked
+
+    def _repeats_source(self, q):
+        return (self.spread_sources and self._last_source is not None
+                and _source_key(q) == self._last_source)
+
+    def _draw_from(self, difficulty):
+        # Something held back earlier that no longer follows its own article
+        held = self._held[difficulty]
+        for i, q in enumerate(held):
+            if not self._repeats_source(q):
+                del held[i]
+                return q
+
+        for _ in range(SOURCE_LOOKAHEAD):
+            q = self._fresh(difficulty)
+            if q is None:
+                break
+            if not self._repeats_source(q):
+                return q
+            held.append(q)
+
+        # Only same-article questions left (or very unlucky): repeat it
+        return held.popleft() if held else None
+
+    def _fresh(self, difficulty):
+        bag = self._bags[difficulty]
+        spill = self._seen_spill[difficulty]
+        skipped = 0
+        while len(bag):
+            q = self.source.get(difficulty, bag.draw())
+            if q is None:
+                continue
+            key = None
+            if not self.source.exact:
+                key = _content_key(q)
+                if key in self._dealt:
+                    continue
+                self._dealt.add(key)
+            if self.seen is not None and skipped < MAX_SEEN_SKIPS:
+                if (key or _content_key(q)) in self.seen:
+                    spill.append(q)
+                    skipped += 1
+                    continue
+            return q
+
+        # Nothing unseen left: deal questions the player has seen before
+        return spill.popleft() if spill else None
+
+
+class QuestionDealer:
+    """
+    Endless dealing for one screen or session: a QuestionSampler over the
+    bank, replaced by a freshly shuffled one once the bank is used up. The
+    screen that makes it owns it (and the bank), so nothing is cached past
+    the screen's life.
+    """
+
+    def __init__(self, bank, difficulties=None, seen=None):
+        self.source = as_source(bank)
+        self.difficulties = difficulties
+        self.seen = seen
+        self.sampler = QuestionSampler(self.source, difficulties, seen=seen)
+
+    def draw(self):
+        """Next question, or None only if the bank has none at all."""
+        q = self.sampler.draw()
+        if q is None and self.sampler.drawn:
+            # Bank used up: deal it again in a new order
+            self.sampler = QuestionSampler(self.source, self.difficulties, seen=self.seen)
+            q = self.sampler.draw()
+        return q
+
+
+# -------- benchmark --------
+
+def _bench(count, draws):
+    import time
+    import tracemalloc
+
+    bank = [
+        QuestionRecord(f"Question {i}?", ["A", "B", "C", "D"], i % 4, "hint",
+                       f"Article {i // 5}", ("Easy", "Medium", "Hard")[i % 3], f"https://example.com/{i // 5}")
+        for i in range(count)
+    ]
+
+    started = time.perf_counter()
+    for _ in range(20):
+        shuffled = list(bank)
+        random.shuffle(shuffled)
+    shuffle_ms = (time.perf_counter() - started) * 1000 / 20
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    sampler = QuestionSampler(bank, seed=1)
+    picked = sampler.draw_many(draws)
+    sample_ms = (time.perf_counter() - started) * 1000
+    peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    repeats = sum(1 for a, b in zip(picked, picked[1:]) if a.source_url == b.source_url)
+    print(f"Bank of {count:,} questions")
+    print(f"  random.shuffle (whole list) : {shuffle_ms:8.2f} ms per game")
+    print(f"  QuestionSampler, {draws} draws: {sample_ms:8.2f} ms per game, peak {peak_kb:.1f} KB")
+    print(f"  same-article neighbours     : {repeats}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the shuffle-bag sampler against random.shuffle.")
+    parser.add_argument("--count", type=int, default=200_000, help="questions in the fake bank")
+    parser.add_argument("--draws", type=int, default=50, help="questions dealt per game")
+    args = parser.parse_args()
+    _bench(args.count, args.draws)
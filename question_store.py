@@ -0,0 +1,609 @@
+"""
+SQLite question bank shared by generators and quiz sessions.
+
+trivia_questions.json is overwritten by every generation run, so an Easy run
+wipes out the Hard questions and a reader can catch the file mid-write. The
+store keeps every difficulty side by side in one database:
+
+    - WAL mode: readers never block the writer and vice versa, so a quiz can
+      sample questions while a background run inserts new ones.
+    - One connection per thread (sqlite3 connections can't be shared across
+      threads), all pointing at the same file. Background threads call
+      release() when they finish so their connection doesn't outlive them.
+    - Bulk inserts are one executemany inside one transaction.
+    - Duplicate questions are skipped via a UNIQUE content hash.
+    - Indexes on (difficulty, id), source_url, content_hash and created_at keep
+      filtered lookups at O(log n). Random sampling picks positions in a
+      cached per-difficulty id array, so every question is equally likely.
+    - Full-text search (SQLite FTS5) over question, answers, hint and
+      source_title, plus the scraped article text. Triggers update the search
+      index in the same transaction as every insert/update/delete, so it is
+      never out of date and never needs a full rebuild.
+
+Usage:
+    store = QuestionStore()
+    store.add_questions(questions, difficulty="Hard")
+    picked = store.sample("Hard", 10)
+
+    python question_store.py import trivia_questions.json --difficulty Easy
+    python question_store.py stats
+    python question_store.py search "Bizzell library"
+    python question_store.py search Mateer --articles
+"""
+import json
+import random
+import sqlite3
+import threading
+import re
+import time
+from array import array
+from dataclasses import dataclass
+
+from question_record import QuestionRecord
+
+DEFAULT_DB_PATH = "trivia_bank.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id            INTEGER PRIMARY KEY,
+    difficulty    TEXT NOT NULL,
+    question      TEXT NOT NULL,
+    answers       TEXT NOT NULL,          -- JSON list of answer strings
+    correct_index INTEGER NOT NULL,
+    hint          TEXT NOT NULL DEFAULT '',
+    source_title  TEXT,
+    source_url    TEXT,
+    content_hash  TEXT NOT NULL,
+    created_at    REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_content_hash ON questions(content_hash);
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty, id);
+CREATE INDEX IF NOT EXISTS idx_questions_source_url ON questions(source_url);
+CREATE INDEX IF NOT EXISTS idx_questions_created_at ON questions(created_at);
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty_created ON questions(difficulty, created_at);
+
+CREATE TABLE IF NOT EXISTS articles (
+    url        TEXT PRIMARY KEY,
+    title      TEXT,
+    content    TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# External-content FTS5 tables: the text lives once in questions/articles and
+# the triggers below keep the search index in step with every change.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    question, answers, hint, source_title,
+    content='questions', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO questions_fts(rowid, question, answers, hint, source_title)
+    VALUES (new.id, new.question, new.answers, new.hint, new.source_title);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+    INSERT INTO questions_fts(questions_fts, rowid, question, answers, hint, source_title)
+    VALUES ('delete', old.id, old.question, old.answers, old.hint, old.source_title);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE ON questions BEGIN
+    INSERT INTO questions_fts(questions_fts, rowid, question, answers, hint, source_title)
+    VALUES ('delete', old.id, old.question, old.answers, old.hint, old.source_title);
+    INSERT INTO questions_fts(rowid, question, answers, hint, source_title)
+    VALUES (new.id, new.question, new.answers, new.hint, new.source_title);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, content,
+    content='articles', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, content)
+    VALUES ('delete', old.rowid, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, content)
+    VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO articles_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+"""
+
+# bm25 column weights for questions_fts: question, answers, hint, source_title
+SEARCH_WEIGHTS = (10.0, 5.0, 2.0, 3.0)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_COLUMNS = "id, difficulty, question, answers, correct_index, hint, source_title, source_url"
+
+_INSERT_SQL = """
+    INSERT OR IGNORE INTO questions
+        (difficulty, question, answers, correct_index, hint,
+         source_title, source_url, content_hash, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _row_to_record(row):
+    return QuestionRecord(
+        question=row[2],
+        answers=json.loads(row[3]),
+        correct_index=row[4],
+        hint=row[5],
+        source_title=row[6],
+        difficulty=row[1],
+        source_url=row[7],
+    )
+
+
+@dataclass
+class SearchHit:
+    id: int
+    score: float            # bm25 score, lower = better match
+    snippet: str            # matching text with [brackets] around the hits
+    question: QuestionRecord
+
+
+@dataclass
+class ArticleHit:
+    url: str
+    title: str
+    score: float
+    snippet: str
+
+
+def to_fts_query(text, prefix=True):
+    """
+    Turn free text into a safe FTS5 query: every word must match, and the last
+    word also matches as a prefix ("Mate" finds "Mateer"). Quoting each word
+    means user input like OU's or "C++" can't break the FTS query syntax.
+    """
+    words = _WORD.findall(text)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+class QuestionStore:
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._all_conns = []
+        self._conns_lock = threading.Lock()
+        # difficulty -> (MAX(id) when built, sorted array of ids); see ids()
+        self._ids = {}
+        self._ids_lock = threading.Lock()
+
+        conn = self._conn()
+        with conn:
+            conn.executescript(SCHEMA)
+        self.has_search = self._install_search(conn)
+
+    def _install_search(self, conn):
+        """Create the FTS5 index + triggers. Returns False if SQLite lacks FTS5."""
+        existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'questions_fts'"
+        ).fetchone() is not None
+        try:
+            with conn:
+                conn.executescript(SEARCH_SCHEMA)
+                if not existed:
+                    # Bank created before search existed: index what's already there (once)
+                    conn.execute("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')")
+                    conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            if "fts5" not in str(e):
+                raise
+            print("[QuestionStore] SQLite was built without FTS5; search is disabled.")
+            return False
+        return True
+
+    # -------- connections --------
+
+    def _conn(self):
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # In WAL mode NORMAL is still crash-safe, just skips some fsyncs
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._all_conns.append(conn)
+        return conn
+
+    def release(self):
+        """
+        Close the calling thread's connection. Worker threads call this when
+        their work ends, so short-lived threads don't each leave a connection
+        (and its WAL file handles) open until close().
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._conns_lock:
+            if conn in self._all_conns:     # close() may have got to it first
+                self._all_conns.remove(conn)
+        conn.close()
+
+    def close(self):
+        """Close the connections this store has opened (call once, at shutdown)."""
+        with self._conns_lock:
+            for conn in self._all_conns:
+                try:
+                    conn.close()
+                except sqlite3.ProgrammingError:
+                    # Opened on another thread; SQLite cleans it up when that thread exits
+                    pass
+            self._all_conns = []
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------- writing --------
+
+    def add_questions(self, questions, difficulty=None):
+        """
+        Insert questions (dicts or QuestionRecords) in one transaction.
+        `difficulty` fills in questions that don't carry their own.
+        Questions already in the store (same content hash) are skipped.
+        Returns how many new rows were inserted.
+        """
+        now = time.time()
+        rows = []
+        for q in questions:
+            q = QuestionRecord.from_dict(q)
+            level = q.difficulty or difficulty
+            if not level:
+                raise ValueError("Question has no difficulty; pass difficulty=...")
+            rows.append((
+                level, q.question, json.dumps(list(q.answers), ensure_ascii=False),
+                q.correct_index, q.hint or "", q.source_title, q.source_url,
+                q.content_hash(), now,
+            ))
+
+        conn = self._conn()
+        with conn:
+            # rowcount sums the rows actually inserted (ignored duplicates and
+            # search-index trigger writes don't count)
+            cur = conn.executemany(_INSERT_SQL, rows)
+        return max(cur.rowcount, 0)
+
+    def import_json(self, path, difficulty=None, batch_size=5000):
+        """
+        Import a .json/.jsonl bank (e.g. trivia_questions.json), streamed in
+        batches so big files don't have to fit in memory. Returns rows added.
+        """
+        from question_stream import iter_questions
+
+        added = 0
+        batch = []
+        for q in iter_questions(path):
+            batch.append(q)
+            if len(batch) >= batch_size:
+                added += self.add_questions(batch, difficulty)
+                batch = []
+        if batch:
+            added += self.add_questions(batch, difficulty)
+        return added
+
+    def add_article(self, url, title, content):
+        """Save (or refresh) the scraped text of an article so it can be searched."""
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO articles (url, title, content, fetched_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    title = excluded.title, content = excluded.content, fetched_at = excluded.fetched_at
+                """,
+                (url, title, content, time.time()),
+            )
+
+    def delete_source(self, source_url):
+        """
+        Remove every question generated from one article (e.g. a retracted story),
+        and the article text itself. Returns the number of questions deleted.
+        """
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("DELETE FROM questions WHERE source_url = ?", (source_url,))
+            conn.execute("DELETE FROM articles WHERE url = ?", (source_url,))
+        self._forget_ids()
+        return cur.rowcount
+
+    # -------- reading --------
+
+    def count(self, difficulty=None):
+        conn = self._conn()
+        if difficulty is None:
+            return conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+        return conn.execute(
+            "SELECT COUNT(*) FROM questions WHERE difficulty = ?", (difficulty,)
+        ).fetchone()[0]
+
+    def counts(self):
+        """{difficulty: number of questions}"""
+        rows = self._conn().execute(
+            "SELECT difficulty, COUNT(*) FROM questions GROUP BY difficulty"
+        ).fetchall()
+        return dict(rows)
+
+    def newest_created_at(self, difficulty=None):
+        """Timestamp of the most recently added question (None if there are none)."""
+        conn = self._conn()
+        if difficulty is None:
+            return conn.execute("SELECT MAX(created_at) FROM questions").fetchone()[0]
+        return conn.execute(
+            "SELECT MAX(created_at) FROM questions WHERE difficulty = ?", (difficulty,)
+        ).fetchone()[0]
+
+    def questions(self, difficulty=None, limit=None, newest_first=False):
+        sql = f"SELECT {_COLUMNS} FROM questions"
+        params = []
+        if difficulty is not None:
+            sql += " WHERE difficulty = ?"
+            params.append(difficulty)
+        sql += " ORDER BY id DESC" if newest_first else " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_row_to_record(r) for r in self._conn().execute(sql, params)]
+
+    def by_source(self, source_url):
+        rows = self._conn().execute(
+            f"SELECT {_COLUMNS} FROM questions WHERE source_url = ? ORDER BY id", (source_url,)
+        )
+        return [_row_to_record(r) for r in rows]
+
+    def sources(self, difficulty):
+        """Set of article URLs that already have a question at this difficulty."""
+        rows = self._conn().execute(
+            "SELECT DISTINCT source_url FROM questions WHERE difficulty = ? AND source_url IS NOT NULL",
+            (difficulty,),
+        )
+        return {r[0] for r in rows}
+
+    def article(self, url):
+        """(title, content) of a saved article, or None if it was never scraped."""
+        return self._conn().execute(
+            "SELECT title, content FROM articles WHERE url = ?", (url,)
+        ).fetchone()
+
+    def ids(self, difficulty=None):
+        """
+        Sorted array of question ids for a difficulty (all questions for None).
+
+        Built with one index-only scan of (difficulty, id) and cached. Each
+        call checks MAX(id) for the difficulty (one index seek): if it moved
+        up, only the new ids are read and appended (new rows always get
+        higher ids), so a generator inserting one question at a time costs
+        each sample() an index range read, not a rescan. Deletes drop the
+        cache (or are noticed when a picked id has gone, see by_ids) and the
+        next call rebuilds it.
+        """
+        where, params = ("", ()) if difficulty is None else ("WHERE difficulty = ?", (difficulty,))
+        conn = self._conn()
+        newest = conn.execute(f"SELECT MAX(id) FROM questions {where}", params).fetchone()[0]
+        with self._ids_lock:
+            cached = self._ids.get(difficulty)
+            if cached is not None and cached[0] == newest:
+                return cached[1]
+            if cached is not None and cached[0] is not None and newest is not None and newest > cached[0]:
+                ids = cached[1]
+                ids.extend(r[0] for r in conn.execute(
+                    f"SELECT id FROM questions {where} {'AND' if where else 'WHERE'} id > ? ORDER BY id",
+                    params + (cached[0],),
+                ))
+                self._ids[difficulty] = (newest, ids)
+                return ids
+        ids = array("q", (r[0] for r in conn.execute(f"SELECT id FROM questions {where} ORDER BY id", params)))
+        with self._ids_lock:
+            self._ids[difficulty] = (newest, ids)
+        return ids
+
+    def _forget_ids(self):
+        with self._ids_lock:
+            self._ids.clear()
+
+    def by_ids(self, question_ids, difficulty=None):
+        """
+        Questions for these ids, in the same order. Ids that no longer exist
+        (or, with `difficulty`, now belong to another difficulty) are left out.
+        """
+        question_ids = list(question_ids)
+        where, params = ("", ()) if difficulty is None else ("AND difficulty = ?", (difficulty,))
+        found = {}
+        conn = self._conn()
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(question_ids), 500):
+            chunk = question_ids[start:start + 500]
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM questions WHERE id IN ({', '.join('?' * len(chunk))}) {where}",
+                tuple(chunk) + params,
+            )
+            for row in rows:
+                found[row[0]] = _row_to_record(row)
+        return [found[i] for i in question_ids if i in found]
+
+    def sample(self, difficulty=None, k=1, rng=random):
+        """
+        Up to `k` distinct random questions, each equally likely.
+
+        Picks k positions in the difficulty's id array (see ids()) and fetches
+        those rows by primary key. Positions are dense, so gaps in the id
+        sequence (deleted rows, or other difficulties' rows in between) don't
+        make any question more likely than another.
+        """
+        for _ in range(2):
+            ids = self.ids(difficulty)
+            picked = [ids[i] for i in rng.sample(range(len(ids)), min(k, len(ids)))]
+            questions = self.by_ids(picked, difficulty)
+            if len(questions) == len(picked):
+                return questions
+            # Some rows were deleted since the ids were cached: reload once
+            self._forget_ids()
+        return questions
+
+    # -------- full-text search --------
+
+    def _require_search(self):
+        if not self.has_search:
+            raise RuntimeError("Full-text search needs an SQLite build with FTS5.")
+
+    def search(self, text, limit=20, difficulty=None, raw=False):
+        """
+        Ranked full-text search over question, answers, hint and source_title.
+
+        `text` is free text ("bizzell library"); pass raw=True to use FTS5
+        syntax directly ('mateer AND NOT lsu', 'source_title:bizzell').
+        Returns a list of SearchHit, best match first.
+        """
+        self._require_search()
+        query = text if raw else to_fts_query(text)
+        if not query:
+            return []
+
+        sql = f"""
+            SELECT q.{_COLUMNS.replace(", ", ", q.")},
+                   bm25(questions_fts, {", ".join(str(w) for w in SEARCH_WEIGHTS)}) AS score,
+                   snippet(questions_fts, -1, '[', ']', '…', 12)
+            FROM questions_fts
+            JOIN questions AS q ON q.id = questions_fts.rowid
+            WHERE questions_fts MATCH ?
+        """
+        params = [query]
+        if difficulty is not None:
+            sql += " AND q.difficulty = ?"
+            params.append(difficulty)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        return [
+            SearchHit(id=row[0], score=row[8], snippet=row[9], question=_row_to_record(row))
+            for row in self._conn().execute(sql, params)
+        ]
+
+    def search_articles(self, text, limit=20, raw=False):
+        """Ranked full-text search over the scraped article titles and text."""
+        self._require_search()
+        query = text if raw else to_fts_query(text)
+        if not query:
+            return []
+
+        rows = self._conn().execute(
+            """
+            SELECT a.url, a.title, bm25(articles_fts, 5.0, 1.0) AS score,
+                   snippet(articles_fts, 1, '[', ']', '…', 16)
+            FROM articles_fts
+            JOIN articles AS a ON a.rowid = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+            ORDER BY score LIMIT ?
+            """,
+            (query, limit),
+        )
+        return [ArticleHit(*row) for row in rows]
+
+
+def _bench_search(db_path, count):
+    """Fill a throwaway store with `count` questions and time some searches."""
+    # A few real OU terms mixed into a larger vocabulary, so each search term
+    # matches a realistic slice of the bank (hundreds of rows, not half of it)
+    words = ["Bizzell", "Mateer", "Sooners", "Norman", "library", "playoff", "LSU",
+             "Catlett", "parking", "housing", "recruiting", "Venables", "stadium"]
+    words += [f"term{n}" for n in range(3000)]
+    rng = random.Random(1)
+    store = QuestionStore(db_path)
+    batch = []
+    for n in range(count):
+        picked = rng.sample(words, 3)
+        batch.append({
+            "question": f"Question {n} about {picked[0]} and {picked[1]}?",
+            "answers": [f"{picked[2]} {i}" for i in range(4)],
+            "correct_index": 0,
+            "hint": f"Think about {picked[1]}.",
+            "source_title": f"{picked[0]} story {n % 1000}",
+            "difficulty": ("Easy", "Medium", "Hard")[n % 3],
+        })
+        if len(batch) == 10000:
+            store.add_questions(batch)
+            batch = []
+    if batch:
+        store.add_questions(batch)
+
+    for query in ("Bizzell", "mateer", "Catlett", "Venab"):
+        started = time.perf_counter()
+        hits = store.search(query, limit=20)
+        print(f"{query!r:>20}: {len(hits)} hits in {(time.perf_counter() - started) * 1000:.1f} ms")
+    store.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLite question bank tools.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="import a .json/.jsonl bank")
+    imp.add_argument("path", nargs="?", default="trivia_questions.json")
+    imp.add_argument("--difficulty", choices=["Easy", "Medium", "Hard"], default=None,
+                     help="difficulty for questions that don't have one")
+
+    sub.add_parser("stats", help="questions per difficulty")
+
+    samp = sub.add_parser("sample", help="print random questions")
+    samp.add_argument("difficulty", nargs="?", default=None)
+    samp.add_argument("-k", type=int, default=5)
+
+    find = sub.add_parser("search", help="full-text search questions (or articles)")
+    find.add_argument("query")
+    find.add_argument("--difficulty", default=None)
+    find.add_argument("--limit", type=int, default=20)
+    find.add_argument("--articles", action="store_true", help="search article text instead")
+    find.add_argument("--raw", action="store_true", help="query is FTS5 syntax")
+
+    bench = sub.add_parser("bench-search", help="time searches on a generated bank")
+    bench.add_argument("--count", type=int, default=200_000)
+
+    args = parser.parse_args()
+    if args.command == "bench-search":
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as folder:
+            _bench_search(os.path.join(folder, "bench.db"), args.count)
+        raise SystemExit(0)
+
+    store = QuestionStore(args.db)
+
+    if args.command == "import":
+        added = store.import_json(args.path, args.difficulty)
+        print(f"[QuestionStore] Imported {added} new questions from {args.path} → {args.db}")
+    elif args.command == "stats":
+        for level, n in sorted(store.counts().items()):
+            print(f"{level:>6}: {n}")
+        print(f" Total: {store.count()}")
+    elif args.command == "sample":
+        for q in store.sample(args.difficulty, args.k):
+            print(f"[{q.difficulty}] {q.question}")
+    elif args.articles:
+        for hit in store.search_articles(args.query, args.limit, args.raw):
+            print(f"{hit.score:8.2f}  {hit.title}\n          {hit.url}\n          {hit.snippet}")
+    else:
+        for hit in store.search(args.query, args.limit, args.difficulty, args.raw):
+            q = hit.question
+            print(f"{hit.score:8.2f}  [{q.difficulty}] #{hit.id} {q.question}\n          {hit.snippet}")
+
+    store.close()
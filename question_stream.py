@@ -0,0 +1,202 @@
+"""
+Incremental reader for question bank files.
+
+json.load reads the whole {"questions": [...]} document into memory before
+you can look at a single question. iter_questions walks the array a chunk at
+a time instead and yields one question dict at a time, so memory stays bounded
+by the size of one question (plus one read chunk), no matter how big the
+file is.
+
+    for q in iter_questions("trivia_questions.json", difficulty="Hard", limit=10):
+        ...
+
+Supported layouts (same as binary_bank.load_json_questions):
+  - {"questions": [ {...}, {...} ]}   (what JSONBuilder.save_all writes)
+  - [ {...}, {...} ]                  (a bare array)
+  - .jsonl                            (one question per line)
+"""
+import json
+import random
+
+CHUNK_SIZE = 64 * 1024
+
+# A question is well under 1 KB. If this much text after the read position
+# still doesn't decode, the file is malformed: stop instead of reading to EOF.
+MAX_VALUE_CHARS = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def _matches(q, difficulty, source_title):
+    if difficulty is not None and q.get("difficulty") != difficulty:
+        return False
+    if source_title is not None and q.get("source_title") != source_title:
+        return False
+    return True
+
+
+def _iter_jsonl(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class _Buffer:
+    """Text read from a file `chunk_size` at a time, with a read position."""
+
+    def __init__(self, f, chunk_size, max_value=None):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.max_value = MAX_VALUE_CHARS if max_value is None else max_value
+        self.buf = ""
+        self.pos = 0
+        self.dropped = 0    # characters of the file before buf[0]
+        self.eof = False
+
+    def fill(self):
+        # Drop what's been consumed so the buffer doesn't grow with the file
+        self.dropped += self.pos
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        chunk = self.f.read(self.chunk_size)
+        if chunk:
+            self.buf += chunk
+        else:
+            self.eof = True
+
+    def peek(self, skip=_WHITESPACE):
+        """Next character that isn't in `skip` (consuming those), or "" at end of file."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in skip:
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, char, what):
+        if self.peek() != char:
+            raise ValueError(f"Expected {what} in question bank file.")
+        self.pos += 1
+
+    def decode(self):
+        """Decode the JSON value at the read position, reading more until it is complete."""
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # Most likely the value is cut off at the end of the buffer,
+                # unless there is already more text than any value needs
+                if self.eof or len(self.buf) - self.pos > self.max_value:
+                    raise json.JSONDecodeError(
+                        f"{e.msg} at file offset {self.dropped + e.pos}", self.buf, e.pos
+                    ) from None
+                self.fill()
+                continue
+            if end == len(self.buf) and not self.eof:
+                # A number (or literal) may carry on in the next chunk
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(f, chunk_size, max_value=None):
+    """Yield each element of the questions array, reading `chunk_size` at a time."""
+    reader = _Buffer(f, chunk_size, max_value)
+
+    # 1. Find the opening "[" of the questions array: either the whole file
+    #    is an array, or it's the value of the top-level "questions" key.
+    #    Other top-level values are decoded and skipped, so a "questions" key
+    #    nested inside them (or the word in a string) is never mistaken for it.
+    first = reader.peek()
+    if first == "{":
+        reader.pos += 1
+        while True:
+            if reader.peek() != '"':
+                raise ValueError("No questions array found in file.")
+            key = reader.decode()
+            reader.expect(":", "':' after a key")
+            reader.peek()
+            if key == "questions":
+                break
+            reader.decode()
+            if reader.peek() == ",":
+                reader.pos += 1
+    if reader.peek() != "[":
+        raise ValueError("No questions array found in file.")
+    reader.pos += 1
+
+    # 2. Decode one element at a time
+    while True:
+        # Skip whitespace and the commas between elements
+        char = reader.peek(_WHITESPACE + ",")
+        if char == "":
+            raise ValueError("Questions array is not closed.")
+        if char == "]":
+            return
+        yield reader.decode()
+
+
+def iter_questions(path, difficulty=None, source_title=None, limit=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield question dicts from `path` one at a time.
+
+    difficulty / source_title only let matching questions through, and `limit`
+    stops reading once that many have been yielded. Breaking out of the loop
+    early also stops reading; the file is closed either way.
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            source = _iter_jsonl(f)
+        else:
+            source = _iter_array(f, chunk_size)
+
+        for q in source:
+            if not _matches(q, difficulty, source_title):
+                continue
+            yield q
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+
+def sample_questions(path, k, difficulty=None, source_title=None, rng=random):
+    """
+    Pick `k` random questions in one pass with reservoir sampling,
+    holding at most `k` questions in memory.
+    """
+    reservoir = []
+    for seen, q in enumerate(iter_questions(path, difficulty, source_title)):
+        if seen < k:
+            reservoir.append(q)
+        else:
+            slot = rng.randint(0, seen)
+            if slot < k:
+                reservoir[slot] = q
+    return reservoir
+
+
+def random_question(path, difficulty=None, source_title=None, rng=random):
+    """One random matching question, or None if nothing matches."""
+    picked = sample_questions(path, 1, difficulty, source_title, rng)
+    return picked[0] if picked else None
+
+
+if __name__ == "__main__":
+    # Quick check: python question_stream.py [path] [difficulty]
+    import sys
+
+    bank_path = sys.argv[1] if len(sys.argv) > 1 else "trivia_questions.json"
+    wanted = sys.argv[2] if len(sys.argv) > 2 else None
+
+    total = sum(1 for _ in iter_questions(bank_path, difficulty=wanted))
+    print(f"{total} matching questions in {bank_path}")
+    q = random_question(bank_path, difficulty=wanted)
+    if q:
+        print("Random pick:", q["question"])
@@ -0,0 +1,319 @@
+"""
+Single-pass validator for question banks.
+
+Before this, checks were spread around: parse_openai_output checks the model
+format, add_question re-checks correct_index, and QuizScreen.load_question
+just trusts whatever it gets. QuestionValidator puts every rule in one place:
+
+    error   not_an_object    the entry isn't a question at all (null, a list, a string...)
+    error   missing_field    question/answers/correct_index missing or wrong type
+    error   answer_count     not exactly `answer_count` choices
+    error   index_range      correct_index outside the answers list
+    error   empty_text       blank question or blank answer choice
+    error   duplicate_answer two choices that read the same
+    error   too_long         text longer than the UI can show
+    warning hint_leak        the hint gives away the correct answer
+
+Limits and patterns are prepared once in __init__ (DEFAULT_VALIDATOR is built
+at import), so validating is one pass over the bank with no per-call setup.
+For very large files, validate_file() spreads chunks over a process pool.
+
+    report = DEFAULT_VALIDATOR.validate_bank(questions)
+    print(report.summary())
+
+    python question_validator.py trivia_questions.json
+"""
+import re
+from dataclasses import asdict, dataclass, field
+from typing import List
+
+# Limits picked so text still fits the QuizScreen labels/buttons
+ANSWER_COUNT = 4
+MAX_QUESTION_LENGTH = 300
+MAX_ANSWER_LENGTH = 150
+MAX_HINT_LENGTH = 250
+MAX_SOURCE_TITLE_LENGTH = 300
+
+# Answers shorter than this ("Yes", "10") show up in hints by accident too
+# often to be flagged as leaks
+MIN_LEAK_LENGTH = 4
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    index: int       # position of the question in the bank
+    field: str       # which field the problem is in
+    code: str        # short machine-readable name (see module docstring)
+    message: str     # human-readable explanation
+    severity: str = "error"
+
+
+@dataclass
+class ValidationReport:
+    total: int = 0
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def errors(self):
+        return [i for i in self.issues if i.severity == "error"]
+
+    @property
+    def warnings(self):
+        return [i for i in self.issues if i.severity == "warning"]
+
+    @property
+    def invalid_indexes(self):
+        """Positions of questions with at least one error."""
+        return sorted({i.index for i in self.errors})
+
+    @property
+    def valid_count(self):
+        return self.total - len(self.invalid_indexes)
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def counts_by_code(self):
+        counts = {}
+        for issue in self.issues:
+            counts[issue.code] = counts.get(issue.code, 0) + 1
+        return counts
+
+    def merge(self, other):
+        self.total += other.total
+        self.issues.extend(other.issues)
+
+    def summary(self):
+        text = (
+            f"{self.total} questions checked: {self.valid_count} valid, "
+            f"{len(self.invalid_indexes)} invalid, {len(self.warnings)} warnings"
+        )
+        counts = self.counts_by_code()
+        if counts:
+            text += " (" + ", ".join(f"{code}: {n}" for code, n in sorted(counts.items())) + ")"
+        return text
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "valid": self.valid_count,
+            "invalid_indexes": self.invalid_indexes,
+            "counts": self.counts_by_code(),
+            "issues": [asdict(i) for i in self.issues],
+        }
+
+
+def _normalize(text):
+    """Lowercase and collapse punctuation/whitespace: 'John  Mateer!' -> 'john mateer'."""
+    return _NON_WORD.sub(" ", text).strip().lower()
+
+
+class QuestionValidator:
+    def __init__(
+        self,
+        answer_count=ANSWER_COUNT,
+        max_question_length=MAX_QUESTION_LENGTH,
+        max_answer_length=MAX_ANSWER_LENGTH,
+        max_hint_length=MAX_HINT_LENGTH,
+        max_source_title_length=MAX_SOURCE_TITLE_LENGTH,
+        min_leak_length=MIN_LEAK_LENGTH,
+    ):
+        self.answer_count = answer_count
+        self.min_leak_length = min_leak_length
+
+        # (field, limit) pairs for the optional text fields
+        self._length_limits = (
+            ("question", max_question_length),
+            ("hint", max_hint_length),
+            ("source_title", max_source_title_length),
+        )
+        self.max_answer_length = max_answer_length
+
+    def settings(self):
+        """Constructor arguments, so worker processes can build the same validator."""
+        return {
+            "answer_count": self.answer_count,
+            "max_question_length": self._length_limits[0][1],
+            "max_answer_length": self.max_answer_length,
+            "max_hint_length": self._length_limits[1][1],
+            "max_source_title_length": self._length_limits[2][1],
+            "min_leak_length": self.min_leak_length,
+        }
+
+    # -------- one question --------
+
+    def validate_question(self, q, index=0):
+        """Return a list of ValidationIssue for one question (dict or QuestionRecord)."""
+        issues = []
+
+        def add(field_name, code, message, severity="error"):
+            issues.append(ValidationIssue(index, field_name, code, message, severity))
+
+        if not hasattr(q, "get"):
+            # null, list, string...: nothing else can be checked
+            add("question", "not_an_object", f"expected a question object, got {type(q).__name__}")
+            return issues
+
+        question = q.get("question")
+        answers = q.get("answers")
+        correct_index = q.get("correct_index")
+        hint = q.get("hint") or ""
+
+        # Structure first; the other checks need these to be the right type
+        if not isinstance(question, str):
+            add("question", "missing_field", "question text is missing")
+        if not isinstance(answers, (list, tuple)) or not all(isinstance(a, str) for a in answers):
+            add("answers", "missing_field", "answers must be a list of strings")
+            answers = None
+        if not isinstance(correct_index, int) or isinstance(correct_index, bool):
+            add("correct_index", "missing_field", "correct_index must be an integer")
+            correct_index = None
+        if not isinstance(hint, str):
+            add("hint", "missing_field", "hint must be a string")
+            hint = ""
+
+        if isinstance(question, str) and not question.strip():
+            add("question", "empty_text", "question text is empty")
+
+        for field_name, limit in self._length_limits:
+            value = q.get(field_name)
+            if isinstance(value, str) and len(value) > limit:
+                add(field_name, "too_long", f"{field_name} is {len(value)} characters (max {limit})")
+
+        if answers is None:
+            return issues
+
+        if len(answers) != self.answer_count:
+            add("answers", "answer_count", f"expected {self.answer_count} answers, got {len(answers)}")
+
+        if correct_index is not None and not 0 <= correct_index < len(answers):
+            add("correct_index", "index_range", f"correct_index {correct_index} is outside 0–{len(answers) - 1}")
+            correct_index = None
+
+        seen = {}
+        for i, answer in enumerate(answers):
+            key = _normalize(answer)
+            if not key:
+                add("answers", "empty_text", f"answer {i} is empty")
+                continue
+            if key in seen:
+                add("answers", "duplicate_answer", f"answers {seen[key]} and {i} are the same")
+            else:
+                seen[key] = i
+            if len(answer) > self.max_answer_length:
+                add("answers", "too_long",
+                    f"answer {i} is {len(answer)} characters (max {self.max_answer_length})")
+
+        if correct_index is not None and hint:
+            correct = _normalize(answers[correct_index])
+            if len(correct) >= self.min_leak_length and f" {correct} " in f" {_normalize(hint)} ":
+                add("hint", "hint_leak", "hint contains the correct answer", "warning")
+
+        return issues
+
+    def errors_for(self, q):
+        return [i for i in self.validate_question(q) if i.severity == "error"]
+
+    # -------- whole bank --------
+
+    def validate_bank(self, questions, start_index=0):
+        """Validate every question in one pass and return a ValidationReport."""
+        report = ValidationReport()
+        validate = self.validate_question
+        for index, q in enumerate(questions, start_index):
+            report.total += 1
+            issues = validate(q, index)
+            if issues:
+                report.issues.extend(issues)
+        return report
+
+    def filter_valid(self, questions):
+        """Split off the questions that have errors. Returns (valid_questions, report)."""
+        questions = list(questions)
+        report = self.validate_bank(questions)
+        bad = set(report.invalid_indexes)
+        return [q for i, q in enumerate(questions) if i not in bad], report
+
+
+DEFAULT_VALIDATOR = QuestionValidator()
+
+
+# -------- process pool for huge banks --------
+
+_worker_validator = None
+
+
+def _init_worker(settings):
+    global _worker_validator
+    _worker_validator = QuestionValidator(**settings)
+
+
+def _validate_chunk(job):
+    start_index, chunk = job
+    return _worker_validator.validate_bank(chunk, start_index)
+
+
+def _chunks(questions, chunk_size):
+    chunk = []
+    start = 0
+    for q in questions:
+        chunk.append(q)
+        if len(chunk) >= chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def validate_file(path, validator=DEFAULT_VALIDATOR, processes=None, chunk_size=5000):
+    """
+    Validate a .json/.jsonl bank file.
+
+    The file is streamed (question_stream) and checked in chunks. With
+    `processes` > 1 the chunks go to a process pool, so a huge bank doesn't
+    hold up the caller's process; processes=None or 1 checks inline.
+    """
+    from question_stream import iter_questions
+
+    questions = iter_questions(path)
+    report = ValidationReport()
+
+    if not processes or processes <= 1:
+        for start, chunk in _chunks(questions, chunk_size):
+            report.merge(validator.validate_bank(chunk, start))
+        return report
+
+    import multiprocessing
+
+    with multiprocessing.Pool(processes, _init_worker, (validator.settings(),)) as pool:
+        for part in pool.imap(_validate_chunk, _chunks(questions, chunk_size)):
+            report.merge(part)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Validate a question bank file.")
+    parser.add_argument("path", nargs="?", default="trivia_questions.json")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = validate_file(args.path, processes=args.processes)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        for issue in result.issues:
+            print(f"[{issue.severity}] #{issue.index} {issue.field}: {issue.message}")
+        print(result.summary())
+    print(f"Checked in {elapsed_ms:.1f} ms")
@@ -0,0 +1,297 @@
+"""
+In-memory live ranks for the FastAPI game.
+
+The HTTP game wants "your rank right now" after every answer. Asking SQLite
+`COUNT(*) WHERE best > ?` per answer doesn't keep up, so ranks are answered
+from memory:
+
+    - RankIndex: a Fenwick tree (binary indexed tree) of player counts per
+      score. Scores are streaks, so they are small integers; anything above
+      MAX_SCORE shares the top bucket. Setting a score, "how many players
+      are ahead of me" and "which score holds the k-th player" are all
+      O(log MAX_SCORE). A dict per score holds the players for top-K reads.
+    - LiveRanks: one RankIndex per difficulty for a leaderboard period
+      ("all" by default), built from the SQLite leaderboard on first use and
+      rebuilt when the period's bucket rolls over (a new day or week).
+      offer() raises a player's best when their live streak passes it and
+      marks them dirty; a background thread flushes dirty players to the
+      leaderboard every FLUSH_INTERVAL seconds (and on close()).
+
+Ties share a rank (1, 2, 2, 4), like leaderboard.my_rank.
+
+    python rank_index.py --players 1000000 --updates 100000   -> benchmark
+"""
+import heapq
+import threading
+import time
+
+from leaderboard import period_bucket
+
+MAX_SCORE = 10_000
+
+# Seconds between flushes of raised bests to the leaderboard
+FLUSH_INTERVAL = 5.0
+
+
+class FenwickTree:
+    """Counts per index 0..size-1 with O(log n) point updates and prefix sums."""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    @classmethod
+    def from_counts(cls, counts):
+        """Build in O(n) from a list of counts."""
+        tree = cls(len(counts))
+        t = tree.tree
+        for i, c in enumerate(counts, 1):
+            t[i] += c
+            parent = i + (i & -i)
+            if parent <= tree.size:
+                t[parent] += t[i]
+        return tree
+
+    def add(self, index, delta):
+        i = index + 1
+        t = self.tree
+        while i <= self.size:
+            t[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index):
+        """Sum of counts at 0..index (0 for index < 0)."""
+        i = min(index, self.size - 1) + 1
+        total = 0
+        t = self.tree
+        while i > 0:
+            total += t[i]
+            i -= i & -i
+        return total
+
+    def find(self, k):
+        """Smallest index whose prefix sum reaches k (k >= 1), by binary lifting."""
+        pos = 0
+        step = 1 << self.size.bit_length()
+        t = self.tree
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and t[nxt] < k:
+                pos = nxt
+                k -= t[nxt]
+            step >>= 1
+        return pos
+
+
+class RankIndex:
+    def __init__(self, max_score=MAX_SCORE):
+        self.max_score = max_score
+        self.counts = FenwickTree(max_score + 1)
+        self.scores = {}       # player -> score
+        self.by_score = {}     # bucket -> {player: None} (insertion-ordered set)
+
+    @classmethod
+    def build(cls, scores, max_score=MAX_SCORE):
+        """Index from an iterable of (player, score), e.g. Leaderboard.scores()."""
+        index = cls(max_score)
+        counts = [0] * (max_score + 1)
+        for player, score in scores:
+            bucket = index._bucket(score)
+            index.scores[player] = score
+            index.by_score.setdefault(bucket, {})[player] = None
+            counts[bucket] += 1
+        index.counts = FenwickTree.from_counts(counts)
+        return index
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __contains__(self, player):
+        return player in self.scores
+
+    def _bucket(self, score):
+        return min(max(score, 0), self.max_score)
+
+    def set(self, player, score):
+        """Set a player's score (adding them if new)."""
+        old = self.scores.get(player)
+        new_bucket = self._bucket(score)
+        if old is not None:
+            old_bucket = self._bucket(old)
+            if old_bucket != new_bucket:
+                self._unlink(player, old_bucket)
+                self._link(player, new_bucket)
+        else:
+            self._link(player, new_bucket)
+        self.scores[player] = score
+
+    def remove(self, player):
+        score = self.scores.pop(player, None)
+        if score is not None:
+            self._unlink(player, self._bucket(score))
+
+    def _link(self, player, bucket):
+        self.by_score.setdefault(bucket, {})[player] = None
+        self.counts.add(bucket, 1)
+
+    def _unlink(self, player, bucket):
+        members = self.by_score[bucket]
+        del members[player]
+        if not members:
+            del self.by_score[bucket]
+        self.counts.add(bucket, -1)
+
+    def ahead_of(self, score):
+        """Players with a strictly higher score."""
+        return len(self.scores) - self.counts.prefix_sum(self._bucket(score))
+
+    def rank(self, player):
+        """1-based rank, or None if the player isn't on the board."""
+        score = self.scores.get(player)
+        if score is None:
+            return None
+        return self.ahead_of(score) + 1
+
+    def top_k(self, k):
+        """[(rank, player, score)] for the best k players (ties by name)."""
+        total = len(self.scores)
+        out = []
+        taken = 0
+        while len(out) < k and taken < total:
+            # The bucket holding the (taken + 1)-th best player, counting from the top
+            bucket = self.counts.find(total - taken)
+            members = self.by_score[bucket]
+            rank = taken + 1
+            for player in heapq.nsmallest(k - len(out), members):
+                out.append((rank, player, self.scores[player]))
+            taken += len(members)
+        return out
+
+
+class LiveRanks:
+    """Live ranks per difficulty for one leaderboard period, flushed back to SQLite."""
+
+    def __init__(self, leaderboard, period="all", flush_interval=FLUSH_INTERVAL, max_score=MAX_SCORE):
+        self.leaderboard = leaderboard
+        self.period = period
+        self.flush_interval = flush_interval
+        self.max_score = max_score
+
+        self._lock = threading.Lock()
+        self._indexes = {}     # difficulty -> (bucket, RankIndex)
+        self._dirty = {}       # (difficulty, day) -> (when, {player: best})
+        self._stop = threading.Event()
+        self._thread = None
+
+    def index(self, difficulty, when=None):
+        """
+        The difficulty's RankIndex for the period's current bucket, rebuilt
+        from the leaderboard the first time and whenever the bucket changes.
+        """
+        when = self.leaderboard.clock() if when is None else when
+        bucket = period_bucket(self.period, when)
+        with self._lock:
+            current = self._indexes.get(difficulty)
+            if current is not None and current[0] == bucket:
+                return current[1]
+            index = RankIndex.build(self.leaderboard.scores(self.period, difficulty, when), self.max_score)
+            self._indexes[difficulty] = (bucket, index)
+            return index
+
+    def offer(self, player, difficulty, score):
+        """Raise the player's best to `score` if it is higher; returns their rank."""
+        when = self.leaderboard.clock()
+        index = self.index(difficulty, when)
+        with self._lock:
+            if score > index.scores.get(player, -1):
+                index.set(player, score)
+                # Kept per day (the finest period) so a flush after midnight
+                # still lands on the boards of the day the best was set
+                _, bests = self._dirty.setdefault((difficulty, period_bucket("day", when)), (when, {}))
+                bests[player] = score
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="rank-flusher", daemon=True)
+                    self._thread.start()
+            return index.rank(player)
+
+    def rank(self, player, difficulty):
+        index = self.index(difficulty)
+        with self._lock:
+            return index.rank(player)
+
+    def top_k(self, difficulty, k=10):
+        index = self.index(difficulty)
+        with self._lock:
+            return index.top_k(k)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print("[LiveRanks] Flush failed:", e)
+
+    def flush(self):
+        """Write raised bests to the leaderboard (one transaction per difficulty and day). Returns rows written."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        batches = list(dirty.items())
+        written = 0
+        for n, ((difficulty, _), (when, bests)) in enumerate(batches):
+            try:
+                self.leaderboard.raise_bests(difficulty, list(bests.items()), when)
+            except Exception:
+                # Put this batch and the unwritten ones back for the next flush (newer offers win)
+                with self._lock:
+                    for key, (when, bests) in batches[n:]:
+                        _, pending = self._dirty.setdefault(key, (when, {}))
+                        for player, best in bests.items():
+                            pending[player] = max(best, pending.get(player, best))
+                raise
+            written += len(bests)
+        return written
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+
+# -------- benchmark --------
+
+def _bench(players, updates):
+    import random
+
+    rng = random.Random(1)
+    names = [f"player{i}" for i in range(players)]
+
+    started = time.perf_counter()
+    index = RankIndex.build((name, int(rng.expovariate(1 / 8))) for name in names)
+    print(f"Built index of {players:,} players in {time.perf_counter() - started:.2f} s")
+
+    picks = [(names[rng.randrange(players)], rng.randrange(60)) for _ in range(updates)]
+    started = time.perf_counter()
+    for name, score in picks:
+        index.set(name, score)
+        index.rank(name)
+    elapsed = time.perf_counter() - started
+    print(f"  update + rank: {updates / elapsed:12,.0f} per second ({elapsed * 1e6 / updates:.2f} us each)")
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        index.top_k(10)
+    print(f"  top_k(10)    : {(time.perf_counter() - started) * 1000:.2f} us each")
+
+    target = 10_000
+    print(f"  {'meets' if updates / elapsed >= target else 'MISSES'} the {target:,} updates/s target")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the in-memory rank index.")
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--updates", type=int, default=100_000)
+    args = parser.parse_args()
+    _bench(args.players, args.updates)
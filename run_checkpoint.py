@@ -0,0 +1,152 @@
+import json
+import os
+import time
+import uuid
+
+from jsonBuilder import atomic_write_json
+
+# Folder where every generation run keeps its checkpoint file
+CHECKPOINT_DIR = ".trivia_runs"
+
+# Per-article stages, in the order a generation run goes through them:
+#   scraped   -> title + article text downloaded
+#   generated -> raw 4-line OpenAI output received
+#   parsed    -> question built and added to the bank (article is done)
+#   skipped   -> article had no usable content (also done, nothing to retry)
+#   failed    -> something went wrong, a resumed run will retry this article
+STAGES = ("scraped", "generated", "parsed")
+DONE_STAGES = ("parsed", "skipped")
+
+
+class RunCheckpoint:
+    """
+    Progress file for one generation run, so a run that dies halfway
+    (killed process, laptop sleep, network drop) can pick up where it stopped.
+
+    The state is kept as a small JSON document:
+
+        {
+            "run_id": "20251201-153000-1a2b3c",
+            "difficulty": "Easy",
+            "created_at": 1764603000.0,
+            "updated_at": 1764603050.0,
+            "completed": false,
+            "background": false,
+            "articles": {
+                "<url>": {
+                    "stage": "parsed",
+                    "title": "...",
+                    "content": "...",
+                    "raw": "...",
+                    "question": {...}
+                }
+            }
+        }
+
+    Every stage change is written straight to disk with atomic_write_json,
+    so the checkpoint itself is never left half-written either.
+    """
+
+    def __init__(self, run_id=None, difficulty=None, checkpoint_dir=CHECKPOINT_DIR, background=False):
+        self.checkpoint_dir = checkpoint_dir
+        self.run_id = run_id or self.new_run_id()
+        self.path = os.path.join(checkpoint_dir, f"{self.run_id}.json")
+
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        else:
+            now = time.time()
+            self.state = {
+                "run_id": self.run_id,
+                "difficulty": difficulty,
+                "created_at": now,
+                "updated_at": now,
+                "completed": False,
+                "background": background,
+                "articles": {},
+            }
+
+    @staticmethod
+    def new_run_id():
+        """Readable, sortable and unique: <date>-<time>-<random suffix>."""
+        return time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+    @classmethod
+    def latest_incomplete(cls, difficulty, checkpoint_dir=CHECKPOINT_DIR):
+        """
+        Return the most recent unfinished run for this difficulty,
+        or None if there is nothing to resume. Background runs (see
+        startup_bank.BackgroundRefresher) are never resumed, so a player's
+        run can't end up sharing a checkpoint with one that is still going.
+        """
+        if not os.path.isdir(checkpoint_dir):
+            return None
+
+        # Run IDs start with a timestamp, so reverse name order = newest first
+        for name in sorted(os.listdir(checkpoint_dir), reverse=True):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(checkpoint_dir, name), "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if (state.get("difficulty") == difficulty and not state.get("completed")
+                    and not state.get("background")):
+                return cls(state["run_id"], difficulty, checkpoint_dir)
+        return None
+
+    # -------- queries --------
+
+    @property
+    def difficulty(self):
+        return self.state.get("difficulty")
+
+    @property
+    def completed(self):
+        return self.state.get("completed", False)
+
+    def article(self, url):
+        """Everything recorded so far for this URL (empty dict if nothing)."""
+        return self.state["articles"].get(url, {})
+
+    def stage_of(self, url):
+        return self.article(url).get("stage")
+
+    def is_done(self, url):
+        return self.stage_of(url) in DONE_STAGES
+
+    def urls_done(self):
+        return [url for url in self.state["articles"] if self.is_done(url)]
+
+    def questions(self, urls=None):
+        """
+        Questions produced so far. If `urls` is given, they come back in
+        that order, so a resumed run keeps the original article order.
+        """
+        order = urls if urls is not None else list(self.state["articles"])
+        result = []
+        for url in order:
+            q = self.article(url).get("question")
+            if self.stage_of(url) == "parsed" and q:
+                result.append(q)
+        return result
+
+    # -------- updates --------
+
+    def record(self, url, stage, **data):
+        """Move an article to `stage`, store any extra fields, and save."""
+        entry = self.state["articles"].setdefault(url, {})
+        entry.update(data)
+        entry["stage"] = stage
+        self.save()
+
+    def mark_complete(self):
+        self.state["completed"] = True
+        self.save()
+
+    def save(self):
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        self.state["updated_at"] = time.time()
+        atomic_write_json(self.path, self.state, indent=2)
@@ -0,0 +1,301 @@
+"""
+Per-player "already seen" filter that survives between sessions.
+
+Nothing remembered which questions a player had answered, so daily players
+kept getting the same ones. Keeping their full history would grow forever;
+SeenFilter keeps a Bloom filter of question content hashes instead:
+
+    - Keys are QuestionRecord.content_hash(), which is the same for a question
+      in every bank format and across regenerations of the bank.
+    - A Bloom filter never misses a question that was added. It can wrongly
+      report an unseen question as seen: about `fp_rate` per generation
+      (1% by default), so up to twice that with both generations full. For
+      the quiz that only means a question is skipped.
+    - Two generations: once the current filter holds `capacity` questions,
+      the older one is dropped and a new one starts. The filter remembers
+      between `capacity` and 2 x `capacity` recent answers and never grows.
+      With the defaults (4,000 per generation at 1%) that is about 9.4 KB per
+      player however many questions they answer. Very old questions come
+      back eventually, so a small bank never runs dry.
+    - SeenFilterStore saves one blob per player in SQLite (next to the
+      question bank by default), written behind by a background thread so
+      the Tk thread never waits on the disk.
+
+    seen = SeenFilterStore().load("sujal")
+    sampler = QuestionSampler(store, "Hard", seen=seen)   # skips what sujal has seen
+    seen.add(question)
+    SeenFilterStore().save("sujal", seen)
+
+    python seen_filter.py --answers 50000   -> memory and false-positive check
+"""
+import atexit
+import math
+import sqlite3
+import struct
+import threading
+import time
+
+from question_record import QuestionRecord
+
+DEFAULT_CAPACITY = 4000
+DEFAULT_FP_RATE = 0.01
+
+# Seconds between background writes of saved filters
+FLUSH_INTERVAL = 2.0
+
+DEFAULT_DB_PATH = "trivia_bank.db"
+
+MAGIC = b"OUSF"
+VERSION = 1
+
+# magic, version, capacity, fp_rate, bits per generation, hashes, count (current), count (previous)
+HEADER = struct.Struct("<4sHIdIHII")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_filters (
+    player      TEXT PRIMARY KEY,
+    data        BLOB NOT NULL,
+    updated_at  REAL NOT NULL
+);
+"""
+
+
+def _hash_pair(key):
+    """Two 64-bit hashes taken from a content hash (128 bits of sha256, in hex)."""
+    if not isinstance(key, str):
+        key = QuestionRecord.from_dict(key).content_hash()
+    h1 = int(key[:16], 16)
+    h2 = int(key[16:32], 16) | 1   # odd, so the probe positions don't repeat early
+    return h1, h2
+
+
+def filter_size(capacity, fp_rate):
+    """(bits, hash functions) for a Bloom filter of `capacity` keys at `fp_rate`."""
+    bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    def __init__(self, num_bits, num_hashes, data=None, count=0):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8) if data is None else bytearray(data)
+        self.count = count
+
+    def _positions(self, key):
+        h1, h2 = _hash_pair(key)
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class SeenFilter:
+    def __init__(self, capacity=DEFAULT_CAPACITY, fp_rate=DEFAULT_FP_RATE):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.num_bits, self.num_hashes = filter_size(capacity, fp_rate)
+        self.current = BloomFilter(self.num_bits, self.num_hashes)
+        self.previous = BloomFilter(self.num_bits, self.num_hashes)
+
+    def add(self, question):
+        """Remember a question (a question dict/record or its content hash)."""
+        key = question if isinstance(question, str) else QuestionRecord.from_dict(question).content_hash()
+        if key in self.current:
+            return
+        if self.current.count >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter(self.num_bits, self.num_hashes)
+        self.current.add(key)
+
+    def __contains__(self, question):
+        key = question if isinstance(question, str) else QuestionRecord.from_dict(question).content_hash()
+        return key in self.current or key in self.previous
+
+    def __len__(self):
+        """Questions remembered right now (approximate: repeats within a generation count once)."""
+        return self.current.count + self.previous.count
+
+    @property
+    def nbytes(self):
+        return len(self.current.bits) + len(self.previous.bits) + HEADER.size
+
+    # -------- serialisation --------
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.capacity, self.fp_rate, self.num_bits, self.num_hashes,
+                             self.current.count, self.previous.count)
+        return header + bytes(self.current.bits) + bytes(self.previous.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, capacity, fp_rate, num_bits, num_hashes, current, previous = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} seen filter")
+        seen = cls(capacity, fp_rate)
+        if (seen.num_bits, seen.num_hashes) != (num_bits, num_hashes):
+            raise ValueError("seen filter sizes don't match its settings")
+        size = (num_bits + 7) // 8
+        start = HEADER.size
+        seen.current = BloomFilter(num_bits, num_hashes, data[start:start + size], current)
+        seen.previous = BloomFilter(num_bits, num_hashes, data[start + size:start + 2 * size], previous)
+        return seen
+
+
+class SeenFilterStore:
+    """
+    One SeenFilter blob per player, in the same SQLite file as the question bank.
+
+    save() is write-behind, like streak_store.StreakStore: it snapshots the
+    filter's bytes in memory and returns, and a background thread writes the
+    waiting blobs every `flush_interval` seconds in one transaction. load()
+    sees snapshots that haven't been written yet. close() (also run at
+    interpreter exit) writes whatever is still waiting.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, capacity=DEFAULT_CAPACITY, fp_rate=DEFAULT_FP_RATE,
+                 flush_interval=FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+
+        self._lock = threading.Lock()        # guards _pending
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._pending = {}                   # player -> (blob, updated_at)
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Stop the flusher and write anything still waiting. Safe to call twice."""
+        if not self._closed:
+            self._closed = True
+            if self._thread is not None:
+                self._stop.set()
+                self._thread.join()
+            self.flush()
+            atexit.unregister(self.close)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def load(self, player):
+        """The player's filter, or an empty one for a new player (or an unreadable blob)."""
+        with self._lock:
+            pending = self._pending.get(player)
+        if pending is not None:
+            data = pending[0]
+        else:
+            row = self._conn().execute("SELECT data FROM seen_filters WHERE player = ?", (player,)).fetchone()
+            data = row[0] if row is not None else None
+        if data is not None:
+            try:
+                return SeenFilter.from_bytes(data)
+            except (ValueError, struct.error) as e:
+                print(f"[SeenFilter] Starting over for {player}: {e}")
+        return SeenFilter(self.capacity, self.fp_rate)
+
+    def save(self, player, seen):
+        """Remember the player's filter. Returns immediately; the flusher writes it later."""
+        if self._closed:
+            raise RuntimeError("SeenFilterStore is closed")
+        with self._lock:
+            self._pending[player] = (seen.to_bytes(), time.time())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="seen-flusher", daemon=True)
+                self._thread.start()
+
+    def pending(self):
+        """Players whose latest filter isn't on disk yet."""
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                # flush() put the blobs back; retry next window
+                print("[SeenFilterStore] Flush failed:", e)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+
+    def flush(self):
+        """Write every waiting filter in one transaction (on the calling thread). Returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            conn = self._conn()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO seen_filters (player, data, updated_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(player) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                        [(player, data, when) for player, (data, when) in batch.items()],
+                    )
+            except sqlite3.Error:
+                with self._lock:
+                    # Newer saves made during the failed write win
+                    for player, entry in batch.items():
+                        self._pending.setdefault(player, entry)
+                raise
+            return len(batch)
+
+
+# -------- benchmark --------
+
+def _check(answers, capacity, fp_rate):
+    import hashlib
+
+    def key(i):
+        return hashlib.sha256(f"question {i}".encode()).hexdigest()[:32]
+
+    seen = SeenFilter(capacity, fp_rate)
+    started = time.perf_counter()
+    for i in range(answers):
+        seen.add(key(i))
+    add_us = (time.perf_counter() - started) * 1e6 / answers
+
+    recent = range(max(0, answers - capacity), answers)
+    missed = sum(1 for i in recent if key(i) not in seen)
+    probes = 20_000
+    false_hits = sum(1 for i in range(answers, answers + probes) if key(i) in seen)
+
+    print(f"{answers:,} answers, capacity {capacity:,} per generation, target fp {fp_rate:.2%}")
+    print(f"  size               : {seen.nbytes / 1024:.1f} KB ({seen.num_bits:,} bits x 2, {seen.num_hashes} hashes)")
+    print(f"  add                : {add_us:.1f} us per answer")
+    print(f"  recent answers lost: {missed}")
+    print(f"  false positives    : {false_hits / probes:.2%} (two generations)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check size and false-positive rate of the seen filter.")
+    parser.add_argument("--answers", type=int, default=50_000)
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY)
+    parser.add_argument("--fp-rate", type=float, default=DEFAULT_FP_RATE)
+    args = parser.parse_args()
+    _check(args.answers, args.capacity, args.fp_rate)
@@ -0,0 +1,164 @@
+"""
+Stale-while-revalidate startup.
+
+Instead of making every launch wait for a full generation run, the start
+screen plays the questions already saved in the bank (question_store, or the
+last trivia_questions.json) straight away, and new questions are generated in
+a background thread. They land in the store, so the *next* session picks
+them up. A background run has its own checkpoint and doesn't write
+trivia_questions.json, so it never collides with a run the player started.
+
+How old the bank may be is configurable (environment variables, in hours):
+
+    OU_TRIVIA_STARTUP_MODE     "swr" (default) or "fresh" (always generate first)
+    OU_TRIVIA_FRESH_HOURS      younger than this: just play, no refresh (12)
+    OU_TRIVIA_MAX_STALE_HOURS  older than this: generate first, if we can (336 = 2 weeks)
+
+Without an API key (or network) the app still plays whatever bank it has,
+however old, and simply skips the refresh.
+"""
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from question_record import QuestionRecord
+
+STARTUP_MODE = os.environ.get("OU_TRIVIA_STARTUP_MODE", "swr")
+FRESH_FOR_HOURS = float(os.environ.get("OU_TRIVIA_FRESH_HOURS", "12"))
+MAX_STALE_HOURS = float(os.environ.get("OU_TRIVIA_MAX_STALE_HOURS", "336"))
+
+# Cap per game (CWE-400 review: keep one round's question list bounded)
+QUESTIONS_PER_SESSION = 30
+
+LEGACY_JSON_PATH = "trivia_questions.json"
+
+# What start_game should do
+PLAY = "play"                            # play the saved bank
+PLAY_AND_REFRESH = "play_and_refresh"    # play it, generate new ones in the background
+GENERATE = "generate"                    # nothing usable saved: generate first
+
+
+@dataclass
+class CachedBank:
+    questions: List[QuestionRecord]
+    age_seconds: float
+    source: str          # "store" or "json"
+
+
+def can_generate():
+    """Generation needs an OpenAI key; without one we only play saved questions."""
+    return bool(os.environ.get("OPENAI_API_KEY"))
+
+
+def load_cached_bank(store, difficulty, count=QUESTIONS_PER_SESSION, json_path=LEGACY_JSON_PATH,
+                     rng=random, pool=None):
+    """
+    Up to `count` saved questions for `difficulty`, newest bank first:
+    the SQLite store, then the last trivia_questions.json. None if neither has any.
+
+    With a `pool` (question_pool.PoolManager) the store questions come from its
+    in-memory pool; if the pool is running low the rest are sampled directly.
+    """
+    newest = store.newest_created_at(difficulty) if store is not None else None
+    if newest is not None:
+        questions = pool.take(difficulty, count) if pool is not None else []
+        if len(questions) < count:
+            pooled = {q.content_hash() for q in questions}
+            extra = store.sample(difficulty, count, rng)
+            questions += [q for q in extra if q.content_hash() not in pooled][:count - len(questions)]
+        if questions:
+            return CachedBank(questions, time.time() - newest, "store")
+
+    if json_path and os.path.exists(json_path):
+        from question_stream import iter_questions
+
+        # Older files have no "difficulty" key; those are fine for any level
+        matching = [
+            QuestionRecord.from_dict(q)
+            for q in iter_questions(json_path)
+            if q.get("difficulty") in (None, difficulty)
+        ]
+        if matching:
+            picked = rng.sample(matching, min(count, len(matching)))
+            return CachedBank(picked, time.time() - os.path.getmtime(json_path), "json")
+
+    return None
+
+
+def plan_startup(bank, mode=None, fresh_for_hours=None, max_stale_hours=None, generate_ok=None):
+    """Decide between PLAY, PLAY_AND_REFRESH and GENERATE for a cached bank."""
+    mode = mode or STARTUP_MODE
+    fresh_for = (FRESH_FOR_HOURS if fresh_for_hours is None else fresh_for_hours) * 3600
+    max_stale = (MAX_STALE_HOURS if max_stale_hours is None else max_stale_hours) * 3600
+    generate_ok = can_generate() if generate_ok is None else generate_ok
+
+    if mode == "fresh" or bank is None or not bank.questions:
+        return GENERATE
+    if bank.age_seconds <= fresh_for:
+        return PLAY
+    if not generate_ok:
+        # Offline / no key: an old bank beats no game at all
+        return PLAY
+    if bank.age_seconds <= max_stale:
+        return PLAY_AND_REFRESH
+    return GENERATE
+
+
+def _default_generate(difficulty, store):
+    # Imported here so the start screen doesn't pay for openai/requests/bs4
+    from generate_trivia import generate_questions_for_difficulty
+
+    # A run of its own: it never resumes (or gets resumed by) a run the player
+    # started, and only fills the store, leaving trivia_questions.json alone
+    return generate_questions_for_difficulty(difficulty, json_path=None, store=store, background=True)
+
+
+class BackgroundRefresher:
+    """
+    Runs at most one background generation per difficulty. New questions go
+    into the store; whoever starts the next session will see them.
+    """
+
+    def __init__(self, store, generate=_default_generate):
+        self.store = store
+        self.generate = generate
+        self._threads = {}
+        self._lock = threading.Lock()
+        self.last_error = {}
+        self.last_finished = {}
+
+    def is_running(self, difficulty):
+        thread = self._threads.get(difficulty)
+        return thread is not None and thread.is_alive()
+
+    def refresh(self, difficulty):
+        """Start a refresh for `difficulty` unless one is already running. Returns True if started."""
+        with self._lock:
+            if self.is_running(difficulty):
+                return False
+            thread = threading.Thread(
+                target=self._run, args=(difficulty,), name=f"refresh-{difficulty}", daemon=True
+            )
+            self._threads[difficulty] = thread
+            thread.start()
+            return True
+
+    def _run(self, difficulty):
+        try:
+            self.generate(difficulty, self.store)
+            self.last_error.pop(difficulty, None)
+        except Exception as e:
+            # Background work must never take the game down
+            print(f"[Refresh] {difficulty} refresh failed: {e}")
+            self.last_error[difficulty] = str(e)
+        finally:
+            self.last_finished[difficulty] = time.time()
+            self.store.release()
+
+    def join(self, timeout=None):
+        """Wait for running refreshes (used by tests and at shutdown)."""
+        for thread in list(self._threads.values()):
+            thread.join(timeout)
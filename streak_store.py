@@ -0,0 +1,185 @@
+"""
+Write-behind persistence for player streaks.
+
+StreakManager only kept the streak in memory, so it was gone on exit. Writing
+it to SQLite on every answer would put a disk sync on the Tk thread instead.
+StreakStore sits in between:
+
+    - record() only updates an in-memory dict and marks the player dirty.
+      No disk work happens on the caller's thread.
+    - A background flusher thread wakes every `flush_interval` seconds and
+      writes every dirty player in one transaction (one executemany). A player
+      answering ten questions in a window costs one row write, not ten.
+    - close() (also run at interpreter exit) stops the flusher and writes
+      whatever is still dirty.
+    - Each flush is a single SQLite transaction in WAL mode, so the table is
+      never half-updated. If the process dies, at most the updates since the
+      last flush (one flush window) are lost.
+
+    store = StreakStore()
+    streak, best = store.get("sujal")
+    store.record("sujal", streak + 5, max(best, streak + 5))
+    store.close()
+"""
+import atexit
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB_PATH = "trivia_bank.db"
+
+# Seconds between background flushes (the most that a crash can lose)
+FLUSH_INTERVAL = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS streaks (
+    player      TEXT PRIMARY KEY,
+    streak      INTEGER NOT NULL,
+    best        INTEGER NOT NULL,
+    updated_at  REAL NOT NULL
+);
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO streaks (player, streak, best, updated_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT(player) DO UPDATE SET
+        streak = excluded.streak, best = excluded.best, updated_at = excluded.updated_at
+"""
+
+
+class StreakStore:
+    def __init__(self, db_path=DEFAULT_DB_PATH, flush_interval=FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+
+        self._local = threading.local()      # one sqlite3 connection per thread
+        self._lock = threading.Lock()        # guards _state and _dirty
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._state = {}                     # player -> (streak, best, updated_at)
+        self._dirty = set()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+
+        # Metrics
+        self.flushes = 0
+        self.rows_written = 0
+        self.last_flush_ms = 0.0
+
+        atexit.register(self.close)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    # -------- reads / writes (caller's thread) --------
+
+    def get(self, player):
+        """(streak, best) for a player: from memory if known, else one indexed read."""
+        with self._lock:
+            if player in self._state:
+                return self._state[player][:2]
+        row = self._conn().execute(
+            "SELECT streak, best, updated_at FROM streaks WHERE player = ?", (player,)
+        ).fetchone()
+        with self._lock:
+            # A record() that raced with the read wins
+            self._state.setdefault(player, tuple(row) if row else (0, 0, 0.0))
+            return self._state[player][:2]
+
+    def record(self, player, streak, best):
+        """Remember a new streak. Returns immediately; the flusher writes it later."""
+        if self._closed:
+            raise RuntimeError("StreakStore is closed")
+        with self._lock:
+            self._state[player] = (streak, best, time.time())
+            self._dirty.add(player)
+        if self._thread is None:
+            self._start_flusher()
+
+    def pending(self):
+        """Players with updates not yet on disk."""
+        with self._lock:
+            return len(self._dirty)
+
+    # -------- flushing --------
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="streak-flusher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                # Keep the rows dirty (flush puts them back) and retry next window
+                print("[StreakStore] Flush failed:", e)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+
+    def flush_soon(self):
+        """Ask the flusher to write now instead of at the end of the window."""
+        self._wake.set()
+
+    def flush(self):
+        """Write every dirty player in one transaction (on the calling thread). Returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = [(p,) + self._state[p] for p in self._dirty]
+                self._dirty.clear()
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            conn = self._conn()
+            try:
+                with conn:
+                    conn.executemany(_UPSERT_SQL, batch)
+            except sqlite3.Error:
+                with self._lock:
+                    self._dirty.update(p for p, *_ in batch)
+                raise
+
+            self.flushes += 1
+            self.rows_written += len(batch)
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            return len(batch)
+
+    def close(self):
+        """Stop the flusher and write anything still dirty. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+        self.flush()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+        atexit.unregister(self.close)
+
+    def metrics(self):
+        return {
+            "pending": self.pending(),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+        }
@@ -1,34 +1,80 @@
 import tkinter as tk
-from generate_trivia import get_random_question
+from question_sampler import QuestionDealer
+from question_validator import ANSWER_COUNT
+from seen_filter import SeenFilterStore
+from streak_store import StreakStore
 
 OU_CRIMSON = "#841617"
 OU_CREAM = "#FDF9D8"
 
+# Save the player's seen-question filter after this many answers (and on a wrong answer)
+SEEN_SAVE_EVERY = 10
+
 
 class StreakManager:
-    def __init__(self):
-        self.streak = 0
+    def __init__(self, player=None, store=None):
+        """
+        With a StreakStore the player's streak carries over between sessions.
+        Changes go to the store's write-behind buffer, never straight to disk.
+        """
+        self.player = player
+        self.store = store
+        self.streak, self.best = store.get(player) if store is not None else (0, 0)
+
+    def _save(self):
+        if self.store is not None:
+            self.store.record(self.player, self.streak, self.best)
 
     def correct(self):
         """Increase streak by +5 for every correct answer."""
         self.streak += 5
+        self.best = max(self.best, self.streak)
+        self._save()
         return self.streak
 
     def wrong(self):
         """Reset streak to zero when user answers incorrectly."""
         self.streak = 0
+        self._save()
         return self.streak
 
 
 class QuizScreen:
-    def __init__(self, root, db, player_name, diff_manager):
+    """
+    One question at a time with a live streak counter.
+
+    The widgets are built once: a question label, a pool of answer buttons
+    and a hint label. Each question only reconfigures them, and buttons the
+    question doesn't need are hidden with pack_forget(). Nothing is destroyed
+    and recreated per question, so no Tcl objects pile up and nothing flickers.
+    """
+
+    def __init__(self, root, db, player_name, diff_manager, next_question=None, seen_store=None,
+                 streak_store=None, bank=None):
         self.root = root
         self.db = db
         self.player_name = player_name
         self.diff_manager = diff_manager
 
-        # Create a streak manager for this player/session
-        self.streak_mgr = StreakManager()
+        # Streak manager for this player, picking up the streak saved last time
+        self.streak_store = streak_store if streak_store is not None else StreakStore()
+        self.streak_mgr = StreakManager(player_name, self.streak_store)
+
+        # Questions this player answered in earlier sessions are dealt last
+        self.seen_store = seen_store if seen_store is not None else SeenFilterStore()
+        self.seen = self.seen_store.load(player_name)
+        self.unsaved_answers = 0
+
+        # Questions are dealt by this screen's own QuestionDealer (from `bank`,
+        # or the SQLite bank, which close() then closes)
+        self._own_bank = None
+        if next_question is None:
+            if bank is None:
+                from question_store import QuestionStore
+
+                bank = self._own_bank = QuestionStore()
+            next_question = QuestionDealer(bank, seen=self.seen).draw
+        self.next_question = next_question
 
         # Prepare GUI
         for w in root.winfo_children():
@@ -43,65 +89,189 @@ class QuizScreen:
         # Streak label (updates live)
         self.streak_label = tk.Label(
             self.frame,
-            text="Streak: 0",
+            text=self._streak_text(self.streak_mgr.streak),
             font=("Arial", 16, "bold"),
             fg=OU_CRIMSON,
             bg=OU_CREAM,
         )
         self.streak_label.pack(pady=10)
 
-        # Load first question
-        self.load_question()
-
-    def load_question(self):
-        """Clears old question and loads a new question."""
-        for w in self.frame.winfo_children():
-            if w is not self.streak_label:
-                w.destroy()
-
-        q = get_random_question()
-        self.current_question = q
-
-        # Show question
-        tk.Label(
+        # Question (also shows "no questions" when the bank is empty)
+        self.question_label = tk.Label(
             self.frame,
-            text=q["question"],
+            text="",
             wraplength=420,
             font=("Arial", 18, "bold"),
             bg=OU_CREAM,
-        ).pack(pady=10)
-
-        # Show answer buttons
-        for idx, option in enumerate(q["options"]):
-            tk.Button(
-                self.frame,
-                text=option,
-                font=("Arial", 14),
-                bg=OU_CRIMSON,
-                fg="black",
-                width=26,
-                height=2,
-                command=lambda i=idx: self.check_answer(i),
-            ).pack(pady=5)
-
-        # Show hint
-        tk.Label(
+        )
+        self.question_label.pack(pady=10)
+
+        # Answer buttons: a pool that is shown/hidden per question
+        self.answer_buttons = []
+        self.visible_answers = 0
+        for _ in range(ANSWER_COUNT):
+            self._add_answer_button()
+
+        # Hint
+        self.hint_label = tk.Label(
             self.frame,
-            text=f"Hint: {q['hint']}",
+            text="",
             font=("Arial", 12, "italic"),
             bg=OU_CREAM,
-        ).pack(pady=15)
+        )
+        self.hint_label.pack(pady=15)
+
+        # Load first question
+        self.load_question()
+
+    @staticmethod
+    def _streak_text(streak):
+        return f"🔥 Streak: {streak}" if streak else "Streak: 0"
+
+    def _add_answer_button(self):
+        """Grow the pool by one (hidden) button; only needed for questions with extra answers."""
+        idx = len(self.answer_buttons)
+        self.answer_buttons.append(tk.Button(
+            self.frame,
+            text="",
+            font=("Arial", 14),
+            bg=OU_CRIMSON,
+            fg="black",
+            width=26,
+            height=2,
+            command=lambda i=idx: self.check_answer(i),
+        ))
+
+    def _show_answers(self, count):
+        """Make exactly the first `count` answer buttons visible, in order, above the hint."""
+        while len(self.answer_buttons) < count:
+            self._add_answer_button()
+        for btn in self.answer_buttons[self.visible_answers:count]:
+            btn.pack(pady=5, before=self.hint_label)
+        for btn in self.answer_buttons[count:self.visible_answers]:
+            btn.pack_forget()
+        self.visible_answers = count
+
+    def load_question(self):
+        """Fetch the next question and show it in the existing widgets."""
+        self.show_question(self.next_question())
+
+    def show_question(self, q):
+        self.current_question = q
+        if q is None:
+            self.question_label.config(text="No questions in the bank yet.")
+            self.hint_label.config(text="")
+            self._show_answers(0)
+            return
+
+        self.question_label.config(text=q["question"])
+        answers = q["answers"]
+        self._show_answers(len(answers))
+        for btn, option in zip(self.answer_buttons, answers):
+            btn.config(text=option)
+        self.hint_label.config(text=f"Hint: {q['hint']}")
 
     def check_answer(self, selected_index):
         """Handle user answer selection."""
         correct_index = self.current_question["correct_index"]
+        self.seen.add(self.current_question)
+        self.unsaved_answers += 1
 
         if selected_index == correct_index:
-            new_streak = self.streak_mgr.correct()
-            self.streak_label.config(text=f"🔥 Streak: {new_streak}")
+            self.streak_mgr.correct()
         else:
             self.streak_mgr.wrong()
-            self.streak_label.config(text="Streak: 0")
+        self.streak_label.config(text=self._streak_text(self.streak_mgr.streak))
+
+        if selected_index != correct_index or self.unsaved_answers >= SEEN_SAVE_EVERY:
+            self.seen_store.save(self.player_name, self.seen)
+            self.unsaved_answers = 0
 
         # Load next question
         self.load_question()
+
+    def close(self):
+        """Save the player's seen filter and close the question bank this screen opened."""
+        self.seen_store.save(self.player_name, self.seen)
+        if self._own_bank is not None:
+            self._own_bank.close()
+            self._own_bank = None
+
+
+# -------- render benchmark --------
+#
+#   python streaks.py --questions 1000
+#
+# Renders the same questions with the widget pool and with the old
+# destroy-and-recreate approach, and reports time per question (including
+# the idle redraw) and how many Tcl commands/widgets exist afterwards.
+
+def _render_recreate(screen, q):
+    """What load_question used to do: destroy everything but the streak label and rebuild."""
+    for w in screen.frame.winfo_children():
+        if w is not screen.streak_label:
+            w.destroy()
+    tk.Label(screen.frame, text=q["question"], wraplength=420, font=("Arial", 18, "bold"),
+             bg=OU_CREAM).pack(pady=10)
+    for idx, option in enumerate(q["answers"]):
+        tk.Button(screen.frame, text=option, font=("Arial", 14), bg=OU_CRIMSON, fg="black", width=26,
+                  height=2, command=lambda i=idx: screen.check_answer(i)).pack(pady=5)
+    tk.Label(screen.frame, text=f"Hint: {q['hint']}", font=("Arial", 12, "italic"), bg=OU_CREAM).pack(pady=15)
+
+
+def _tcl_counts(root):
+    """(Tcl commands, live widgets) - every widget and every Python callback is a Tcl command."""
+    def widgets(w):
+        return 1 + sum(widgets(c) for c in w.winfo_children())
+    return len(root.tk.splitlist(root.tk.call("info", "commands"))), widgets(root)
+
+
+def run_render_benchmark(count=1000):
+    import time
+
+    from seen_filter import SeenFilterStore as _Store
+
+    questions = [
+        {"question": f"Question {i}: which building is this?",
+         "answers": [f"Answer {i}-{j}" for j in range(4 if i % 10 else 3)],
+         "correct_index": 0, "hint": f"Hint {i}"}
+        for i in range(count)
+    ]
+
+    root = tk.Tk()
+    root.geometry("600x500")
+    results = {}
+    for name in ("pooled", "recreate"):
+        feed = iter(questions)
+        screen = QuizScreen(root, None, "bench", None, next_question=lambda: next(feed, None),
+                            seen_store=_Store(":memory:"), streak_store=StreakStore(":memory:"))
+        root.update()
+        before = _tcl_counts(root)
+
+        render = screen.show_question if name == "pooled" else (lambda q, s=screen: _render_recreate(s, q))
+        times = []
+        for q in questions:
+            started = time.perf_counter()
+            render(q)
+            root.update_idletasks()
+            times.append((time.perf_counter() - started) * 1000)
+        root.update()
+
+        times.sort()
+        results[name] = (sum(times) / len(times), times[int(len(times) * 0.95)], before, _tcl_counts(root))
+
+    root.destroy()
+
+    print(f"Rendering {count:,} questions")
+    for name, (mean_ms, p95_ms, before, after) in results.items():
+        print(f"  {name:9}: mean {mean_ms:.3f} ms  p95 {p95_ms:.3f} ms  "
+              f"Tcl commands {before[0]} -> {after[0]}  widgets {before[1]} -> {after[1]}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark per-question rendering of the streaks quiz screen.")
+    parser.add_argument("--questions", type=int, default=1000)
+    args = parser.parse_args()
+    run_render_benchmark(args.questions)
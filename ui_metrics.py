@@ -0,0 +1,214 @@
+"""
+Opt-in UI responsiveness metrics for the Tk app.
+
+The CWE-400 review worries about stacked after() callbacks and popups piling
+up, but nothing measured whether the UI was actually falling behind.
+UIMonitor puts numbers on it:
+
+    - Heartbeat: an after() callback every `interval_ms`. How late each one
+      fires is the event-loop lag (p50 / p95 / max per summary window).
+    - Outstanding after() callbacks ("after info") and live Toplevel windows
+      (streak popups), sampled every heartbeat.
+    - Spans: `with monitor.span("load_question"): ...` times a piece of UI
+      work. main.py wraps screen transitions and question rendering.
+    - record(): one-off measurements, e.g. how late the quiz timer's ticks
+      fired during a game (countdown.DeadlineCountdown.stats()).
+    - Every `summary_every_s` a one-line summary is printed, and with a trace
+      path every sample/span/summary is also appended to a JSONL file.
+
+Off by default. Turn it on with:
+
+    OU_TRIVIA_UI_METRICS=1 python main.py                   -> summaries only
+    OU_TRIVIA_UI_METRICS=ui_trace.jsonl python main.py      -> summaries + trace file
+    python main.py --ui-metrics [ui_trace.jsonl]
+
+When it is off, NULL_MONITOR stands in and does nothing.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+HEARTBEAT_MS = 100
+SUMMARY_EVERY_S = 10.0
+
+ENV_VAR = "OU_TRIVIA_UI_METRICS"
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[k]
+
+
+class UIMonitor:
+    def __init__(self, root, interval_ms=HEARTBEAT_MS, summary_every_s=SUMMARY_EVERY_S,
+                 trace_path=None, clock=time.perf_counter, printer=print):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.summary_every_s = summary_every_s
+        self.clock = clock
+        self.printer = printer
+
+        self._trace = open(trace_path, "a", encoding="utf-8") if trace_path else None
+        self._after_id = None
+        self._expected_at = None
+        self._window_started = None
+
+        # Current summary window
+        self._lags = []
+        self._max_after = 0
+        self._max_toplevels = 0
+        self._spans = {}
+
+        self.summaries = []
+
+    # -------- lifecycle --------
+
+    def start(self):
+        self._window_started = self.clock()
+        self._schedule()
+        return self
+
+    def stop(self):
+        """Stop the heartbeat, print a last summary and close the trace file."""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # window already gone
+            self._after_id = None
+        if self._lags or self._spans:
+            self.summary()
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+
+    # -------- heartbeat --------
+
+    def _schedule(self):
+        self._expected_at = self.clock() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _beat(self):
+        now = self.clock()
+        lag_ms = max(now - self._expected_at, 0.0) * 1000
+        pending = self.count_after_callbacks()
+        toplevels = self.count_toplevels()
+
+        self._lags.append(lag_ms)
+        self._max_after = max(self._max_after, pending)
+        self._max_toplevels = max(self._max_toplevels, toplevels)
+        self._write({"type": "beat", "lag_ms": round(lag_ms, 2), "after": pending, "toplevels": toplevels})
+
+        if now - self._window_started >= self.summary_every_s:
+            self.summary()
+        self._schedule()
+
+    def count_after_callbacks(self):
+        """Callbacks currently scheduled with after() (the running heartbeat is not one of them)."""
+        try:
+            return len(self.root.tk.splitlist(self.root.tk.call("after", "info")))
+        except Exception:
+            return 0
+
+    def count_toplevels(self):
+        """Live Toplevel windows (e.g. streak popups), not counting the main window."""
+        try:
+            return sum(1 for w in self.root.winfo_children() if w.winfo_class() == "Toplevel")
+        except Exception:
+            return 0
+
+    # -------- spans --------
+
+    @contextmanager
+    def span(self, name):
+        """Time a block of UI work under `name`."""
+        started = self.clock()
+        try:
+            yield
+        finally:
+            ms = (self.clock() - started) * 1000
+            self._spans.setdefault(name, []).append(ms)
+            self._write({"type": "span", "name": name, "ms": round(ms, 3)})
+
+    def record(self, name, **fields):
+        """Report a one-off measurement (e.g. the quiz timer's tick lateness)."""
+        self._write({"type": name, **fields})
+        self.printer(f"[UI] {name}: " + ", ".join(f"{k} {v}" for k, v in fields.items()))
+
+    # -------- output --------
+
+    def summary(self):
+        """Summarise the current window, print it, and start a new window."""
+        lags = sorted(self._lags)
+        report = {
+            "type": "summary",
+            "beats": len(lags),
+            "lag_p50_ms": round(_percentile(lags, 50), 2),
+            "lag_p95_ms": round(_percentile(lags, 95), 2),
+            "lag_max_ms": round(lags[-1], 2) if lags else 0.0,
+            "after_max": self._max_after,
+            "toplevels_max": self._max_toplevels,
+            "spans": {
+                name: {"count": len(v), "mean_ms": round(sum(v) / len(v), 3), "max_ms": round(max(v), 3)}
+                for name, v in self._spans.items()
+            },
+        }
+        self.summaries.append(report)
+        self._write(report)
+
+        spans = ", ".join(
+            f"{name} {s['count']}× mean {s['mean_ms']:.1f} ms max {s['max_ms']:.1f} ms"
+            for name, s in report["spans"].items()
+        )
+        self.printer(
+            f"[UI] lag p50 {report['lag_p50_ms']:.1f} / p95 {report['lag_p95_ms']:.1f} / "
+            f"max {report['lag_max_ms']:.1f} ms | after() pending ≤{report['after_max']} | "
+            f"popups ≤{report['toplevels_max']}" + (f" | {spans}" if spans else "")
+        )
+
+        self._lags = []
+        self._max_after = 0
+        self._max_toplevels = 0
+        self._spans = {}
+        self._window_started = self.clock()
+        return report
+
+    def _write(self, event):
+        if self._trace is not None:
+            event["t"] = round(self.clock(), 4)
+            self._trace.write(json.dumps(event) + "\n")
+
+
+class _NullMonitor:
+    """Used when metrics are off: every hook is a no-op."""
+
+    @contextmanager
+    def span(self, name):
+        yield
+
+    def record(self, name, **fields):
+        pass
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+
+NULL_MONITOR = _NullMonitor()
+
+
+def monitor_from_setting(root, setting=None):
+    """
+    UIMonitor for an OU_TRIVIA_UI_METRICS-style setting ("1" = summaries,
+    anything else = trace file path), or NULL_MONITOR when it's empty/"0".
+    """
+    setting = os.environ.get(ENV_VAR, "") if setting is None else setting
+    if setting in ("", "0"):
+        return NULL_MONITOR
+    trace_path = None if setting == "1" else setting
+    return UIMonitor(root, trace_path=trace_path).start()
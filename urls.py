@@ -34,4 +34,6 @@ urls = [
     "https://www.oudaily.com/sports/oklahoma-football-sooners-sec-keontez-lewis-texas-missouri/article_be04aeec-b419-4bf7-af4e-2f2852c31389.html",
     "https://www.oudaily.com/sports/dr-steven-shin-john-mateer-oklahoma-football-sooners-sec-missouri/article_216fa0a4-9d19-4d0e-be54-0ba730b3c59f.html",
 ]
-print("Number of URLs:", len(urls))
\ No newline at end of file
+
+if __name__ == "__main__":
+    print("Number of URLs:", len(urls))
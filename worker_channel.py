@@ -0,0 +1,117 @@
+"""
+Thread-safe channel from a background worker to the Tk main thread.
+
+Tk widgets may only be touched from the main thread, so a worker can't
+update the UI itself. Instead of the UI polling shared attributes every
+200 ms, the worker posts messages:
+
+    channel.post("progress", (done, total))
+    channel.post("done", questions)
+    channel.post("error", "message")
+
+Each post puts the message on a queue.Queue and wakes the Tk event loop
+with a virtual event (event_generate(..., when="tail") is safe to call from
+another thread). The main thread handles the event by draining the queue and
+calling the handler for each message, in order. Nothing runs while the
+worker is busy, and completion is handled as soon as the loop is free.
+
+ProgressTracker turns (done, total) updates into a fraction and an ETA for
+the progress bar.
+"""
+import queue
+import time
+
+WORKER_EVENT = "<<WorkerMessage>>"
+
+
+class WorkerChannel:
+    def __init__(self, handler, wakeup=None):
+        self.handler = handler    # handler(kind, payload), called on the main thread
+        self.wakeup = wakeup      # called after each post, from the worker's thread
+        self._queue = queue.Queue()
+        self.closed = False
+
+    @classmethod
+    def for_tk(cls, root, handler, event_name=WORKER_EVENT):
+        """Channel that wakes `root`'s event loop with a virtual event."""
+        channel = cls(handler)
+
+        def wakeup():
+            root.event_generate(event_name, when="tail")
+
+        channel.wakeup = wakeup
+        root.bind(event_name, lambda _event: channel.drain())
+        return channel
+
+    def post(self, kind, payload=None):
+        """Send a message to the main thread. Safe from any thread."""
+        if self.closed:
+            return
+        self._queue.put((kind, payload))
+        if self.wakeup is not None:
+            try:
+                self.wakeup()
+            except Exception as e:
+                # Window already closed: nobody is left to read the message
+                print(f"[WorkerChannel] Could not wake the UI: {e}")
+
+    def drain(self):
+        """Handle every queued message (main thread). Returns how many were handled."""
+        handled = 0
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                return handled
+            self.handler(kind, payload)
+            handled += 1
+
+    def close(self):
+        """Drop later posts (e.g. from a worker that outlives its screen)."""
+        self.closed = True
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ProgressTracker:
+    """
+    Fraction done and ETA from (done, total) updates. The rate only counts
+    articles finished during this run, so a resumed run that starts at 20/34
+    doesn't look instantly fast.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self.done_at_start = None
+        self.done = 0
+        self.total = 0
+
+    def update(self, done, total):
+        if self.done_at_start is None:
+            self.done_at_start = done
+        self.done, self.total = done, total
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 0.0
+
+    def eta_seconds(self):
+        """Seconds left at the current rate, or None before the first article finishes."""
+        finished_now = self.done - (self.done_at_start or 0)
+        if finished_now <= 0:
+            return None
+        per_article = (self.clock() - self.started) / finished_now
+        return per_article * (self.total - self.done)
+
+    def describe(self):
+        text = f"{self.done}/{self.total} articles"
+        eta = self.eta_seconds()
+        if eta is not None and self.done < self.total:
+            text += f" · about {format_duration(eta)} left"
+        return text